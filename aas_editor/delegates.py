@@ -12,59 +12,95 @@ from basyx.aas.model.base import *
 from basyx.aas.model.concept import *
 from basyx.aas.model.submodel import *
 
+import weakref
 from enum import Enum
-from typing import Dict
+from typing import Dict, Hashable, Tuple
 
 from PyQt6.QtGui import QPainter, QBrush, QIntValidator
 from PyQt6.QtWidgets import QWidget, QStyledItemDelegate, QStyleOptionViewItem, QStyle, \
-    QCompleter, QCheckBox
+    QCheckBox
 from PyQt6 import QtCore
-from PyQt6.QtCore import Qt, QModelIndex
+from PyQt6.QtCore import Qt, QModelIndex, QAbstractProxyModel, QAbstractItemModel
 
-from aas_editor.settings import DEFAULT_COMPLETIONS
 from aas_editor.additional.classes import DictItem
+from aas_editor.utils.completions import completionService
 from aas_editor.utils.util_type import issubtype, isoftype
 from aas_editor.widgets.editWidgets import ComboBox, CompleterComboBox, DictItemEdit, LineEdit
 
 
 class ColorDelegate(QStyledItemDelegate):
+    """
+    Paints background colors of cells, e.g. of search results, and the row of the current index as hovered.
+    The view must repaint the rows if its current index changes, see BasicTreeView.currentChanged.
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.indexColors: Dict[QModelIndex, QBrush] = {}
-        self.hoverIndex = QModelIndex()
+        # colors by (item, column) of the source model, so that they stay if rows are inserted or removed,
+        # items are referenced weakly, so that removed items are not kept alive by their colors
+        self.cellColors: Dict[Tuple[Hashable, int], QBrush] = {}
 
     def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
         opt = QStyleOptionViewItem(option)
         # paint row of the tree with MouseOver style if one cell of the row is chosen
-        if not opt.state & QStyle.StateFlag.State_HasFocus \
-                and not opt.state & QStyle.StateFlag.State_Selected:
+        if not opt.state & (QStyle.StateFlag.State_HasFocus | QStyle.StateFlag.State_Selected
+                            | QStyle.StateFlag.State_MouseOver):
             view = opt.styleObject
-            hoverIndex: QModelIndex = view.currentIndex()
-            if not opt.state & QStyle.StateFlag.State_MouseOver and index.siblingAtColumn(0) == hoverIndex.siblingAtColumn(0):
+            if index.siblingAtColumn(0) == view.currentIndex().siblingAtColumn(0):
                 opt.state |= QStyle.StateFlag.State_MouseOver
-                model = view.model()
-                model.dataChanged.emit(index, index)
 
-        if index.isValid() and index in self.indexColors:
+        color = self.cellColors.get(self.cellKey(index)) if self.cellColors and index.isValid() else None
+        if color is not None:
             self.initStyleOption(opt, index)
-            opt.backgroundBrush = self.indexColors[index]
+            opt.backgroundBrush = color
             widget = opt.widget
             style = widget.style()
             style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
         else:
             super(ColorDelegate, self).paint(painter, opt, index)
 
+    @staticmethod
+    def cellKey(index: QModelIndex) -> Tuple[Hashable, int]:
+        """Return key of the cell, which does not change if rows are inserted or removed or the proxy is filtered"""
+        model = index.model()
+        while isinstance(model, QAbstractProxyModel):
+            index = model.mapToSource(index)
+            model = index.model()
+        item = index.internalPointer()
+        if item is None:
+            return (index.row(), index.parent().internalId()), index.column()
+        return weakref.ref(item), index.column()
+
     def setBgColor(self, index: QModelIndex, val: QBrush):
-        self.indexColors[index] = val
+        self.cellColors[self.cellKey(index)] = val
 
     def bgColor(self, index: QModelIndex):
-        return self.indexColors[index]
+        return self.cellColors[self.cellKey(index)]
 
     def removeBgColor(self, index: QModelIndex):
-        self.indexColors.pop(index)
+        self.cellColors.pop(self.cellKey(index))
 
     def clearBgColors(self):
-        self.indexColors.clear()
+        self.cellColors.clear()
+
+    def removeRowsBgColors(self, model: QAbstractItemModel, parent: QModelIndex, first: int, last: int):
+        """Remove colors of the rows and their descendants, must be called before the rows are removed"""
+        if not self.cellColors:
+            return
+        removedItems = set()
+        for row in range(first, last + 1):
+            ref, _ = self.cellKey(model.index(row, 0, parent))
+            if isinstance(ref, weakref.ref):
+                removedItems.add(ref())
+        for key in list(self.cellColors):
+            ref, _ = key
+            if not isinstance(ref, weakref.ref):
+                continue
+            item = ref()
+            while item is not None and item not in removedItems:
+                item = item.parent()
+            if item is not None or ref() is None:
+                del self.cellColors[key]
 
 
 class EditDelegate(ColorDelegate):
@@ -78,10 +114,8 @@ class EditDelegate(ColorDelegate):
             widget = QCheckBox(parent)
         elif issubtype(objType, str):
             widget = LineEdit(parent)
-            completions = DEFAULT_COMPLETIONS.get(objType, {}).get(attr, [])
-            if completions:
-                completer = QCompleter(parent, completions=completions)
-                completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+            completer = completionService().completer(objType, attr, parent)
+            if completer:
                 widget.setCompleter(completer)
         elif issubtype(objType, int):
             widget = LineEdit(parent)
@@ -122,4 +122,4 @@ class Ui_MainWindow(object):
     def setupMainTreeModel(self) -> StandardTable:
         columns_in_packs_table = list(DEFAULT_COLUMNS_IN_PACKS_TABLE)
         columns_in_packs_table.extend(EXTENDED_COLUMNS_IN_PACK_TABLE)
-        return PacksTable(columns_in_packs_table, PackTreeViewItem(None, None))
+        return PacksTable(columns_in_packs_table, PackTreeViewItem(None, None, lazy=True))
@@ -7,7 +7,6 @@
 #  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
-import copy
 import json
 
 from PyQt6.QtGui import QGuiApplication
@@ -22,6 +21,7 @@ from PyQt6.QtWidgets import QDialog, QDialogButtonBox, \
 import aas_editor.widgets.buttons
 import aas_editor.widgets.editWidgets
 from aas_editor.settings import ATTRIBUTE_COLUMN
+from aas_editor.utils.clone import cloneObject
 from aas_editor.utils.util import actualizeAASParents
 from aas_editor.utils.util_type import getTypeName, isoftype
 from aas_editor.utils.util_classes import PreObject
@@ -131,8 +131,9 @@ class EditObjDialog(EditDialog):
         self.buttonOk.setEnabled(True)
 
         if not isoftype(objVal, PreObject):
-            objVal = copy.deepcopy(objVal)
-        actualizeAASParents(objVal)
+            objVal = cloneObject(objVal)
+        else:
+            actualizeAASParents(objVal)
 
         kwargs = {
             **kwargs,
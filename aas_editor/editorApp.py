@@ -10,7 +10,7 @@
 import json
 import webbrowser
 
-from PyQt6.QtCore import QModelIndex, pyqtSignal
+from PyQt6.QtCore import QModelIndex, pyqtSignal, QTimer
 from PyQt6.QtGui import *
 from PyQt6.QtWidgets import *
 
@@ -26,6 +26,7 @@ from aas_editor.widgets import AddressLine
 from aas_editor import design
 from aas_editor.models import DetailedInfoTable, PacksTable
 from aas_editor.utils.util import toggleStylesheet
+from aas_editor.utils.package_io import OpenPackageTask
 from aas_editor.treeviews.base import HeaderView
 
 
@@ -52,7 +53,8 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
         if fileToOpen:
             self.openAASFile(fileToOpen)
         else:
-            self.openLastSessionFiles()
+            # files are opened after the window is shown
+            QTimer.singleShot(0, self.openLastSessionFiles)
 
     def loadThemes(self):
         self.themes = {}
@@ -294,8 +296,9 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
 
     def openLastSessionFiles(self):
         openedAasFiles = AppSettings.AAS_FILES_TO_OPEN_ON_START.value()
-        for file in openedAasFiles:
-            self.openAASFile(file)
+        currentAasFile = AppSettings.CURRENT_AAS_FILE.value()
+        # files are read in parallel and added to the tree as soon as they are read
+        self.mainTreeView.openPacksInBackground(openedAasFiles, priorityFile=currentAasFile)
 
     def openAASFile(self, filePath: str):
         try:
@@ -348,7 +351,12 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
         AppSettings.SIZE.setValue(self.size())
         AppSettings.LEFT_ZONE_SIZE.setValue(self.mainLayoutWidget.size())
         AppSettings.RIGHT_ZONE_SIZE.setValue(self.subLayoutWidget.size())
-        AppSettings.AAS_FILES_TO_OPEN_ON_START.setValue(self.packTreeModel.openedFiles())
+        # files of the last session which are still being read are kept for the next start
+        openingFiles = {task.file for task in self.mainTreeView.packageIO.runningTasks()
+                        if isinstance(task, OpenPackageTask)}
+        AppSettings.AAS_FILES_TO_OPEN_ON_START.setValue(self.packTreeModel.openedFiles() | openingFiles)
+        currentPack = self.mainTreeView.currentIndex().data(PACKAGE_ROLE)
+        AppSettings.CURRENT_AAS_FILE.setValue(currentPack.file.as_posix() if currentPack else "")
         AppSettings.FONTSIZE_FILES_VIEW.setValue(PacksTable.currFont.pointSize())
         AppSettings.FONTSIZE_DETAILED_VIEW.setValue(DetailedInfoTable.currFont.pointSize())
         AppSettings.PACKTREEVIEW_HEADER_STATE.setValue(self.mainTreeView.header().saveState())
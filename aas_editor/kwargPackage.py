@@ -40,7 +40,8 @@ class KwargPackage(Package):
 
     def add(self, obj):
         if isinstance(obj, StoredFile):
-            newName = self.fileStore.add_file(name=obj.name, file=obj.file(), content_type=obj.content_type)
+            with obj.open() as file:
+                newName = self.fileStore.add_file(name=obj.name, file=file, content_type=obj.mime_type)
             obj.setFileStore(newName, self.fileStore)
         else:
             self._objStore.append(obj)
@@ -53,6 +54,9 @@ class KwargPackage(Package):
             if isinstance(obj, objtype):
                 yield obj
 
+    def _numOfObjects(self, objtype) -> int:
+        return len(tuple(self._iter_objects(objtype)))
+
 
 class KwargObject:
     @staticmethod
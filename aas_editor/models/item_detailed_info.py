@@ -32,39 +32,39 @@ class DetailedInfoItem(StandardItem):
             self.package = parent.data(settings.PACKAGE_ROLE)
         else:
             self.package = package
-        self.populate()
+        if not self.lazy:
+            self.fetchMore()
 
-    def populate(self):
-        if isinstance(self.obj, settings.TYPES_WITH_INSTANCES_NOT_TO_POPULATE) \
-                or type(self.obj) in settings.TYPES_NOT_TO_POPULATE:
-            return
-
-        kwargs = {
-            "parent": self,
-            "package": self.package,
-            "new": self.new,
-        }
+    def _isNotToPopulate(self) -> bool:
+        return isinstance(self.obj, settings.TYPES_WITH_INSTANCES_NOT_TO_POPULATE) \
+            or type(self.obj) in settings.TYPES_NOT_TO_POPULATE
 
+    def childObjects(self):
+        if self._isNotToPopulate():
+            return []
         if isinstance(self.obj, DICT_TYPES):
-            self._populateDict(self.obj, **kwargs)
+            return [(DictItem(key, self.obj[key]), f"{getTypeName(DictItem)} {i}") for i, key in enumerate(self.obj)]
         elif isSimpleIterable(self.obj):
-            self._populateIterable(self.obj, **kwargs)
+            return [(subObj, f"{getTypeName(subObj.__class__)} {i}") for i, subObj in enumerate(self.obj)]
         else:
-            self._populateUnknown(self.obj, **kwargs)
+            return [(getattr(self.obj, attr), attr) for attr in getAttrs4detailInfo(self.obj)]
 
-    @staticmethod
-    def _populateDict(obj, **kwargs):
-        for i, key in enumerate(obj):
-            DetailedInfoItem(DictItem(key, obj[key]),
-                             name=f"{getTypeName(DictItem)} {i}", **kwargs)
+    def newChildItem(self, obj, name):
+        return DetailedInfoItem(obj, name=name, parent=self, package=self.package, new=self.new, lazy=self.lazy)
 
-    @staticmethod
-    def _populateIterable(obj, **kwargs):
-        for i, sub_item_obj in enumerate(obj):
-            DetailedInfoItem(sub_item_obj,
-                             name=f"{getTypeName(sub_item_obj.__class__)} {i}", **kwargs)
+    def childKey(self, obj, name):
+        if isinstance(self.obj, DICT_TYPES) and isinstance(obj, DictItem):
+            return "key", obj.key
+        elif isSimpleIterable(self.obj):
+            # names of elements contain their position, so elements are found by id_short or identity
+            if getattr(obj, "id_short", None):
+                return "id_short", obj.id_short
+            return "obj", id(obj)
+        return "attr", name
 
-    @staticmethod
-    def _populateUnknown(obj, **kwargs):
-        for attr in getAttrs4detailInfo(obj):
-            DetailedInfoItem(getattr(obj, attr), name=attr, **kwargs)
+    def hasChildrenToFetch(self) -> bool:
+        if self._isNotToPopulate():
+            return False
+        if isinstance(self.obj, DICT_TYPES) or isSimpleIterable(self.obj):
+            return self._hasAnyElement(self.obj)
+        return bool(getAttrs4detailInfo(self.obj))
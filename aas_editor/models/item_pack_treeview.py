@@ -36,37 +36,54 @@ class PackTreeViewItem(StandardItem):
             self.package = obj
         else:
             self.package = parent.data(PACKAGE_ROLE)
-        self.populate()
+        if not self.lazy:
+            self.fetchMore()
 
-    def populate(self):
-        kwargs = {
-            "parent": self,
-            "new": self.new,
-        }
+    def childObjects(self):
         if ClassesInfo.hasPackViewAttrs(type(self.obj)):
-            for attr in ClassesInfo.packViewAttrs(type(self.obj)):
-                # set package objStore as obj, so that delete works
-                itemObj = getattr(self.obj, attr)
-                packItem = PackTreeViewItem(itemObj, name=attr, **kwargs)
-                if isinstance(itemObj, GeneratorType):
-                    packItem.obj = self.obj.objStore
-        elif isIterable(self.obj):
-            if isinstance(self.obj, DictSupplementaryFileContainer):
-                self._populateFileContainer(self.obj, **kwargs)
-            else:
-                self._populateIterable(self.obj, **kwargs)
+            return [(self._packViewAttrObj(attr), attr) for attr in ClassesInfo.packViewAttrs(type(self.obj))]
+        source = self._populationSource()
+        if isinstance(source, DictSupplementaryFileContainer):
+            return self._fileContainerObjects(source)
+        elif isIterable(source):
+            return [(subObj, None) for subObj in source]
+        return []
 
-    @staticmethod
-    def _populateIterable(obj, **kwargs):
-        for sub_item_obj in obj:
-            PackTreeViewItem(sub_item_obj, **kwargs)
+    def newChildItem(self, obj, name):
+        return PackTreeViewItem(obj, name=name, parent=self, new=self.new, lazy=self.lazy)
+
+    def childKey(self, obj, name):
+        if name:
+            return "attr", name
+        elif isinstance(obj, StoredFile):
+            # stored files are created again with every population
+            return "file", obj.name
+        return "obj", id(obj)
+
+    def _packViewAttrObj(self, attr: str):
+        itemObj = getattr(self.obj, attr)
+        if isinstance(itemObj, GeneratorType):
+            # set package objStore as obj, so that delete works
+            return self.obj.objStore
+        return itemObj
+
+    def _populationSource(self):
+        """Return the object whose elements are the children of the item"""
+        parentObj = self.parentObj
+        if isinstance(parentObj, Package) and self.objName in ClassesInfo.packViewAttrs(Package):
+            # obj of the item was replaced by objStore, so take the filtered objects from the package
+            return getattr(parentObj, self.objName)
+        return self.obj
+
+    def hasChildrenToFetch(self) -> bool:
+        if ClassesInfo.hasPackViewAttrs(type(self.obj)):
+            return True
+        source = self._populationSource()
+        return isIterable(source) and self._hasAnyElement(source)
 
     @staticmethod
-    def _populateFileContainer(fileContainer, **kwargs):
-        # populate file container
-        for name in fileContainer:
-            itemObj = StoredFile(name, fileContainer)
-            PackTreeViewItem(itemObj, **kwargs)
+    def _fileContainerObjects(fileContainer):
+        return [(StoredFile(name, fileContainer), None) for name in fileContainer]
 
     def _getEditRoleData(self, column, column_name):
         if column == ATTRIBUTE_COLUMN:
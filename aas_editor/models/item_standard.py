@@ -16,9 +16,12 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
-import io
 import logging
+import sys
+import io
 from collections import namedtuple
+from functools import partial
+from typing import Any, Callable, List, Dict, Optional, Tuple
 
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import QObject, QVariant
@@ -32,13 +35,34 @@ from PyQt6.QtCore import Qt
 from aas_editor.utils.util_classes import ClassesInfo
 
 MediaContent = namedtuple("MediaContent", ("value", "content_type"))
+# open: callable returning a binary file object with the content, size in bytes
+MediaSource = namedtuple("MediaSource", ("open", "size", "content_type", "name"))
 
 
 class StandardItem(QObject):
-    def __init__(self, obj, name=None, parent=None, new=True, typehint=None):
+    # obj type -> icon of the type short, None if there is no type short for the type
+    _typeShortIcons: Dict[type, Optional[QIcon]] = {}
+    # increased before objects are changed in place, e.g. a key of a shown reference,
+    # display caches of all items created in an older generation are cleared then
+    displayGeneration = 0
+
+    def __init__(self, obj, name=None, parent=None, new=True, typehint=None, lazy=False):
         super().__init__(parent)
+        # child items are stored in a list and every item knows its row,
+        # so that row lookup does not need to scan QObject.children()
+        self._childItems: List['StandardItem'] = []
+        self._firstDirtyRow = sys.maxsize
+        self._row = 0
+        # display strings by column, cleared if obj is set
+        self._displayCache: Dict[tuple, Any] = {}
+        self._displayCacheGeneration = StandardItem.displayGeneration
+        if isinstance(parent, StandardItem):
+            parent._appendChildItem(self)
         self.new = new
         self.changed = False
+        # if lazy, child items are created on demand via fetchMore
+        self.lazy = lazy
+        self.populated = False
 
         # following attrs will be set during self.obj = obj
         self.typecheck = None
@@ -60,7 +84,20 @@ class StandardItem(QObject):
 
     @property
     def displayValue(self):
-        return simplifyInfo(self.obj, self.objectName)
+        return self._cachedDisplay(("displayValue",), lambda: simplifyInfo(self.obj, self.objectName))
+
+    def clearDisplayCache(self):
+        self._displayCache.clear()
+        self._displayCacheGeneration = StandardItem.displayGeneration
+
+    def _cachedDisplay(self, key: tuple, compute: Callable[[], Any]):
+        if self._displayCacheGeneration != StandardItem.displayGeneration:
+            self.clearDisplayCache()
+        try:
+            return self._displayCache[key]
+        except KeyError:
+            value = self._displayCache[key] = compute()
+            return value
 
     @property
     def obj(self):
@@ -75,6 +112,7 @@ class StandardItem(QObject):
     @obj.setter
     def obj(self, obj):
         self._obj = obj
+        self.clearDisplayCache()
         try:
             self.typecheck = checkType(self.obj, self.typehint)
         except AttributeError:
@@ -90,6 +128,7 @@ class StandardItem(QObject):
     @objName.setter
     def objName(self, value):
         self._objName = value
+        self.clearDisplayCache()
         self.doc = getAttrDoc(self.objName, self.parentObj)
 
     @property
@@ -112,6 +151,7 @@ class StandardItem(QObject):
     @typehint.setter
     def typehint(self, value):
         self._typehint = value
+        self.clearDisplayCache()
         self.typecheck = checkType(self.obj, self.typehint)
         self.updateTypehintName()
 
@@ -129,12 +169,26 @@ class StandardItem(QObject):
                 type(self.obj),{settings.CONTENT_TYPE_ATTR: "N\A"})[settings.CONTENT_TYPE_ATTR]
             self.icon = QIcon(settings.MIME_TYPE_ICON_DICT.get(content_type, settings.FILE_ICON))
         else:
-            try:
-                self.icon = settings.getCharsIcon(settings.TYPE_SHORTS_DICT[type(self.obj)])
-            except KeyError:
-                for cls in settings.TYPE_SHORTS_DICT:
-                    if isinstance(self.obj, cls):
-                        self.icon = settings.getCharsIcon(settings.TYPE_SHORTS_DICT[cls])
+            icon = self.typeShortIcon(type(self.obj))
+            if icon is not None:
+                self.icon = icon
+
+    @staticmethod
+    def typeShortIcon(objType: type) -> Optional[QIcon]:
+        """Return icon of the type short of the obj type or of its last found parent type in TYPE_SHORTS_DICT"""
+        try:
+            return StandardItem._typeShortIcons[objType]
+        except KeyError:
+            pass
+
+        typeShort = settings.TYPE_SHORTS_DICT.get(objType)
+        if typeShort is None:
+            for cls in settings.TYPE_SHORTS_DICT:
+                if issubclass(objType, cls):
+                    typeShort = settings.TYPE_SHORTS_DICT[cls]
+        icon = settings.getCharsIcon(typeShort) if typeShort is not None else None
+        StandardItem._typeShortIcons[objType] = icon
+        return icon
 
     def data(self, role, column=settings.ATTRIBUTE_COLUMN, column_name=""):
         # custom roles
@@ -160,6 +214,8 @@ class StandardItem(QObject):
             return self.isUrlMedia
         if role == settings.MEDIA_CONTENT_ROLE:
             return self.getMediaContent()
+        if role == settings.MEDIA_SOURCE_ROLE:
+            return self.getMediaSource()
         # qt roles
         if role == Qt.ItemDataRole.DecorationRole and column == settings.ATTRIBUTE_COLUMN:
             return self.icon
@@ -183,6 +239,9 @@ class StandardItem(QObject):
                 return QVariant()
 
     def _getDisplayRoleData(self, column, column_name):
+        return self._cachedDisplay((column, column_name), lambda: self._displayRoleData(column, column_name))
+
+    def _displayRoleData(self, column, column_name):
         data = settings.NOT_GIVEN
         if column == settings.ATTRIBUTE_COLUMN:
             data = self.objectName
@@ -231,7 +290,12 @@ class StandardItem(QObject):
         return tooltip if tooltip else QVariant()
 
     def setParent(self, a0: 'QObject') -> None:
+        oldParent = self.parent()
+        if isinstance(oldParent, StandardItem):
+            oldParent._removeChildItem(self)
         super().setParent(a0)
+        if isinstance(a0, StandardItem):
+            a0._appendChildItem(self)
         if a0 is None:
             return
         if a0.data(settings.PACKAGE_ROLE):
@@ -251,10 +315,9 @@ class StandardItem(QObject):
         data = self._getEditRoleData(column, column_name)
         if self.package and isinstance(data, settings.LINK_TYPES):
             try:
-                data.resolve(self.package.objStore)
+                self.package.objStore.resolve(data)
                 return True
-            except (AttributeError, KeyError, NotImplementedError, TypeError, IndexError) as e:
-                logging.exception(e)
+            except KeyError:
                 return False
         return False
 
@@ -269,11 +332,89 @@ class StandardItem(QObject):
         value = self.obj.value
         return isinstance(value, str) and value.startswith(("http", "www."))
 
+    def populate(self, childObjects: Optional[List[Tuple[Any, Optional[str]]]] = None):
+        """Create child items of the item from childObjects or, if not given, from the actual obj"""
+        for obj, name in self.childObjects() if childObjects is None else childObjects:
+            self.newChildItem(obj, name)
+
+    def childObjects(self) -> List[Tuple[Any, Optional[str]]]:
+        """Return objects and names of the child items, which populate creates"""
+        return []
+
+    def newChildItem(self, obj, name: Optional[str]) -> 'StandardItem':
+        """Create child item of the obj, it is appended to the child items"""
+        return type(self)(obj, name=name, parent=self, new=self.new, lazy=self.lazy)
+
+    def childKey(self, obj, name: Optional[str]):
+        """Return key, by which the child item is found again after the obj of the item was changed"""
+        return "obj", id(obj)
+
+    def canFetchMore(self) -> bool:
+        return not self.populated
+
+    def fetchMore(self, childObjects: Optional[List[Tuple[Any, Optional[str]]]] = None):
+        """Create child items if they were not created yet, see populate"""
+        if self.populated:
+            return
+        self.populated = True
+        self.populate(childObjects)
+
+    def hasChildrenToFetch(self) -> bool:
+        """Return True if populate would create at least one child item"""
+        return False
+
+    @staticmethod
+    def _hasAnyElement(iterable) -> bool:
+        try:
+            return len(iterable) > 0
+        except TypeError:
+            return next(iter(iterable), settings.NOT_GIVEN) is not settings.NOT_GIVEN
+
     def row(self):
-        if self.parent():
-            return self.parent().children().index(self)
-        else:
+        parent = self.parent()
+        if parent is None:
             return 0
+        if self._row >= parent._firstDirtyRow:
+            parent._renumberChildItems()
+        return self._row
+
+    def childItem(self, row: int) -> 'StandardItem':
+        return self._childItems[row]
+
+    def childCount(self) -> int:
+        return len(self._childItems)
+
+    def childItems(self) -> List['StandardItem']:
+        return list(self._childItems)
+
+    def removeChildItems(self, row: int, count: int):
+        """Detach count child items starting with row"""
+        children = self._childItems[row:row+count]
+        del self._childItems[row:row+count]
+        self._firstDirtyRow = min(self._firstDirtyRow, row)
+        for child in children:
+            QObject.setParent(child, None)
+
+    def moveChildItem(self, child: 'StandardItem', row: int):
+        oldRow = child.row()
+        del self._childItems[oldRow]
+        self._childItems.insert(row, child)
+        self._firstDirtyRow = min(self._firstDirtyRow, oldRow, row)
+
+    def _appendChildItem(self, child: 'StandardItem'):
+        child._row = len(self._childItems)
+        self._childItems.append(child)
+
+    def _removeChildItem(self, child: 'StandardItem'):
+        row = child.row()
+        del self._childItems[row]
+        self._firstDirtyRow = min(self._firstDirtyRow, row)
+
+    def _renumberChildItems(self):
+        # rows of children behind a removed child are updated once on the next lookup
+        for row in range(self._firstDirtyRow, len(self._childItems)):
+            self._childItems[row]._row = row
+        self._firstDirtyRow = sys.maxsize
 
     def getTypeHint(self):
         attrTypehint = None
@@ -306,9 +447,23 @@ class StandardItem(QObject):
             if self.isUrlMedia or isinstance(content_value, bytes):
                 return MediaContent(content_value, content_type)
             elif isinstance(content_value, str) and content_value in self.package.fileStore:
-                file_content = io.BytesIO()
-                self.package.fileStore.write_file(content_value, file_content)
-                return MediaContent(file_content.getvalue(), content_type)
+                return MediaContent(StoredFile(content_value, self.package.fileStore).value, content_type)
             elif not content_value:
                 return MediaContent(b"Value is not given", "text/plain")
         return MediaContent(b"Media not found", "text/plain")
+
+    def getMediaSource(self) -> Optional[MediaSource]:
+        """Return source for reading the media in chunks or None if media is an url or not found"""
+        if isinstance(self.obj, StoredFile):
+            return MediaSource(self.obj.open, self.obj.size, self.obj.mime_type, self.obj.name.split("/")[-1])
+        if type(self.obj) in settings.MEDIA_TYPES_INFOS and not self.isUrlMedia:
+            info = settings.MEDIA_TYPES_INFOS[type(self.obj)]
+            content_type = str(getattr(self.obj, info[settings.CONTENT_TYPE_ATTR]))
+            content_value = getattr(self.obj, info[settings.CONTENT_VALUE_ATTR])
+            name = self.objectName
+            if isinstance(content_value, bytes):
+                return MediaSource(partial(io.BytesIO, content_value), len(content_value), content_type, name)
+            elif isinstance(content_value, str) and content_value in self.package.fileStore:
+                storedFile = StoredFile(content_value, self.package.fileStore)
+                return MediaSource(storedFile.open, storedFile.size, content_type, content_value.split("/")[-1])
+        return None
@@ -19,7 +19,7 @@
 from typing import List, Any, Optional
 
 from PyQt6.QtCore import QSortFilterProxyModel, QModelIndex, Qt, \
-    QPersistentModelIndex, QObject, QAbstractItemModel, QRegularExpression
+    QPersistentModelIndex, QObject, QAbstractItemModel, QRegularExpression, QModelRoleDataSpan
 
 
 class SearchProxyModel(QSortFilterProxyModel):
@@ -32,6 +32,13 @@ class SearchProxyModel(QSortFilterProxyModel):
         items = self.sourceModel().match(start, role, value, hits, flags)
         return [self.mapFromSource(item) for item in items]
 
+    def multiData(self, index: QModelIndex, roleDataSpan: QModelRoleDataSpan) -> None:
+        # QSortFilterProxyModel would get every role separately from the source model
+        if index.isValid() and self.sourceModel() is not None:
+            self.sourceModel().multiData(self.mapToSource(index), roleDataSpan)
+        else:
+            super(SearchProxyModel, self).multiData(index, roleDataSpan)
+
     def search(self, pattern: str,
                filterColumns: List[int],
                regExp: bool = True,
@@ -71,9 +78,11 @@ class SearchProxyModel(QSortFilterProxyModel):
 
     def iterItems(self, parent: QModelIndex = QModelIndex()) -> QModelIndex:
         def recurse(parent: QModelIndex):
+            if self.canFetchMore(parent):
+                self.fetchMore(parent)
             for row in range(self.rowCount(parent)):
                 childIndex = self.index(row, 0, parent)
                 yield childIndex
-                if self.rowCount(childIndex):
+                if self.hasChildren(childIndex):
                     yield from recurse(childIndex)
         yield from recurse(parent)
@@ -24,6 +24,7 @@ from PyQt6.QtGui import QFont
 from aas_editor.models import DetailedInfoItem, StandardTable
 from aas_editor.settings.app_settings import PACKAGE_ROLE, NAME_ROLE, OBJECT_ROLE, DEFAULT_COLUMNS_IN_DETAILED_INFO,\
     PACK_ITEM_ROLE, DEFAULT_FONT
+from aas_editor.utils.journal import CommandJournal, journalOf
 
 
 class DetailedInfoTable(StandardTable):
@@ -35,9 +36,20 @@ class DetailedInfoTable(StandardTable):
         self.mainObj = packItem.data(OBJECT_ROLE)
         self.package = packItem.data(PACKAGE_ROLE)
         root = DetailedInfoItem(self.mainObj, name=packItem.data(NAME_ROLE),
-                                package=self.package, new=False)
+                                package=self.package, new=False, lazy=True)
         super(DetailedInfoTable, self).__init__(DEFAULT_COLUMNS_IN_DETAILED_INFO, root)
 
+    @property
+    def journal(self) -> CommandJournal:
+        if self.package is None:
+            return super(DetailedInfoTable, self).journal
+        return journalOf(self.package)
+
+    @property
+    def historyScope(self):
+        # history of the shown object is kept if the tab is switched to another object and back
+        return self.mainObj
+
     def data(self, index: QModelIndex, role: int = ...) -> Any:
         if role == PACK_ITEM_ROLE:
             return QModelIndex(self.packItem)
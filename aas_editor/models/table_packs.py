@@ -17,6 +17,7 @@ from aas_editor.models import StandardTable, PackTreeViewItem
 from aas_editor.package import Package
 from aas_editor.settings.app_settings import PACKAGE_ROLE, DEFAULT_FONT, OPENED_PACKS_ROLE, OPENED_FILES_ROLE, \
     DEFAULT_COLUMNS_IN_PACKS_TABLE, OBJECT_ROLE, COLUMN_NAME_ROLE, NAME_ROLE
+from aas_editor.utils.completions import completionService
 from aas_editor.utils.util_classes import ClassesInfo
 
 
@@ -50,6 +51,16 @@ class PacksTable(StandardTable):
         else:
             return super(PacksTable, self).data(index, role)
 
+    def removeRows(self, row: int, count: int, parent: QModelIndex = ...) -> bool:
+        packs = []
+        if not parent.isValid():
+            packs = [self.index(i).data(OBJECT_ROLE) for i in range(row, row + count)]
+        result = super(PacksTable, self).removeRows(row, count, parent)
+        for pack in packs:
+            if isinstance(pack, Package):
+                completionService().unregisterPackage(pack)
+        return result
+
     def editItem(self, index: QModelIndex, value):
         value = None if str(value) == "None" else value
         if index.data(COLUMN_NAME_ROLE) not in DEFAULT_COLUMNS_IN_PACKS_TABLE:
@@ -76,6 +87,11 @@ class PacksTable(StandardTable):
         else:
             return super()._addItemObjToParentObj(obj, parent)
 
+    def _addItem(self, parent: QModelIndex, itemInitKwargs):
+        if isinstance(itemInitKwargs["obj"], Package):
+            completionService().registerPackage(itemInitKwargs["obj"])
+        return super(PacksTable, self)._addItem(parent, itemInitKwargs)
+
     def _getKwargsForItemInit(self, obj: Union[Package, 'SubmodelElement', Iterable], parent):
         kwargs = super()._getKwargsForItemInit(obj, parent)
         if isinstance(obj, Package):
@@ -8,51 +8,114 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
-import copy
 import logging
 import traceback
-from collections import namedtuple, deque
-from typing import Any, Iterable, Union, AbstractSet, List
+from collections import namedtuple, deque, defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Union, AbstractSet, List, Dict, Optional
 
 from PyQt6.QtCore import QAbstractItemModel, QVariant, QModelIndex, Qt, QItemSelection, QSize, \
-    QPersistentModelIndex
+    QPersistentModelIndex, QObject, pyqtSignal, QModelRoleDataSpan
 from PyQt6.QtGui import QFont
+from basyx.aas.model import Referable
 
 from aas_editor.models import StandardItem
 from aas_editor.package import Package
 from aas_editor.settings.app_settings import NAME_ROLE, OBJECT_ROLE, ATTRIBUTE_COLUMN, \
     VALUE_COLUMN, PACKAGE_ROLE, PACK_ITEM_ROLE, DEFAULT_FONT, ADD_ITEM_ROLE, CLEAR_ROW_ROLE, \
     DATA_CHANGE_FAILED_ROLE, IS_LINK_ROLE, TYPE_COLUMN, \
-    TYPE_CHECK_ROLE, TYPE_ROLE, UNDO_ROLE, REDO_ROLE, MAX_UNDOS, UPDATE_ROLE, TYPE_HINT_COLUMN, COLUMN_NAME_ROLE, \
-    LINKED_ITEM_ROLE, COPY_ROLE
+    TYPE_CHECK_ROLE, TYPE_ROLE, UNDO_ROLE, REDO_ROLE, UPDATE_ROLE, TYPE_HINT_COLUMN, COLUMN_NAME_ROLE, \
+    LINKED_ITEM_ROLE, COPY_ROLE, COPY_SOURCE_ROLE
 from aas_editor.settings import NOT_GIVEN
 from aas_editor.settings.colors import LINK_BLUE, CHANGED_BLUE, NEW_GREEN
-from aas_editor.utils.util import actualizeAASParents
+from aas_editor.utils.clone import cloneObject, IMMUTABLE_TYPES
+from aas_editor.utils.journal import CommandJournal, JournalStack
 
 from aas_editor.utils.util_classes import ClassesInfo
 from aas_editor.additional.classes import DictItem
 from aas_editor.utils.util_type import isIterable
 
-SetDataItem = namedtuple("SetDataItem", ("index", "value", "role"))
+# path: rows from the root item to the item of index, obj: object of the item when the command was recorded,
+# they are used to find the item again, e.g. if the command was recorded by a previous model of a tab
+SetDataItem = namedtuple("SetDataItem", ("index", "value", "role", "path", "obj"), defaults=(None, None))
+# roles of setData, which change objects
+CHANGING_ROLES = (Qt.ItemDataRole.EditRole, ADD_ITEM_ROLE, CLEAR_ROW_ROLE, UNDO_ROLE, REDO_ROLE)
+
+
+class ChangeNotifier(QObject):
+    """Notifies before and after objects are changed in any table, version is increased with every change"""
+    aboutToChange = pyqtSignal()
+    # package of the changed objects, None if they do not belong to a package
+    changed = pyqtSignal(object)
+
+    def __init__(self):
+        super(ChangeNotifier, self).__init__()
+        self.version = 0
+
+    def notify(self):
+        self.aboutToChange.emit()
+        self.version += 1
+        # shown strings of items could depend on the changed objects
+        StandardItem.displayGeneration += 1
+
+    @contextmanager
+    def changing(self, package: Optional[Package] = None):
+        """
+        Notify before and after objects are changed,
+        must be used by every code changing shown objects outside of setData
+        :param package: package of the changed objects
+        """
+        self.notify()
+        try:
+            yield
+        finally:
+            if isinstance(package, Package):
+                # ids and id_shorts used by references and the id index could be changed
+                package.objStore.touch()
+            # strings shown while the change was made could be outdated
+            StandardItem.displayGeneration += 1
+            self.changed.emit(package if isinstance(package, Package) else None)
 
 
 class StandardTable(QAbstractItemModel):
     currFont = QFont(DEFAULT_FONT)
+    # roles, which multiData gets directly from the item, other roles are got from data()
+    # subclasses overriding data() for one of these roles must remove it
+    ITEM_ROLES = frozenset((Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.DecorationRole, Qt.ItemDataRole.EditRole,
+                            Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.StatusTipRole, Qt.ItemDataRole.WhatsThisRole,
+                            Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.CheckStateRole))
+    # shared by all tables, because the same objects can be shown in several tables
+    changeNotifier = ChangeNotifier()
 
     def __init__(self, columns=("Item",), rootItem: StandardItem = None):
         super(StandardTable, self).__init__()
         self._rootItem = rootItem
         self._columns = columns
         self.lastErrorMsg = ""
-        self.undo: deque[SetDataItem] = deque(maxlen=MAX_UNDOS)
-        self.redo: List[SetDataItem] = []
+        self._journal: Optional[CommandJournal] = None
+        self._replaying = False
         self.changedItems: List[QModelIndex] = []
+        self._fetchingMore = False
+        # lookup index for match(): obj id and obj type -> items
+        self._itemsByObjId: Dict[int, Dict[StandardItem, None]] = defaultdict(dict)
+        self._itemsByType: Dict[type, Dict[StandardItem, None]] = defaultdict(dict)
+        self._itemLookupKeys: Dict[StandardItem, tuple] = {}
+        # display text -> items, built on the first display text match and again if shown strings could be changed
+        self._itemsByDisplayText: Optional[Dict[str, List[StandardItem]]] = None
+        self._displayTextGeneration = None
+        # fonts by cell style and the row size hint, created again if the point size of currFont changes
+        self._fonts: Dict[str, QFont] = {}
+        self._sizeHint = QSize()
+        self._stylePointSize = None
+        if rootItem is not None:
+            rootItem.fetchMore()
+            self._indexChildItems(rootItem)
 
     def index(self, row: int, column: int = 0, parent: QModelIndex = QModelIndex()) -> QModelIndex:
         if not self.hasIndex(row, column, parent):
             return QModelIndex()
         parentObj = self.objByIndex(parent)
-        return self.createIndex(row, column, parentObj.children()[row])
+        return self.createIndex(row, column, parentObj.childItem(row))
 
     def parent(self, child: QModelIndex) -> QModelIndex:
         if not child.isValid():
@@ -68,12 +131,10 @@ class StandardTable(QAbstractItemModel):
         if parentObj == self._rootItem or not parentObj:
             return QModelIndex()
 
-        grandParentObj = parentObj.parent()
-        row = grandParentObj.children().index(parentObj)
-        return self.createIndex(row, 0, parentObj)
+        return self.createIndex(parentObj.row(), 0, parentObj)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        return len(self.objByIndex(parent).children())
+        return self.objByIndex(parent).childCount()
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(self._columns)
@@ -93,36 +154,92 @@ class StandardTable(QAbstractItemModel):
 
         return Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
 
-    def hasChildren(self, parent: QModelIndex = ...) -> bool:
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        item = self.objByIndex(parent)
+        if item.canFetchMore():
+            return item.hasChildrenToFetch()
         return True if self.rowCount(parent) else False
 
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return self.objByIndex(parent).canFetchMore()
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        """Create child items of lazy populated item"""
+        item = self.objByIndex(parent)
+        if not item.canFetchMore():
+            return
+        self._fetchingMore = True
+        try:
+            # rows are announced before the child items are created
+            childObjects = item.childObjects()
+            if childObjects:
+                self.beginInsertRows(parent, 0, len(childObjects) - 1)
+            item.fetchMore(childObjects)
+            self._indexChildItems(item)
+            if childObjects:
+                self.endInsertRows()
+        finally:
+            self._fetchingMore = False
+
+    def isFetchingMore(self) -> bool:
+        return self._fetchingMore
+
     def objByIndex(self, index: QModelIndex):
         if not index.isValid():
             return self._rootItem
         return index.internalPointer()
 
-    def iterItems(self, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+    def iterItems(self, parent: QModelIndex = QModelIndex(),
+                  descend: Optional[Callable[[QModelIndex], bool]] = None) -> QModelIndex:
+        """
+        Yield all descendants of parent in tree order, lazy populated items are fetched.
+        :param descend: if given, only children of the indexes, for which it returns True, are yielded and fetched
+        """
         def recurse(parent: QModelIndex):
+            if self.canFetchMore(parent):
+                self.fetchMore(parent)
             for row in range(self.rowCount(parent)):
                 childIndex = self.index(row, 0, parent)
                 yield childIndex
-                child = self.objByIndex(childIndex)
-                if child.children():
+                if self.hasChildren(childIndex) and (descend is None or descend(childIndex)):
                     yield from recurse(childIndex)
         yield from recurse(parent)
 
     def match(self, start: QModelIndex, role: int, value: Any, hits: int = ...,
               flags: Qt.MatchFlag = ...) -> List[QModelIndex]:
+        """
+        Return the first hits items in tree order, which have the value in the role.
+        Lazy populated items are fetched: if the value is a Referable or Package in OBJECT_ROLE, only along its
+        parents, otherwise all items are fetched if not enough items are found
+        """
         kwargs = {}
         if hits is not ...:
             kwargs["hits"] = hits
         if flags is not ...:
             kwargs["flags"] = flags
 
+        if role == OBJECT_ROLE and isinstance(value, (Referable, Package)):
+            # referables are equal only if identical, so they can only be shown below the items of their parents,
+            # packages are shown above all referables
+            parents = set()
+            obj = value
+            while obj is not None:
+                parents.add(id(obj))
+                obj = getattr(obj, "parent", None)
+
+            def descend(index: QModelIndex) -> bool:
+                obj = self.objByIndex(index).obj
+                return not isinstance(obj, Referable) or id(obj) in parents
+        else:
+            descend = None
+            if role in (OBJECT_ROLE, TYPE_ROLE, Qt.ItemDataRole.DisplayRole) and hits != 0 and not start.isValid():
+                res = self._matchInLookupIndex(role, value, hits)
+                if res is not None:
+                    return res
+
         if role == OBJECT_ROLE and hits != 0:
             res = []
-            for item in self.iterItems(start):
-                logging.info("match for: %s", item.data(NAME_ROLE))
+            for item in self.iterItems(start, descend):
                 try:
                     if (item.data(OBJECT_ROLE) is value) or (item.data(OBJECT_ROLE) == value):
                         res.append(item)
@@ -134,7 +251,6 @@ class StandardTable(QAbstractItemModel):
         elif role == TYPE_ROLE and hits != 0:
             res = []
             for item in self.iterItems(start):
-                logging.info("match for: %s", item.data(NAME_ROLE))
                 try:
                     if issubclass(value, item.data(TYPE_ROLE)):
                         res.append(item)
@@ -146,7 +262,6 @@ class StandardTable(QAbstractItemModel):
         elif role == Qt.ItemDataRole.DisplayRole and hits != 0:
             res = []
             for item in self.iterItems(start):
-                logging.info("match for: %s", item.data(NAME_ROLE))
                 try:
                     if value == item.data(Qt.ItemDataRole.DisplayRole):
                         res.append(item)
@@ -158,9 +273,116 @@ class StandardTable(QAbstractItemModel):
         else:
             return super(StandardTable, self).match(start, role, value, **kwargs)
 
+    def _matchInLookupIndex(self, role: int, value: Any, hits: int) -> Optional[List[QModelIndex]]:
+        """Return the first hits items found in the lookup index in tree order.
+        Return None if the index doesn't contain enough items or if items before them are not fetched yet,
+        because the not fetched items could match too"""
+        if not isinstance(hits, int) or hits < 0:
+            return None
+
+        if role == OBJECT_ROLE:
+            items = [item for item in self._itemsByObjId.get(id(value), ()) if item.obj is value]
+            if len(items) < hits:
+                # equal but not identical objects are matched too
+                items = [item for item in self._itemLookupKeys if self._objEquals(item.obj, value)]
+        elif role == TYPE_ROLE:
+            if not isinstance(value, type):
+                return None
+            items = [item for cls in value.__mro__
+                     for item in self._itemsByType.get(cls, ()) if type(item.obj) is cls]
+        else:
+            if not isinstance(value, str):
+                return None
+            items = self._displayTextIndex().get(value, [])
+
+        if len(items) < hits:
+            return None
+        items.sort(key=self._itemPath)
+        items = items[:hits]
+        if items and not self._isFetchedUpTo(items[-1]):
+            return None
+        return [self.createIndex(item.row(), 0, item) for item in items]
+
+    def _isFetchedUpTo(self, lastItem: StandardItem) -> bool:
+        """Return True if all items before lastItem in tree order are fetched"""
+        items = [self._rootItem]
+        while items:
+            item = items.pop()
+            if item is lastItem:
+                return True
+            if item.canFetchMore() and item.hasChildrenToFetch():
+                return False
+            items.extend(reversed(item.childItems()))
+        return True
+
+    @staticmethod
+    def _objEquals(obj: Any, value: Any) -> bool:
+        try:
+            return obj is value or obj == value
+        except AttributeError:
+            return False
+
+    def _displayTextIndex(self) -> Dict[str, List[StandardItem]]:
+        if self._itemsByDisplayText is None or self._displayTextGeneration != StandardItem.displayGeneration:
+            self._itemsByDisplayText = defaultdict(list)
+            for item in self._itemLookupKeys:
+                displayText = item.data(Qt.ItemDataRole.DisplayRole)
+                if isinstance(displayText, str):
+                    self._itemsByDisplayText[displayText].append(item)
+            self._displayTextGeneration = StandardItem.displayGeneration
+        return self._itemsByDisplayText
+
+    @staticmethod
+    def _itemPath(item: StandardItem) -> List[int]:
+        path = []
+        while item.parent() is not None:
+            path.append(item.row())
+            item = item.parent()
+        path.reverse()
+        return path
+
+    def _indexItem(self, item: StandardItem):
+        self._unindexItem(item)
+        keys = (id(item.obj), type(item.obj))
+        self._itemLookupKeys[item] = keys
+        self._itemsByObjId[keys[0]][item] = None
+        self._itemsByType[keys[1]][item] = None
+        self._itemsByDisplayText = None
+
+    def _unindexItem(self, item: StandardItem):
+        keys = self._itemLookupKeys.pop(item, None)
+        if keys is None:
+            return
+        self._itemsByDisplayText = None
+        for lookup, key in zip((self._itemsByObjId, self._itemsByType), keys):
+            items = lookup.get(key)
+            if items is not None:
+                items.pop(item, None)
+                if not items:
+                    del lookup[key]
+
+    def _indexChildItems(self, parentItem: StandardItem):
+        """Add all created descendants of the item to the lookup index"""
+        items = parentItem.childItems()
+        while items:
+            item = items.pop()
+            self._indexItem(item)
+            items.extend(item.childItems())
+
+    def _unindexItems(self, item: StandardItem):
+        """Remove the item and its descendants from the lookup index"""
+        items = [item]
+        while items:
+            item = items.pop()
+            self._unindexItem(item)
+            items.extend(item.childItems())
+
     def addItem(self, obj: Union[Package, 'SubmodelElement', Iterable],
                 parent: QModelIndex = QModelIndex()):
         parent = parent.siblingAtColumn(0)
+        # populate parent first, otherwise the new obj would be added twice
+        if self.canFetchMore(parent):
+            self.fetchMore(parent)
         self._addItemObjToParentObj(obj, parent)
         itemInitKwargs = self._getKwargsForItemInit(obj, parent)
         return self._addItem(parent, itemInitKwargs)
@@ -170,6 +392,7 @@ class StandardTable(QAbstractItemModel):
         kwargs = {
             "obj": obj,
             "parent": parentItem,
+            "lazy": parentItem.lazy,
         }
         return kwargs
 
@@ -188,10 +411,11 @@ class StandardTable(QAbstractItemModel):
     def _addItem(self, parent: QModelIndex, itemInitKwargs):
         self.beginInsertRows(parent, self.rowCount(parent), self.rowCount(parent))
         item = self.itemTyp(**itemInitKwargs)
+        self._indexItem(item)
+        self._indexChildItems(item)
         self.endInsertRows()
         itemIndex = self.index(item.row(), 0, parent)
-        self.undo.append(SetDataItem(index=QPersistentModelIndex(itemIndex), value=NOT_GIVEN, role=CLEAR_ROW_ROLE))
-        self.redo.clear()
+        self._addUndo(itemIndex, NOT_GIVEN, CLEAR_ROW_ROLE)
         return itemIndex
 
     def insertRows(self, row: int, count: int, parent: QModelIndex = ...) -> bool:
@@ -200,27 +424,91 @@ class StandardTable(QAbstractItemModel):
         return True
 
     def update(self, index: QModelIndex):
-        """Update item: remove all children rows, then add updated rows"""
+        """
+        Update child items to the actual obj of the item: items of removed objects are removed, items of new objects
+        are inserted, other items are kept with their children, so that expanded and selected rows stay so
+        """
         if not index.isValid():
             return QVariant()
-        if self.hasChildren(index):
-            self.beginRemoveRows(index, 0, max(self.rowCount(index)-1, 0))
+        item = self.objByIndex(index)
+        self._indexItem(item)
+        self.dataChanged.emit(index.siblingAtColumn(0), index.siblingAtColumn(self.columnCount() - 1))
+        self._updateChildItems(index, item)
+        return True
+
+    def _updateChildItems(self, index: QModelIndex, item: StandardItem):
+        if item.canFetchMore():
+            # children were not created yet, they will be created from the actual obj on demand
+            return
+
+        childObjects = item.childObjects()
+        childItems = item.childItems()
+        newRows: Dict[Any, deque] = defaultdict(deque)
+        for row, (obj, name) in enumerate(childObjects):
+            newRows[item.childKey(obj, name)].append(row)
+        # new row of every child item, None if its object was removed
+        rowsOfItems = []
+        for child in childItems:
+            rows = newRows.get(item.childKey(child.obj, child.objName))
+            rowsOfItems.append(rows.popleft() if rows else None)
+        keptRows = [row for row in rowsOfItems if row is not None]
+        if any(row > nextRow for row, nextRow in zip(keptRows, keptRows[1:])):
+            # objects were reordered
+            self._repopulate(index, item)
+            return
+
+        for start, end in reversed(self._rowRanges([row for row, newRow in enumerate(rowsOfItems) if newRow is None])):
+            self.removeRows(start, end - start + 1, index)
+
+        keptItems = [child for child, newRow in zip(childItems, rowsOfItems) if newRow is not None]
+        for child, row in zip(keptItems, keptRows):
+            obj, name = childObjects[row]
+            if child.obj is not obj or child.objName != name:
+                child.objName = name
+                child.obj = obj
+                self._indexItem(child)
+
+        keptRowsSet = set(keptRows)
+        for start, end in self._rowRanges([row for row in range(len(childObjects)) if row not in keptRowsSet]):
+            self.beginInsertRows(index, start, end)
+            for row in range(start, end + 1):
+                child = item.newChildItem(*childObjects[row])
+                item.moveChildItem(child, row)
+                self._indexItem(child)
+                self._indexChildItems(child)
+            self.endInsertRows()
+
+        if not keptItems:
+            return
+        # objects of kept items could have been changed in place, one signal for all rows of the parent
+        self.dataChanged.emit(self.index(0, 0, index), self.index(self.rowCount(index) - 1, self.columnCount() - 1, index))
+        for child in keptItems:
+            # children of not populated items are created later, immutable objects can not be changed in place
+            if not child.canFetchMore() and not isinstance(child.obj, IMMUTABLE_TYPES):
+                self._updateChildItems(self.createIndex(child.row(), 0, child), child)
+
+    def _repopulate(self, index: QModelIndex, item: StandardItem):
+        """Remove all child items and create them again"""
+        if self.rowCount(index):
             self.removeRows(0, self.rowCount(index), index)
-            self.endRemoveRows()
-            self.rowsRemoved.emit(index, 0, max(self.rowCount(index)-1, 0))
-            self.dataChanged.emit(index.siblingAtColumn(0),
-                                  index.model().index(self.rowCount(index) - 1, self.columnCount(index) - 1, index))
-
-        self.objByIndex(index).populate()
-        if self.hasChildren(index):
-            self.beginInsertRows(index, 0, max(self.rowCount(index)-1, 0))
+        childObjects = item.childObjects()
+        if childObjects:
+            self.beginInsertRows(index, 0, len(childObjects) - 1)
+        item.populate(childObjects)
+        self._indexChildItems(item)
+        if childObjects:
             self.endInsertRows()
-            self.rowsInserted.emit(index, 0, max(self.rowCount(index)-1, 0))
-            self.dataChanged.emit(index.siblingAtColumn(0),
-                                  index.model().index(self.rowCount(index) - 1, self.columnCount(index) - 1, index))
-        else:
-            self.dataChanged.emit(index.siblingAtColumn(0), index.siblingAtColumn(self.columnCount()))
-        return True
+
+    @staticmethod
+    def _rowRanges(rows: List[int]) -> List[tuple]:
+        """Return (first, last) of consecutive rows in the sorted rows"""
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1] = (ranges[-1][0], row)
+            else:
+                ranges.append((row, row))
+        return ranges
 
     def data(self, index: QModelIndex, role: int = ...) -> Any:
         if role == Qt.ItemDataRole.ForegroundRole:
@@ -228,8 +516,8 @@ class StandardTable(QAbstractItemModel):
         if role == Qt.ItemDataRole.FontRole:
             return self._getFont(index)
         if role == Qt.ItemDataRole.SizeHintRole:
-            fontSize = self.currFont.pointSize()
-            return QSize(-1, int((fontSize+2)*1.9))
+            self._checkStyleCache()
+            return self._sizeHint
         if role == Qt.ItemDataRole.TextAlignmentRole:
             return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
         if role == DATA_CHANGE_FAILED_ROLE:
@@ -243,20 +531,16 @@ class StandardTable(QAbstractItemModel):
             return self._columns[column]
         if role == LINKED_ITEM_ROLE:
             return self.getLinkedItem(index)
-        if role == COPY_ROLE:
+        if role in (COPY_ROLE, COPY_SOURCE_ROLE):
             try:
                 if index.column() in (ATTRIBUTE_COLUMN, VALUE_COLUMN):
                     objToCopy = index.data(OBJECT_ROLE)
-                    objToCopy = copy.deepcopy(objToCopy) #FIXME
-                    actualizeAASParents(objToCopy)  # TODO check if there is a better solution to del aas parents
-                    return objToCopy
                 elif index.column() in (TYPE_COLUMN, TYPE_HINT_COLUMN):
                     return index.data(Qt.ItemDataRole.DisplayRole)
                 else:
                     objToCopy = index.data(Qt.ItemDataRole.EditRole)
-                    objToCopy = copy.deepcopy(objToCopy)
-                    actualizeAASParents(objToCopy)  # TODO check if there is a better solution to del aas parents
-                    return objToCopy
+                # source is copied later, e.g. by the clipboard when it is pasted
+                return cloneObject(objToCopy) if role == COPY_ROLE else objToCopy
             except Exception as e:
                 tb = traceback.format_exc()
                 self.lastErrorMsg = f"Error occurred copying {index.data(NAME_ROLE)}: {e}\n\n{tb}"
@@ -267,28 +551,78 @@ class StandardTable(QAbstractItemModel):
             column = index.column()
             return item.data(role, column, column_name=self._columns[column])
 
-    def _getFgColor(self, index: QModelIndex):
+    def multiData(self, index: QModelIndex, roleDataSpan: QModelRoleDataSpan) -> None:
+        """Fill all roles requested by a view for a cell, the item and its link state are looked up once"""
+        if not index.isValid():
+            for i in range(len(roleDataSpan)):
+                roleDataSpan[i].setData(self.data(index, roleDataSpan[i].role()))
+            return
+        item = self.objByIndex(index)
         column = index.column()
-        # color fg in red if obj type and typehint don't fit
-        if index.data(IS_LINK_ROLE):
+        columnName = self._columns[column]
+        isLink = None
+        for i in range(len(roleDataSpan)):
+            roleData = roleDataSpan[i]
+            role = roleData.role()
+            if role in (Qt.ItemDataRole.ForegroundRole, Qt.ItemDataRole.FontRole, IS_LINK_ROLE):
+                if isLink is None:
+                    isLink = item.isLink(column, columnName)
+                if role == Qt.ItemDataRole.ForegroundRole:
+                    value = self._fgColor(item, column, isLink)
+                elif role == Qt.ItemDataRole.FontRole:
+                    value = self._font(column, isLink)
+                else:
+                    value = isLink
+            elif role == Qt.ItemDataRole.SizeHintRole:
+                self._checkStyleCache()
+                value = self._sizeHint
+            elif role == Qt.ItemDataRole.TextAlignmentRole:
+                value = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            elif role in self.ITEM_ROLES:
+                value = item.data(role, column, column_name=columnName)
+            else:
+                value = self.data(index, role)
+            roleData.setData(value)
+
+    def _getFgColor(self, index: QModelIndex):
+        return self._fgColor(self.objByIndex(index), index.column(), index.data(IS_LINK_ROLE))
+
+    def _fgColor(self, item: StandardItem, column: int, isLink: bool):
+        if isLink:
             return LINK_BLUE
         elif column == ATTRIBUTE_COLUMN:
-            if self.objByIndex(index).new:
+            if item.new:
                 return NEW_GREEN
-            elif self.objByIndex(index).changed:
+            elif item.changed:
                 return CHANGED_BLUE
         return QVariant()
 
     def _getFont(self, index: QModelIndex):
-        font = QFont(self.currFont)
-        if index.data(IS_LINK_ROLE):
-            font.setUnderline(True)
-        elif index.column() == ATTRIBUTE_COLUMN:
-            font.setBold(True)
-            font.setUnderline(True)
-        elif index.column() not in (TYPE_COLUMN, TYPE_HINT_COLUMN):
-            font.setItalic(True)
-        return font
+        return self._font(index.column(), index.data(IS_LINK_ROLE))
+
+    def _font(self, column: int, isLink: bool):
+        self._checkStyleCache()
+        if isLink:
+            return self._fonts["link"]
+        elif column == ATTRIBUTE_COLUMN:
+            return self._fonts["attribute"]
+        elif column not in (TYPE_COLUMN, TYPE_HINT_COLUMN):
+            return self._fonts["value"]
+        return self._fonts["type"]
+
+    def _checkStyleCache(self):
+        # currFont is shared by all tables of the class, so it could be zoomed by another table
+        if self._stylePointSize != self.currFont.pointSize():
+            self._updateStyleCache()
+
+    def _updateStyleCache(self):
+        self._stylePointSize = self.currFont.pointSize()
+        self._sizeHint = QSize(-1, int((self._stylePointSize + 2) * 1.9))
+        self._fonts = {style: QFont(self.currFont) for style in ("link", "attribute", "value", "type")}
+        self._fonts["link"].setUnderline(True)
+        self._fonts["attribute"].setBold(True)
+        self._fonts["attribute"].setUnderline(True)
+        self._fonts["value"].setItalic(True)
 
     def getLinkedItem(self, index: QModelIndex) -> QModelIndex:
         if not index.data(IS_LINK_ROLE):
@@ -296,7 +630,7 @@ class StandardTable(QAbstractItemModel):
         try:
             reference = self.data(index, OBJECT_ROLE)
             objStore = self.data(index, PACKAGE_ROLE).objStore
-            obj = reference.resolve(objStore)
+            obj = objStore.resolve(reference)
             linkedPackItem, = self.data(index, PACK_ITEM_ROLE).model().match(QModelIndex(), OBJECT_ROLE, obj, hits=1)
             return linkedPackItem
         except AttributeError:
@@ -305,12 +639,21 @@ class StandardTable(QAbstractItemModel):
     def setData(self, index: QModelIndex, value: Any, role: int = ...) -> bool:
         if isinstance(index, QPersistentModelIndex):
             index = QModelIndex(index)
+        if role in CHANGING_ROLES and (index.isValid() or role in (ADD_ITEM_ROLE, UNDO_ROLE, REDO_ROLE)):
+            # the item could be removed by the change
+            package = getattr(self.objByIndex(index), "package", None)
+            with self.changeNotifier.changing(package):
+                return self._setData(index, value, role)
+        return self._setData(index, value, role)
+
+    def _setData(self, index: QModelIndex, value: Any, role: int) -> bool:
         if not index.isValid() and role not in (Qt.ItemDataRole.FontRole, ADD_ITEM_ROLE, UNDO_ROLE, REDO_ROLE):
             return QVariant()
         elif role == Qt.ItemDataRole.FontRole:
             if isinstance(value, QFont):
                 font = QFont(value)
                 self.currFont.setPointSize(font.pointSize())
+                self._updateStyleCache()
                 self.dataChanged.emit(self.index(0), self.index(self.rowCount()))
                 return True
         elif role == ADD_ITEM_ROLE:
@@ -337,8 +680,7 @@ class StandardTable(QAbstractItemModel):
                 newValue, oldValue = self.editItem(index, value)
                 self.setChanged(index)
                 self.update(index)
-                self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=oldValue, role=role))
-                self.redo.clear()
+                self._addUndo(index, oldValue, role)
                 return True
             except Exception as e:
                 tb = traceback.format_exc()
@@ -346,26 +688,17 @@ class StandardTable(QAbstractItemModel):
                 self.dataChanged.emit(index, index, [DATA_CHANGE_FAILED_ROLE])
         elif role == UNDO_ROLE:
             if value == NOT_GIVEN and self.undo:
-                lastUndo: SetDataItem = self.undo.pop()
-                tempRedoList = self.redo
-                self.redo = []
-                if self.setData(*lastUndo):
-                    self.redo = tempRedoList
+                if self._replay(self.undo.pop()):
                     self.redo.append(self.undo.pop())
                     return True
             elif isIterable(value):
-                self.undo = deque(value)
+                self.undo.replace(value)
                 return True
         elif role == REDO_ROLE:
             if value == NOT_GIVEN and self.redo:
-                lastRedo: SetDataItem = self.redo.pop()
-                tempRedoList = self.redo
-                self.redo = []
-                if self.setData(*lastRedo):
-                    self.redo = tempRedoList
-                    return True
+                return self._replay(self.redo.pop())
             elif isIterable(value):
-                self.redo = list(value)
+                self.redo.replace(value)
                 return True
         elif role == UPDATE_ROLE:
             self.update(index)
@@ -373,6 +706,64 @@ class StandardTable(QAbstractItemModel):
             raise ValueError(f"Unknown role: {role}")
         return False
 
+    @property
+    def journal(self) -> CommandJournal:
+        """Journal with the undo history, tables showing objects of one package use the journal of the package"""
+        if self._journal is None:
+            self._journal = CommandJournal()
+        return self._journal
+
+    @property
+    def historyScope(self):
+        """Key of the commands of the table in the journal, tables with the same scope share their history"""
+        return self
+
+    @property
+    def undo(self) -> JournalStack:
+        return self.journal.undoStack(self.historyScope)
+
+    @property
+    def redo(self) -> JournalStack:
+        return self.journal.redoStack(self.historyScope)
+
+    def _addUndo(self, index: QModelIndex, value: Any, role: int):
+        item = self.objByIndex(index)
+        self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=value, role=role,
+                                     path=self._itemPath(item), obj=item.obj))
+        if not self._replaying:
+            self.redo.clear()
+
+    def _replay(self, command: SetDataItem) -> bool:
+        """Apply undo or redo command, the inverse command is added to the undo stack"""
+        index = self._commandIndex(command)
+        if index is None:
+            return False
+        self._replaying = True
+        try:
+            return bool(self.setData(index, command.value, command.role))
+        finally:
+            self._replaying = False
+
+    def _commandIndex(self, command: SetDataItem) -> Optional[QModelIndex]:
+        """Return index of the command item in this table or None if the item is not shown anymore"""
+        if command.index.isValid() and command.index.model() is self:
+            return QModelIndex(command.index)
+        if command.path is None:
+            return QModelIndex() if command.role == ADD_ITEM_ROLE and not command.index.isValid() else None
+        # the command was recorded by another table with the same scope or its item was removed meanwhile
+        index = QModelIndex()
+        for row in command.path:
+            if self.canFetchMore(index):
+                self.fetchMore(index)
+            index = self.index(row, 0, index)
+            if not index.isValid():
+                return None
+        obj = self.objByIndex(index).obj
+        # dict items are created again with every item
+        if obj is not command.obj and not (isinstance(obj, DictItem) and obj == command.obj):
+            return None
+        return index
+
     def editItem(self, index: QModelIndex, value):
         newValue = None if str(value) == "None" else value
         item = self.objByIndex(index)
@@ -441,10 +832,9 @@ class StandardTable(QAbstractItemModel):
         parentItem = self.objByIndex(parent)
 
         self.beginRemoveRows(parent, row, row+count-1)
-        for n in range(count):
-            child = parentItem.children()[row]
-            child.setParent(None)
-            # child.deleteLater()
+        for child in parentItem.childItems()[row:row+count]:
+            self._unindexItems(child)
+        parentItem.removeChildItems(row, count)
         self.endRemoveRows()
         return True
 
@@ -464,7 +854,7 @@ class StandardTable(QAbstractItemModel):
                 pass
 
         for currRow in range(row+count-1, row-1, -1):
-            child = parentItem.children()[currRow]
+            child = parentItem.childItem(currRow)
             if isinstance(parentObj, (list, dict, AbstractSet)):
                 if isinstance(parentObj, list):
                     oldValue = parentObj.pop(currRow)
@@ -480,8 +870,7 @@ class StandardTable(QAbstractItemModel):
                         f"object could not be deleted or set to default: "
                         f"{type(parentObj)}")
                 self.removeRow(currRow, parent)
-                self.undo.append(SetDataItem(index=QPersistentModelIndex(parent), value=oldValue, role=ADD_ITEM_ROLE))
-                self.redo.clear()
+                self._addUndo(parent, oldValue, ADD_ITEM_ROLE)
             else:
                 if not defaultVal == NOT_GIVEN:
                     index = self.index(currRow, 0, parent)
@@ -490,10 +879,7 @@ class StandardTable(QAbstractItemModel):
                     # close package
                     oldValue = child.obj
                     self.removeRow(currRow, parent)
-                    self.undo.append(
-                        SetDataItem(index=QPersistentModelIndex(parent), value=oldValue,
-                                    role=ADD_ITEM_ROLE))
-                    self.redo.clear()
+                    self._addUndo(parent, oldValue, ADD_ITEM_ROLE)
                 else:
                     raise TypeError(
                         f"Unknown parent object type: "
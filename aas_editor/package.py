@@ -9,31 +9,80 @@
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
 import io
+import mmap
+import os
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Union, Iterable, Optional
+from typing import Union, Iterable, Optional, Callable, IO, Dict, Any, Iterator
 import mimetypes
 
 from basyx.aas.adapter.aasx import DictSupplementaryFileContainer, AASXReader, AASXWriter
 from basyx.aas.adapter.json import write_aas_json_file, read_aas_json_file_into
 from basyx.aas.adapter.xml import write_aas_xml_file, read_aas_xml_file_into
-from basyx.aas.model import AssetAdministrationShell, Submodel, ConceptDescription, \
-    SetObjectStore, Key, ModelReference
+from basyx.aas.model import AssetAdministrationShell, Submodel, ConceptDescription, ModelReference, DictObjectStore
 
-from aas_editor.settings.defaults import DEFAULT_COMPLETIONS
+from aas_editor.utils.object_store import IndexedObjectStore
+from aas_editor.utils.supplementary_files import LazySupplementaryFileContainer, COPY_CHUNK_SIZE, openFile, \
+    readFile
 from aas_editor.settings.app_settings import AppSettings
 
 
+# called with number of processed bytes and total number of bytes (0 if unknown)
+ProgressCallback = Callable[[int, int], None]
+
+
+class ProgressFile:
+    """Binary file wrapper, which reports the number of read or written bytes to a callback"""
+
+    def __init__(self, file: IO[bytes], callback: ProgressCallback, total: int = 0):
+        self._file = file
+        self._callback = callback
+        self._total = total
+        self._done = 0
+
+    def _count(self, numOfBytes: int):
+        self._done += numOfBytes
+        # zip readers may read some parts twice
+        total = max(self._total, self._done) if self._total else 0
+        self._callback(self._done, total)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self._count(len(data))
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        data = self._file.read1(size)
+        self._count(len(data))
+        return data
+
+    def readinto(self, buffer) -> int:
+        numOfBytes = self._file.readinto(buffer)
+        self._count(numOfBytes or 0)
+        return numOfBytes
+
+    def write(self, data) -> int:
+        numOfBytes = self._file.write(data)
+        self._count(len(data))
+        return numOfBytes
+
+    def __getattr__(self, item):
+        return getattr(self._file, item)
+
+
 class Package:
-    def __init__(self, file: Union[str, Path] = "", failsafe=False):
-        """:raise TypeError if file has wrong file type"""
-        self.objStore = SetObjectStore()
-        self.fileStore = DictSupplementaryFileContainer()
+    def __init__(self, file: Union[str, Path] = "", failsafe=False, progress: Optional[ProgressCallback] = None):
+        """
+        :param progress: called while the file is read; the reading is aborted if it raises an exception
+        :raise TypeError if file has wrong file type
+        """
+        self.objStore = IndexedObjectStore()
+        # supplementary files of AASX files are read from the file when they are needed
+        self.fileStore = LazySupplementaryFileContainer()
         self.file = file
         if file:
-            self._read(failsafe)
-        for obj in self.objStore:
-            DEFAULT_COMPLETIONS[Key]["value"].append(obj.id)
+            self._read(failsafe, progress)
         self._changed = False
 
     @property
@@ -66,42 +115,86 @@ class Package:
     def __repr__(self):
         return self.file.as_posix()
 
-    def _read(self, failsafe):
+    def _read(self, failsafe, progress: Optional[ProgressCallback] = None):
+        if progress is None:
+            self._readFrom(self.file.as_posix(), failsafe)
+        else:
+            with open(self.file, "rb") as fileIO:
+                self._readFrom(ProgressFile(fileIO, progress, os.fstat(fileIO.fileno()).st_size), failsafe)
+
+    def _readFrom(self, file: Union[str, IO[bytes]], failsafe):
+        # objects are read into a dict store, ids can not be changed while reading, and added at once
+        objStore = DictObjectStore()
         fileType = self.file.suffix.lower().strip()
         if fileType == ".xml":
-            read_aas_xml_file_into(self.objStore, self.file, failsafe=failsafe)
+            read_aas_xml_file_into(objStore, file, failsafe=failsafe)
         elif fileType == ".json":
-            read_aas_json_file_into(self.objStore, self.file, failsafe=failsafe)
+            read_aas_json_file_into(objStore, file, failsafe=failsafe)
         elif fileType == ".aasx":
-            reader = AASXReader(self.file.as_posix(), failsafe=failsafe)
-            reader.read_into(self.objStore, self.fileStore)
+            reader = AASXReader(file, failsafe=failsafe)
+            self.fileStore.sourceFile = self.file
+            reader.read_into(objStore, self.fileStore)
         else:
             raise TypeError("Wrong file type:", self.file.suffix)
-
-    def write(self, file: str = None):
-        if self.allSubmodelRefsToAas:
+        self.objStore.update(objStore)
+
+    def writeSettings(self) -> Dict[str, Any]:
+        """Return app settings used for writing, so that they can be read before writing in another thread"""
+        return {
+            "writeJsonInAasx": self.writeJsonInAasx,
+            "writePrettyJson": self.writePrettyJson,
+            "sortKeysInJson": self.sortKeysInJson,
+            "allSubmodelRefsToAas": self.allSubmodelRefsToAas,
+        }
+
+    def write(self, file: str = None, progress: Optional[ProgressCallback] = None,
+              settings: Optional[Dict[str, Any]] = None):
+        """
+        :param progress: called while the file is written. If it raises an exception, the writing is aborted.
+                         An existing file is only replaced if the writing succeeds
+        :param settings: settings returned by writeSettings, current app settings are used if not given
+        """
+        settings = self.writeSettings() if settings is None else settings
+        if settings["allSubmodelRefsToAas"]:
             self.all_submodels_to_aas()
         if file:
             self.file: Path = file
 
+        fileType = self.file.suffix.lower().strip()
+        if fileType not in (".xml", ".json", ".aasx"):
+            raise TypeError("Wrong file type:", self.file.suffix)
+
+        # supplementary files may be read from the file being replaced, so a temporary file is written first
+        tmpFile = self.file.with_name(f".{self.file.name}.tmp")
+        try:
+            with open(tmpFile, "wb") as fileIO:
+                self._writeInto(fileIO if progress is None else ProgressFile(fileIO, progress), settings)
+            if fileType == ".aasx":
+                self.fileStore.loadFilesMissingIn(tmpFile)
+            os.replace(tmpFile, self.file)
+        finally:
+            tmpFile.unlink(missing_ok=True)
+        if fileType == ".aasx":
+            self.fileStore.setSourceFile(self.file)
+
+    def _writeInto(self, fileIO: IO[bytes], settings: Dict[str, Any]):
         fileType = self.file.suffix.lower().strip()
         if fileType == ".xml":
             # The file must be opened in binary mode! The XML writer will handle
             # character encoding internally.
-            with open(self.file.as_posix(), 'wb') as xml_file:
-                write_aas_xml_file(xml_file, self.objStore)
+            write_aas_xml_file(fileIO, self.objStore)
         elif fileType == ".json":
-            with open(self.file.as_posix(), "w", encoding='utf-8') as fileIO:
-                indent = 2 if self.writePrettyJson else None
-                sort_keys = True if self.sortKeysInJson else False
-                write_aas_json_file(fileIO, self.objStore, indent=indent, sort_keys=sort_keys)
-
+            textIO = io.TextIOWrapper(fileIO, encoding='utf-8')
+            indent = 2 if settings["writePrettyJson"] else None
+            sort_keys = True if settings["sortKeysInJson"] else False
+            write_aas_json_file(textIO, self.objStore, indent=indent, sort_keys=sort_keys)
+            # keep the binary file open, it is closed by the caller
+            textIO.detach()
         elif fileType == ".aasx":
-            with AASXWriter(self.file.as_posix()) as writer:
-                writer.write_all_aas_objects("/aasx/data.{}".format("json" if self.writeJsonInAasx else "xml"),
-                                             self.objStore, self.fileStore, self.writeJsonInAasx)
-        else:
-            raise TypeError("Wrong file type:", self.file.suffix)
+            writeJson = settings["writeJsonInAasx"]
+            with AASXWriter(fileIO) as writer:
+                writer.write_all_aas_objects("/aasx/data.{}".format("json" if writeJson else "xml"),
+                                             self.objStore, self.fileStore, writeJson)
 
     def all_submodels_to_aas(self):
         """Add references of all existing submodels to submodel attribute of existing AAS."""
@@ -142,9 +235,10 @@ class Package:
     #             yield obj
 
     def _iter_objects(self, objtype):
-        for obj in self.objStore:
-            if isinstance(obj, objtype):
-                yield obj
+        yield from self.objStore.objectsOfType(objtype)
+
+    def _numOfObjects(self, objtype) -> int:
+        return self.objStore.numOfType(objtype)
 
     @property
     def files(self):
@@ -153,7 +247,8 @@ class Package:
 
     def add(self, obj):
         if isinstance(obj, StoredFile):
-            newName = self.fileStore.add_file(name=obj.name, file=obj.file(), content_type=obj.mime_type)
+            with obj.open() as file:
+                newName = self.fileStore.add_file(name=obj.name, file=file, content_type=obj.mime_type)
             obj.setFileStore(newName, self.fileStore)
         else:
             self.objStore.add(obj)
@@ -163,15 +258,15 @@ class Package:
 
     @property
     def numOfShells(self) -> int:
-        return len(tuple(self.shells))
+        return self._numOfObjects(AssetAdministrationShell)
 
     @property
     def numOfSubmodels(self) -> int:
-        return len(tuple(self.submodels))
+        return self._numOfObjects(Submodel)
 
     @property
     def numOfConceptDescriptions(self) -> int:
-        return len(tuple(self.concept_descriptions))
+        return self._numOfObjects(ConceptDescription)
 
 
 class StoredFile:
@@ -224,16 +319,68 @@ class StoredFile:
 
     @property
     def value(self) -> bytes:
-        return self.file().getvalue()
+        if self.savedInStore():
+            return readFile(self._fileStore, self.name)
+        return self._filePath.read_bytes()
+
+    @property
+    def size(self) -> int:
+        if self.savedInStore():
+            if isinstance(self._fileStore, LazySupplementaryFileContainer):
+                return self._fileStore.get_size(self.name)
+            return len(self.value)
+        return self._filePath.stat().st_size
 
     def file(self) -> io.BytesIO:
+        # BytesIO shares the buffer of the bytes until it is written
+        return io.BytesIO(self.value)
+
+    def open(self) -> IO[bytes]:
+        """Return a binary file object for reading the content in chunks, it must be closed by the caller"""
         if self.savedInStore():
-            file_content = io.BytesIO()
-            self._fileStore.write_file(self.name, file_content)
-        else:
-            with open(self._filePath, "rb") as f:
-                file_content = io.BytesIO(f.read())
-        return file_content
+            return openFile(self._fileStore, self.name)
+        return open(self._filePath, "rb")
+
+    def iterChunks(self, chunkSize: int = COPY_CHUNK_SIZE) -> Iterator[bytes]:
+        with self.open() as file:
+            for chunk in iter(lambda: file.read(chunkSize), b""):
+                yield chunk
+
+    def copyTo(self, stream: IO[bytes]) -> int:
+        """Write the content into the stream in chunks, return number of written bytes"""
+        size = 0
+        for chunk in self.iterChunks():
+            stream.write(chunk)
+            size += len(chunk)
+        return size
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        """
+        Return context manager giving the content as read-only memoryview, which must not be used after exit.
+        Local files are memory-mapped instead of read, the mapping is closed on exit.
+        Files not read from the AASX file yet must be read in chunks, see open and iterChunks
+        """
+        if self.savedInStore():
+            if isinstance(self._fileStore, LazySupplementaryFileContainer) and self._fileStore.isLazy(self.name):
+                raise ValueError(f"{self.name} is not read from the AASX file, use open() or iterChunks()")
+            yield memoryview(self.value)
+            return
+        with open(self._filePath, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                fileMap = None
+            else:
+                # the mapping stays valid after the file is closed
+                fileMap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if fileMap is None:
+            yield memoryview(b"")
+            return
+        view = memoryview(fileMap)
+        try:
+            yield view
+        finally:
+            view.release()
+            fileMap.close()
 
     def setFileStore(self, name: str, fileStore: DictSupplementaryFileContainer):
         if name is None or isinstance(name, str):
@@ -29,6 +29,8 @@ def _register_search_path(path: Path) -> Path:
 
 
 SUBMODEL_TEMPLATES_FOLDER = _PACKAGE_DIR / "submodel_templates"
+# names and ids of submodels in the template files, so that templates are not parsed on every start
+SUBMODEL_TEMPLATES_INDEX_FILE = _PACKAGE_DIR / "submodel_templates_index.json"
 
 PYPROJECT_TOML = toml.load(_PACKAGE_DIR.parent / "pyproject.toml")
 
@@ -57,10 +59,15 @@ DEFAULT_FONT = QFont()
 DEFAULT_FONT.setWeight(40)
 DEFAULT_FONT.setPointSize(12)
 
-MAX_UNDOS = 10
+# bytes of undo history kept per package
+DEFAULT_UNDO_MEMORY_BUDGET = 64 << 20
+# ms after which a progress dialog is shown for opening and saving files
+PROGRESS_DIALOG_DELAY = 500
 MAX_RECENT_FILES = 10
 MAX_SIGNS_TO_SHOW = 1000
 MAX_SIGNS_TO_SHOW_IN_TREE = 150
+# rows measured to fit columns to their contents if fast layout of trees is enabled
+SAMPLED_ROWS_FOR_COLUMN_WIDTH = 100
 
 # Custom roles
 PACKAGE_ROLE = 1010
@@ -74,12 +81,14 @@ IS_LINK_ROLE = 1070
 IS_MEDIA_ROLE = 1080
 IS_URL_MEDIA_ROLE = 1090
 MEDIA_CONTENT_ROLE = 1100
+MEDIA_SOURCE_ROLE = 1105
 OPENED_PACKS_ROLE = 1110
 OPENED_FILES_ROLE = 1120
 ADD_ITEM_ROLE = 1130
 CLEAR_ROW_ROLE = 1140
 UPDATE_ROLE = 1150
 COPY_ROLE = 1155
+COPY_SOURCE_ROLE = 1157
 UNDO_ROLE = 1160
 REDO_ROLE = 1170
 DATA_CHANGE_FAILED_ROLE = 1180
@@ -142,6 +151,7 @@ class AppSettings:
     LEFT_ZONE_SIZE = Setting('leftZoneSize', QSize(300, 624))
     RIGHT_ZONE_SIZE = Setting('rightZoneSize', QSize(300, 624))
     AAS_FILES_TO_OPEN_ON_START = Setting('openedAasFiles', set())
+    CURRENT_AAS_FILE = Setting('currentAasFile', "", str)
     FONTSIZE_FILES_VIEW = Setting('fontSizeFilesView', DEFAULT_FONT.pointSize(), int)
     FONTSIZE_DETAILED_VIEW = Setting('fontSizeDetailedView', DEFAULT_FONT.pointSize(), int)
     PACKTREEVIEW_HEADER_STATE = Setting('packTreeViewHeaderState', None)
@@ -192,6 +202,23 @@ class AppSettings:
         default=True,
         type=bool
     )
+    UNDO_MEMORY_BUDGET = Setting(
+        name="undoMemoryBudget",
+        display_name="Memory for undo history",
+        description="Memory used for the undo history of each opened file. The oldest changes are forgotten first.",
+        options={"16 MB": 16 << 20, "64 MB": 64 << 20, "256 MB": 256 << 20, "1 GB": 1 << 30},
+        default=DEFAULT_UNDO_MEMORY_BUDGET,
+        type=int
+    )
+    FAST_TREE_LAYOUT = Setting(
+        name="fastTreeLayout",
+        display_name="Fast layout of large trees",
+        description="If enabled, the attribute tree is not resized to its content and column widths are "
+                    "computed from a sample of rows. Recommended for files with large submodels.",
+        options={"Yes": True, "No": False},
+        default=False,
+        type=bool
+    )
 
     SETTINGS_TO_CHOOSE_BY_USER = [DEFAULT_NEW_FILETYPE, WRITE_JSON_IN_AASX, ALL_SUBMODEL_REFS_TO_AAS, WRITE_PRETTY_JSON,
-                                  SORT_KEYS_IN_JSON]
+                                  SORT_KEYS_IN_JSON, UNDO_MEMORY_BUDGET, FAST_TREE_LAYOUT]
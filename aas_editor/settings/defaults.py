@@ -90,10 +90,8 @@ DEFAULTS = {
     }
 }
 
+# ids of opened objects are completed for Key values, see utils.completions
 DEFAULT_COMPLETIONS = {
-    Key: {
-        "value": []
-    },
     File: {
         "content_type": MIME_TYPES
     },
@@ -7,6 +7,8 @@
 #  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+from collections import OrderedDict
+
 from PyQt6.QtGui import QColor, QIcon, QPainter, QPixmap, QFont
 from PyQt6.QtSvg import QSvgRenderer
 
@@ -16,11 +18,16 @@ ICON_COLOR = QColor(LIGHT_BLUE.red(), LIGHT_BLUE.green(), LIGHT_BLUE.blue(), 225
 ICON_COLOR_ACTIVE = QColor(LIGHT_BLUE.red(), LIGHT_BLUE.green(), LIGHT_BLUE.blue(), 255)
 ICON_COLOR_DISABLED = QColor(LIGHT_BLUE.red(), LIGHT_BLUE.green(), LIGHT_BLUE.blue(), 50)
 
+MAX_CHARS_ICONS_IN_CACHE = 256
+# (chars, font size, color, background color) -> icon, least recently used icons are dropped first
+_CHARS_ICONS: "OrderedDict[tuple, QIcon]" = OrderedDict()
+
 
 def getCharsIcon(chars: str, font_size: int = 24, color: QColor = LIGHT_BLUE,
                  background_color: QColor = QColor("transparent")):
     """
-    Generate a QIcon from a string of characters.
+    Return a QIcon from a string of characters.
+    Icons are cached, so that equal icons are rendered only once.
 
     Args:
         chars (str): The characters to render as an icon (max 4 characters).
@@ -31,6 +38,19 @@ def getCharsIcon(chars: str, font_size: int = 24, color: QColor = LIGHT_BLUE,
     Returns:
         QIcon: An icon created from the characters.
     """
+    key = (chars, font_size, QColor(color).rgba(), QColor(background_color).rgba())
+    icon = _CHARS_ICONS.get(key)
+    if icon is None:
+        icon = _renderCharsIcon(chars, font_size, color, background_color)
+        _CHARS_ICONS[key] = icon
+        if len(_CHARS_ICONS) > MAX_CHARS_ICONS_IN_CACHE:
+            _CHARS_ICONS.popitem(last=False)
+    else:
+        _CHARS_ICONS.move_to_end(key)
+    return icon
+
+
+def _renderCharsIcon(chars: str, font_size: int, color: QColor, background_color: QColor) -> QIcon:
     if len(chars) > 4:
         raise ValueError("Max 4 characters allowed for an icon")
 
@@ -25,3 +25,7 @@ CLASSES_INFO[Package] = {
     },
     IS_EDITABLE_IN_GUI: False,
 }
+
+# infos of classes may have been resolved before Package was registered
+from aas_editor.utils.util_classes import ClassesInfo  # noqa: E402
+ClassesInfo.rebuild()
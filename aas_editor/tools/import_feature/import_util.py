@@ -24,6 +24,7 @@ import openpyxl
 from basyx.aas.model import ModelReference, Key, KeyTypes
 from openpyxl.worksheet.worksheet import Worksheet
 
+from aas_editor.models import StandardTable
 from aas_editor.tools.import_feature import import_settings
 from aas_editor.utils import util_type
 
@@ -108,16 +109,17 @@ def setMappingFromFile(pack: "Package", mappingFile: str):
     with open(mappingFile, 'r') as jsonFile:
         mapDict = json.load(jsonFile)
 
-    for refRepr in mapDict:
-        aasref: ModelReference = eval(refRepr, {
-            "Key": Key,
-            "KeyTypes": KeyTypes,
-            "ModelReference": ModelReference,
-            "basyx": basyx,
-        })
-        refObj = aasref.resolve(pack.objStore)
-        mapping = mapDict[refRepr]
-        setattr(refObj, import_settings.MAPPING_ATTR, mapping)
+    with StandardTable.changeNotifier.changing(pack):
+        for refRepr in mapDict:
+            aasref: ModelReference = eval(refRepr, {
+                "Key": Key,
+                "KeyTypes": KeyTypes,
+                "ModelReference": ModelReference,
+                "basyx": basyx,
+            })
+            refObj = aasref.resolve(pack.objStore)
+            mapping = mapDict[refRepr]
+            setattr(refObj, import_settings.MAPPING_ATTR, mapping)
 
 
 def importValueFromExampleRow(value: str, row: Dict):
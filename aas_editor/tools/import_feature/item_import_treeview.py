@@ -16,14 +16,13 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 import logging
-from types import GeneratorType
 
 from basyx.aas.adapter.aasx import DictSupplementaryFileContainer
 from basyx.aas.model import ModelReference, Referable
 
 from aas_editor.tools.import_feature.import_settings import MAPPING_ATTR
 from aas_editor.models import PackTreeViewItem, StandardItem
-from aas_editor.package import Package
+from aas_editor.package import Package, StoredFile
 from aas_editor.settings import PACKAGE_ROLE
 from aas_editor.utils.util_classes import ClassesInfo
 from aas_editor.utils.util_type import isIterable
@@ -49,28 +48,20 @@ class ImportTreeViewItem(PackTreeViewItem):
         except KeyError as e:
             logging.exception(e)
         self.obj = obj
-        self.populate()
+        if not self.lazy:
+            self.fetchMore()
 
-    def populate(self):
-        kwargs = {
-            "parent": self,
-            "new": self.new,
-        }
+    def childObjects(self):
         if ClassesInfo.hasPackViewAttrs(type(self.obj)):
-            for attr in ClassesInfo.packViewAttrs(type(self.obj)):
-                # set package objStore as obj, so that delete works
-                itemObj = getattr(self.obj, attr)
-                packItem = ImportTreeViewItem(itemObj, name=attr, **kwargs)
-                if isinstance(itemObj, GeneratorType):
-                    packItem.obj = self.obj.objStore
+            return [(self._packViewAttrObj(attr), attr) for attr in ClassesInfo.packViewAttrs(type(self.obj))]
         elif isIterable(self.obj):
             if isinstance(self.obj, DictSupplementaryFileContainer):
-                self._populateFileContainer(self.obj, **kwargs)
-            else:
-                self._populateIterable(self.obj, **kwargs)
+                return self._fileContainerObjects(self.obj)
+            return [(subObj, None) for subObj in self.obj]
+        return []
 
-    @staticmethod
-    def _populateIterable(obj, **kwargs):
-        for sub_item_obj in obj:
-            ImportTreeViewItem(sub_item_obj, **kwargs)
+    def newChildItem(self, obj, name):
+        if isinstance(obj, StoredFile):
+            return super(ImportTreeViewItem, self).newChildItem(obj, name)
+        return ImportTreeViewItem(obj, name=name, parent=self, new=self.new, lazy=self.lazy)
 
@@ -7,7 +7,6 @@
 #  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
-import copy
 import traceback
 from typing import Any
 
@@ -18,12 +17,14 @@ from aas_editor.tools.import_feature.import_settings import MAPPING_ATTR
 from aas_editor.tools.import_feature.item_import_treeview import ImportTreeViewItem
 from aas_editor.tools.import_feature.import_util_classes import PreObjectImport
 from aas_editor.models import PacksTable, SetDataItem
+from aas_editor.utils.clone import cloneObject
 from aas_editor.settings import ATTRIBUTE_COLUMN, OBJECT_ROLE, COLUMN_NAME_ROLE, EXTENDED_COLUMNS_IN_PACK_TABLE, \
     ADD_ITEM_ROLE, CLEAR_ROW_ROLE, DATA_CHANGE_FAILED_ROLE
 
 
 class ImportTable(PacksTable):
     itemTyp = ImportTreeViewItem
+    ITEM_ROLES = PacksTable.ITEM_ROLES - {Qt.ItemDataRole.EditRole}
 
     def data(self, index: QModelIndex, role: int = ...) -> Any:
         if role == Qt.ItemDataRole.EditRole:
@@ -32,7 +33,7 @@ class ImportTable(PacksTable):
                 objVal = super(ImportTable, self).data(index, Qt.ItemDataRole.EditRole)
 
                 if index.column() == ATTRIBUTE_COLUMN:
-                    objVal = copy.deepcopy(objVal)  # important to handle NamespaceSets in basyx-python
+                    objVal = cloneObject(objVal)  # important to handle NamespaceSets in basyx-python
                     preObj = PreObjectImport.fromObject(objVal)
                     mapping = getattr(objVal, MAPPING_ATTR, {})
                     preObj.setMapping(mapping)
@@ -33,6 +33,7 @@ MAPPING_COLUMN_NAME = "mapping"
 
 class DetailedInfoImportTable(DetailedInfoTable):
     currFont = QFont(DEFAULT_FONT)
+    ITEM_ROLES = DetailedInfoTable.ITEM_ROLES - {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole}
 
     def __init__(self, packItem: QModelIndex):
         self.packItem = QPersistentModelIndex(packItem)
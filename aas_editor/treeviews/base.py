@@ -31,14 +31,15 @@ import aas_editor.widgets.messsageBoxes
 from aas_editor.models.search_proxy_model import SearchProxyModel
 from aas_editor.settings.app_settings import *
 from aas_editor.additional.classes import DictItem
-from aas_editor.delegates import EditDelegate
+from aas_editor.delegates import ColorDelegate, EditDelegate
 from aas_editor.models import StandardTable
 from aas_editor.settings import TOOLBARS_HEIGHT, COPY_ICON, SC_COPY, PASTE_ICON, SC_PASTE, CUT_ICON, SC_CUT, ADD_ICON, SC_NEW, \
     EDIT_ICON, SC_EDIT_IN_DIALOG, DEL_ICON, SC_DELETE, UPDATE_ICON, UNDO_ICON, SC_UNDO, REDO_ICON, SC_REDO, SC_COLLAPSE, \
     SC_COLLAPSE_RECURS, COLLAPSE_ALL_ICON, SC_COLLAPSE_ALL, SC_EXPAND, SC_EXPAND_RECURS, EXPAND_ALL_ICON, SC_EXPAND_ALL, \
     ZOOM_IN_ICON, SC_ZOOM_IN, ZOOM_OUT_ICON, SC_ZOOM_OUT, OBJECT_ROLE, NAME_ROLE, UNDO_ROLE, REDO_ROLE, DEFAULT_FONT, \
-    MAX_FONT_SIZE, MIN_FONT_SIZE, NOT_GIVEN, UPDATE_ROLE, PARENT_OBJ_ROLE, CLEAR_ROW_ROLE, COPY_ROLE, TYPE_HINT_ROLE, \
+    MAX_FONT_SIZE, MIN_FONT_SIZE, NOT_GIVEN, UPDATE_ROLE, PARENT_OBJ_ROLE, CLEAR_ROW_ROLE, COPY_SOURCE_ROLE, TYPE_HINT_ROLE, \
     ADD_ITEM_ROLE, DATA_CHANGE_FAILED_ROLE
+from aas_editor.utils.clone import cloneObject
 from aas_editor.utils.util import getDefaultVal, getReqParams4init, getIterItemTypeHint, isSimpleIterable
 from aas_editor.utils.util_classes import ClassesInfo
 from aas_editor.utils.util_type import isIterable, checkType, isoftype
@@ -176,15 +177,76 @@ class HeaderView(QHeaderView):
             self.currSortSection = -1
 
 
+_NOT_COPIED = object()
+
+
+class ClipboardObject:
+    """
+    Handle of a copied object. The object is copied when it is pasted or
+    before objects in tables are changed, so that copying large objects returns at once.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.version = StandardTable.changeNotifier.version
+        self._copy = _NOT_COPIED
+
+    def isFrozen(self) -> bool:
+        return self._copy is not _NOT_COPIED
+
+    def freeze(self):
+        """Copy the source, must be called before the source is changed"""
+        if not self.isFrozen():
+            if self.version != StandardTable.changeNotifier.version:
+                logging.warning(f"Copied object was changed before it was pasted: {self.source}")
+            self._copy = cloneObject(self.source)
+
+    def peek(self):
+        """Return the copied state without copying it, it must not be changed"""
+        return self._copy if self.isFrozen() else self.source
+
+    def materialize(self):
+        """Return a new copy for pasting"""
+        return cloneObject(self.peek())
+
+
 class TreeClipboard:
     def __init__(self):
         self.objects: List[Any] = []
         self.objStrings: List[str] = []
+        StandardTable.changeNotifier.aboutToChange.connect(self.freeze)
 
     def clear(self):
         self.objects.clear()
         self.objStrings.clear()
 
+    def freeze(self):
+        """Copy the sources of the clipboard objects, because they are about to change"""
+        for obj in self._clipboardObjects():
+            obj.freeze()
+
+    def _clipboardObjects(self) -> List[ClipboardObject]:
+        objs = []
+        for obj in self.objects:
+            objs.extend(o for o in (obj if type(obj) is list else [obj]) if isinstance(o, ClipboardObject))
+        return objs
+
+    def objectsToPaste(self, copy=True):
+        """
+        Return the last copied object or list of objects.
+        :param copy: if False, copied objects are not copied again, e.g. if they are copied by a dialog anyway
+        """
+        obj = self.objects[-1]
+        if type(obj) is list:
+            return [self._unwrap(o, copy) for o in obj]
+        return self._unwrap(obj, copy)
+
+    @staticmethod
+    def _unwrap(obj, copy=True):
+        if isinstance(obj, ClipboardObject):
+            return obj.materialize() if copy else obj.peek()
+        return obj
+
     def append(self, obj, objRepr: str = None):
         self.objects.append(obj)
         if objRepr is None:
@@ -204,8 +266,8 @@ class TreeClipboard:
             return None
         else:
             if type(self.objects[-1]) is list:
-                return self.objects[-1][0]
-            return self.objects[-1]
+                return self._unwrap(self.objects[-1][0], copy=False)
+            return self._unwrap(self.objects[-1], copy=False)
 
     @property
     def objStrForPasteCheck(self):
@@ -242,6 +304,14 @@ class BasicTreeView(QTreeView):
         except AttributeError:
             return self.model()
 
+    def currentChanged(self, current: QModelIndex, previous: QModelIndex) -> None:
+        super(BasicTreeView, self).currentChanged(current, previous)
+        # the delegate paints the whole row of the current index as hovered
+        for index in (previous, current):
+            rect = self.visualRect(index) if index.isValid() else QRect()
+            if rect.isValid():
+                self.viewport().update(QRect(0, rect.y(), self.viewport().width(), rect.height()))
+
     def collapse(self, index: QtCore.QModelIndex) -> None:
         newIndex = index.siblingAtColumn(0)
         super(BasicTreeView, self).collapse(newIndex)
@@ -528,6 +598,7 @@ class TreeView(BasicTreeView):
         self.model().dataChanged.connect(self.onDataChanged)
         self.model().rowsInserted.connect(self.onRowsInserted)
         self.model().rowsRemoved.connect(self.onRowsRemoved)
+        self.model().rowsAboutToBeRemoved.connect(self.onRowsAboutToBeRemoved)
         self.header().updateMenu()
 
     def onCurrentChanged(self, current: QModelIndex, previous: QModelIndex):
@@ -540,10 +611,18 @@ class TreeView(BasicTreeView):
         # self.setCurrentIndex(bottomRight)
 
     def onRowsInserted(self, parent: QModelIndex, first: int, last: int):
+        if self.sourceModel().isFetchingMore():
+            # rows of lazy populated item were fetched, they were not added by user
+            return
         index = self.model().index(last, 0, parent)
         self.setCurrentIndex(index)
         QTimer.singleShot(100, self.updateUndoRedoActs)
 
+    def onRowsAboutToBeRemoved(self, parent: QModelIndex, first: int, last: int):
+        delegate = self.itemDelegate()
+        if isinstance(delegate, ColorDelegate):
+            delegate.removeRowsBgColors(self.model(), parent, first, last)
+
     def onRowsRemoved(self, parent: QModelIndex, first: int, last: int):
         self.setCurrentIndex(parent)
         QTimer.singleShot(100, self.updateUndoRedoActs)
@@ -658,7 +737,7 @@ class TreeView(BasicTreeView):
             self.onMultipleItemsCopy(indexes)
 
     def onOneItemCopy(self, index: QModelIndex):
-        data2copy = index.data(COPY_ROLE)
+        data2copy = ClipboardObject(index.data(COPY_SOURCE_ROLE))
         text2copy = index.data(Qt.ItemDataRole.DisplayRole)
         self.treeClipboard.clear()
         self.treeClipboard.append(data2copy, objRepr=text2copy)
@@ -669,7 +748,8 @@ class TreeView(BasicTreeView):
     def onMultipleItemsCopy(self, indexes: List[QModelIndex]):
         # Get top level indexes
         top_same_level_indexes = self.getTopLevelSameLevelIndexes(indexes)
-        data2copy = [i.data(COPY_ROLE) for i in top_same_level_indexes if i.data(COPY_ROLE) is not None]
+        data2copy = [ClipboardObject(data) for data in (i.data(COPY_SOURCE_ROLE) for i in top_same_level_indexes)
+                     if data is not None]
         text2copy = "\n".join([i.data(Qt.ItemDataRole.DisplayRole) for i in indexes if i.isValid()])
         self.treeClipboard.clear()
         self.treeClipboard.append(data2copy, objRepr=text2copy)
@@ -733,12 +813,14 @@ class TreeView(BasicTreeView):
         targetObj = index.data(OBJECT_ROLE)
         targetTypeHint = index.data(TYPE_HINT_ROLE)
 
-        objs2paste = self.treeClipboard.objects[-1]
         pasteWithDialog = False
+        if not isinstance(self.treeClipboard.objects[-1], list):
+            reqAttrsDict = getReqParams4init(type(self.treeClipboard.objForPasteCheck), rmDefParams=True)
+            pasteWithDialog = bool(reqAttrsDict)
+        # the dialog copies the object itself
+        objs2paste = self.treeClipboard.objectsToPaste(copy=not pasteWithDialog)
         if not isinstance(objs2paste, list):
-            reqAttrsDict = getReqParams4init(type(objs2paste), rmDefParams=True)
             objs2paste = [objs2paste]
-            pasteWithDialog = bool(reqAttrsDict)
 
         # if no req. attrs, paste data without dialog
         # else paste data with dialog for asking to check req. attrs
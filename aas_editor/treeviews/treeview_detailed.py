@@ -33,7 +33,7 @@ import aas_editor.widgets.messsageBoxes
 from aas_editor.models import DetailedInfoTable
 from aas_editor.delegates import EditDelegate
 from aas_editor.settings.app_settings import ATTR_COLUMN_WIDTH, NAME_ROLE, ATTRIBUTE_COLUMN, \
-    VALUE_COLUMN, LINKED_ITEM_ROLE, IS_LINK_ROLE, PARENT_OBJ_ROLE
+    VALUE_COLUMN, LINKED_ITEM_ROLE, IS_LINK_ROLE, PARENT_OBJ_ROLE, AppSettings, SAMPLED_ROWS_FOR_COLUMN_WIDTH
 from aas_editor.utils.util import getAttrTypeHint
 from aas_editor import dialogs
 from aas_editor.treeviews.base import TreeView
@@ -52,7 +52,12 @@ class AttrsTreeView(TreeView):
         self.setExpandsOnDoubleClick(False)
         self.setBaseSize(QtCore.QSize(429, 555))
         self.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
-        self.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
+        if AppSettings.FAST_TREE_LAYOUT.value():
+            # AdjustToContents measures every row of the tree
+            self.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustIgnored)
+            self.header().setResizeContentsPrecision(SAMPLED_ROWS_FOR_COLUMN_WIDTH)
+        else:
+            self.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
         self.setObjectName("attrsTreeView")
         self.setModelWithProxy(self.treeModel(packItem))
         self.setColumnWidth(ATTRIBUTE_COLUMN, ATTR_COLUMN_WIDTH)
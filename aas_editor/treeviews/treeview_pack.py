@@ -16,7 +16,6 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
-import copy
 import json
 import logging
 import traceback
@@ -26,13 +25,11 @@ from pathlib import Path
 from typing import Optional
 
 from PyQt6 import QtCore
-from PyQt6.QtCore import Qt, QModelIndex, QSettings, QPoint
+from PyQt6.QtCore import Qt, QModelIndex, QSettings, QPoint, QEventLoop, QTimer
 from PyQt6.QtGui import QDropEvent, QDragEnterEvent, QKeyEvent, QClipboard, QAction
-from PyQt6.QtWidgets import QMessageBox, QFileDialog, QMenu, QWidget, QApplication
-from basyx.aas.adapter.aasx import AASXReader, DictSupplementaryFileContainer
-from basyx.aas.adapter.json import read_aas_json_file, AASToJsonEncoder
-from basyx.aas.adapter.xml import read_aas_xml_file
-from basyx.aas.model import SetObjectStore, Submodel, Referable, Identifiable
+from PyQt6.QtWidgets import QMessageBox, QFileDialog, QMenu, QWidget, QApplication, QProgressDialog
+from basyx.aas.adapter.json import AASToJsonEncoder
+from basyx.aas.model import Submodel, Referable, Identifiable
 
 import aas_editor.widgets as widgets
 import aas_editor.widgets.messsageBoxes
@@ -43,13 +40,16 @@ from aas_editor.settings import FILTER_AAS_FILES, AAS_FILE_TYPE_FILTERS, NOT_GIV
 from aas_editor.settings.app_settings import NAME_ROLE, OBJECT_ROLE, PACKAGE_ROLE, \
     MAX_RECENT_FILES, OPENED_PACKS_ROLE, OPENED_FILES_ROLE, ADD_ITEM_ROLE, \
     CLEAR_ROW_ROLE, AppSettings, COLUMN_NAME_ROLE, OBJECT_COLUMN_NAME, \
-    OBJECT_VALUE_COLUMN_NAME, DEFAULT_COLUMNS_IN_PACKS_TABLE_TO_SHOW, COPY_ROLE, SUBMODEL_TEMPLATES_FOLDER, UPDATE_ROLE
+    OBJECT_VALUE_COLUMN_NAME, DEFAULT_COLUMNS_IN_PACKS_TABLE_TO_SHOW, COPY_SOURCE_ROLE, SUBMODEL_TEMPLATES_FOLDER, UPDATE_ROLE, \
+    SUBMODEL_TEMPLATES_INDEX_FILE, PROGRESS_DIALOG_DELAY, UNDO_ROLE, REDO_ROLE
 from aas_editor.settings.shortcuts import SC_OPEN, SC_SAVE_ALL
 from aas_editor.settings.icons import NEW_PACK_ICON, OPEN_ICON, OPEN_DRAG_ICON, SAVE_ICON, SAVE_ALL_ICON, ADD_ICON, \
     EDIT_JSON_ICON
 from aas_editor.utils import util_type
 from aas_editor.utils.util import getDefaultVal, getReqParams4init, getAttrTypeHint
 from aas_editor.utils.util_classes import ClassesInfo
+from aas_editor.utils.submodel_templates import SubmodelTemplatesLoader, SubmodelInfo
+from aas_editor.utils.package_io import PackageIOService, PackageIOTask, PackageIOCancelled
 from aas_editor.treeviews.base import HeaderView, TreeView
 from aas_editor import dialogs
 
@@ -143,8 +143,6 @@ class PackTreeView(TreeView):
     EMPTY_VIEW_ICON = OPEN_DRAG_ICON
 
     def __init__(self, parent=None, **kwargs):
-        self.copyBufferObjStores = dict()
-        self.scanFolderForExistFiles()
         super(PackTreeView, self).__init__(parent,
                                            emptyViewMsg=self.EMPTY_VIEW_MSG,
                                            emptyViewIcon=self.EMPTY_VIEW_ICON, **kwargs)
@@ -155,38 +153,16 @@ class PackTreeView(TreeView):
         self.setSelectionBehavior(self.SelectionBehavior.SelectItems)
         self.setHeader(PackHeaderView(Qt.Orientation.Horizontal, self))
 
-    # Scan the folder SUBMODEL_TEMPLATES_FOLDER and create a set filesObjStores of SetObjectStore elements and its names
-    def scanFolderForExistFiles(self):
-        sm_templates_path = SUBMODEL_TEMPLATES_FOLDER
+        # submodel templates are scanned in background, menu is filled as the files are scanned
+        self.submodelTemplatesLoader = SubmodelTemplatesLoader(SUBMODEL_TEMPLATES_FOLDER, self,
+                                                                indexFile=SUBMODEL_TEMPLATES_INDEX_FILE)
+        self.submodelTemplatesLoader.templateScanned.connect(self.addExistSubmodelCopyActsFromFile)
+        QApplication.instance().aboutToQuit.connect(self.submodelTemplatesLoader.stop)
+        self.submodelTemplatesLoader.start()
 
-        if not sm_templates_path.is_dir():
-            sm_templates_path.mkdir()
-
-        aasxFiles = [file for file in sm_templates_path.rglob('*.aasx')]
-        xmlFiles = [file for file in sm_templates_path.rglob('*.xml')]
-        jsonFiles = [file for file in sm_templates_path.rglob('*.json')]
-        smFiles = aasxFiles + xmlFiles + jsonFiles
-
-        # Read the aas files and store it in SetObjectStore in dictionary fileObjDict.
-        for smFile in smFiles:
-            try:
-                fileType = smFile.suffix.lower().strip()
-                if fileType == ".xml":
-                    objStore = read_aas_xml_file(smFile.as_posix())
-                elif fileType == ".json":
-                    objStore = read_aas_json_file(smFile.as_posix())
-                elif fileType == ".aasx":
-                    objStore = SetObjectStore()
-                    fileStore = DictSupplementaryFileContainer()  # prosto tak
-                    reader = AASXReader(smFile.as_posix())
-                    reader.read_into(objStore, fileStore)
-                else:
-                    raise TypeError("Wrong file type:", smFile.suffix)
-                # Save path to the file relative to the submodel folder
-                self.copyBufferObjStores[smFile.relative_to(sm_templates_path)] = objStore
-            except Exception as e:
-                # If a package is with an error, that file will be skipped.
-                logging.exception(f"Error while reading {smFile}: {e}. Submodels can not be read")
+        # packages are read and written in worker threads, so that the GUI keeps responding
+        self.packageIO = PackageIOService(self)
+        QApplication.instance().aboutToQuit.connect(self.packageIO.cancelAll)
 
     @property
     def defaultNewFileType(self):
@@ -295,31 +271,34 @@ class PackTreeView(TreeView):
                                             statusTip="Autoscroll from source",
                                             checkable=True)
 
-        self.existSubmodelCopyActsFromFiles: typing.Dict[str, typing.List[QAction]] = self.initExistSubmodelCopyActsFromFiles()
+        # {Path("file1"): list(QAction_copySubmodel1, QAction_copySubmodel2, ...)}
+        self.existSubmodelCopyActsFromFiles: typing.Dict[Path, typing.List[QAction]] = {}
 
         self.autoScrollFromSrcAct.toggle()
         self.setItemDelegate(EditDelegate(self))
 
-    def initExistSubmodelCopyActsFromFiles(self):
-        existSubmodelCopyActsFromFiles = {}  # {"file1": list(QAction_copySubmodel1, QAction_copySubmodel2, ...)}
-        # filesObjStores contains packages and its instances
-        for file, objStore in self.copyBufferObjStores.items():
-            copyExistSubmodelActs = []
-            for obj in objStore:
-                if isinstance(obj, Submodel):
-                    name = obj.id_short if not obj.id_short == "" else obj.id
-                    existSubmodelAct = QAction(name, self,
-                                               statusTip=f"Copy existing submodel in current package",
-                                               triggered=lambda: self.onAddExistingSubmodelPushed())
-                    existSubmodelAct.setData(obj)
-                    copyExistSubmodelActs.append(existSubmodelAct)
-            existSubmodelCopyActsFromFiles[file] = copyExistSubmodelActs
-        return existSubmodelCopyActsFromFiles
+    def addExistSubmodelCopyActsFromFile(self, file: Path, submodelInfos: typing.List[SubmodelInfo]):
+        """Add actions for copying submodels of the scanned template file in the 'Add existing submodel' menu"""
+        copyExistSubmodelActs = []
+        for name, submodelId in submodelInfos:
+            existSubmodelAct = QAction(name, self,
+                                       statusTip=f"Copy existing submodel in current package",
+                                       triggered=lambda: self.onAddExistingSubmodelPushed())
+            existSubmodelAct.setData((file, submodelId))
+            copyExistSubmodelActs.append(existSubmodelAct)
+        self.existSubmodelCopyActsFromFiles[file] = copyExistSubmodelActs
+        self._addExistSubmodelCopyActsToMenu(file, copyExistSubmodelActs)
 
     def onAddExistingSubmodelPushed(self):
         action = self.sender()
         if action:
-            submodel = copy.deepcopy(action.data())
+            file, submodelId = action.data()
+            try:
+                submodel = self.submodelTemplatesLoader.loadSubmodel(file, submodelId)
+            except Exception as e:
+                widgets.messsageBoxes.ErrorMessageBox.withTraceback(
+                    self, f"Submodel couldn't be read: {file}: {e}").exec()
+                return
             self.pasteSubmodel(submodel)
 
     def pasteSubmodel(self, submodel: Submodel):
@@ -406,32 +385,41 @@ class PackTreeView(TreeView):
 
         # 2. Iterate through your file paths
         for filepath, copyPasteSubmodelActs in self.existSubmodelCopyActsFromFiles.items():
-            # current_level tracks where we are in the tree for this specific file
-            current_level = self.addExistSubmodelsMenu
-
-            # Filter out parts that are purely numeric (Submodel Versions)
-            clean_parts = [p for p in filepath.parts if not p.isdigit()]
-
-            # Use parts to build the nested structure
-            for part in clean_parts:
-                # Look for an existing submenu with this title
-                found_menu = None
-                for action in current_level.actions():
-                    menu = action.menu()
-                    if menu and menu.title() == part:
-                        found_menu = menu
-                        break
-
-                # If not found, create it and set its title
-                if found_menu:
-                    current_level = found_menu
-                else:
-                    current_level = current_level.addMenu(part)
-
-            # 3. Add the actual actions to the deepest nested menu found/created
-            current_level.addActions(copyPasteSubmodelActs)
+            self._addExistSubmodelCopyActsToMenu(filepath, copyPasteSubmodelActs)
         self.attrsMenu.insertMenu(self.addAct, self.addExistSubmodelsMenu)
 
+    def _addExistSubmodelCopyActsToMenu(self, filepath: Path, copyPasteSubmodelActs: typing.List[QAction]):
+        # current_level tracks where we are in the tree for this specific file
+        current_level = self.addExistSubmodelsMenu
+
+        # Filter out parts that are purely numeric (Submodel Versions)
+        clean_parts = [p for p in filepath.parts if not p.isdigit()]
+
+        # Use parts to build the nested structure
+        for part in clean_parts:
+            # Look for an existing submenu with this title
+            found_menu = None
+            next_action = None
+            for action in current_level.actions():
+                menu = action.menu()
+                if menu and menu.title() == part:
+                    found_menu = menu
+                    break
+                if menu and next_action is None and menu.title() > part:
+                    next_action = action
+
+            # If not found, create it and set its title.
+            # Files are scanned in random order, so keep the submenus sorted
+            if found_menu:
+                current_level = found_menu
+            else:
+                new_menu = QMenu(part, current_level)
+                current_level.insertMenu(next_action, new_menu)
+                current_level = new_menu
+
+        # 3. Add the actual actions to the deepest nested menu found/created
+        current_level.addActions(copyPasteSubmodelActs)
+
     def updateActions(self, index: QModelIndex):
         super(PackTreeView, self).updateActions(index)
         self.updateCopyPasteSubmodelActs(index)
@@ -556,7 +544,7 @@ class PackTreeView(TreeView):
 
     def copyJsonOfCurrentObject(self) -> str:
         index = self.currentIndex()
-        data2copy = index.data(COPY_ROLE)
+        data2copy = index.data(COPY_SOURCE_ROLE)
         json2copy = json.dumps(data2copy, cls=AASToJsonEncoder, indent=2)
         return json2copy
 
@@ -613,9 +601,47 @@ class PackTreeView(TreeView):
                 return
 
     def openPack(self, file: str) -> typing.Union[bool, Package]:
+        return self.openPacks([file])[0]
+
+    def openPacks(self, files: typing.Iterable[str]) -> typing.List[typing.Union[bool, Package]]:
+        """Read the files concurrently and add them to the tree in the given order"""
+        tasks = self.packageIO.openAll(files)
+        self.execWithProgress(tasks, "Opening AAS files...")
+        return [self._addOpenedPack(task) for task in tasks]
+
+    def openPacksInBackground(self, files: typing.Iterable[str],
+                              priorityFile: Optional[str] = None) -> typing.List[PackageIOTask]:
+        """
+        Read the files in parallel worker processes without blocking the window.
+        Every package is added to the tree as soon as it is read, priorityFile is read first and made current.
+        """
+        files = list(files)
+        if priorityFile:
+            files.sort(key=lambda file: Path(file).absolute() != Path(priorityFile).absolute())
+        tasks = self.packageIO.openAllInProcesses(files)
+        for task in tasks:
+            makeCurrent = bool(priorityFile) and task.file == Path(priorityFile).absolute()
+            task.finished.connect(partial(self._addPackOpenedInBackground, task, makeCurrent))
+        return tasks
+
+    def _addPackOpenedInBackground(self, task: PackageIOTask, makeCurrent: bool = False):
+        # the user may already edit other packages, adding a package must not change the undo history
+        undo = list(self.model().data(QModelIndex(), UNDO_ROLE))
+        redo = list(self.model().data(QModelIndex(), REDO_ROLE))
+        pack = self._addOpenedPack(task)
+        self.model().setData(QModelIndex(), undo, UNDO_ROLE)
+        self.model().setData(QModelIndex(), redo, REDO_ROLE)
+        if pack and makeCurrent:
+            packIndex, = self.model().match(QModelIndex(), OBJECT_ROLE, pack, hits=1)
+            self.setCurrentIndex(packIndex)
+
+    def _addOpenedPack(self, task: PackageIOTask) -> typing.Union[bool, Package]:
+        file = task.file.as_posix()
+        if task.isCancelled():
+            return False
         try:
             try:
-                pack = Package(file, failsafe=False)
+                pack = task.result()
             except Exception as e:
                 msgBox = QMessageBox()
                 msgBox.setIcon(QMessageBox.Icon.Warning)
@@ -629,7 +655,11 @@ class PackTreeView(TreeView):
                 msgBox.setDetailedText(f"{traceback.format_exc()}")
                 ret = msgBox.exec()
                 if ret == QMessageBox.StandardButton.Yes:
-                    pack = Package(file, failsafe=True)
+                    failsafeTask = self.packageIO.open(file, failsafe=True)
+                    self.execWithProgress([failsafeTask], "Opening AAS file...")
+                    if failsafeTask.isCancelled():
+                        return False
+                    pack = failsafeTask.result()
                 else:
                     return False
             absFile = pack.file.absolute().as_posix()
@@ -646,21 +676,93 @@ class PackTreeView(TreeView):
                 return pack
         return False
 
+    def execWithProgress(self, tasks: typing.List[PackageIOTask], labelText: str):
+        """
+        Wait for the tasks in a local event loop, so that the window keeps repainting.
+        User input is ignored, so that the objects can not be edited while they are read or written.
+        If the tasks take longer, an application modal progress dialog with a cancel button is shown,
+        then only the dialog gets user input.
+        """
+        if all(task.isFinished() for task in tasks):
+            return
+
+        dialog = QProgressDialog(labelText, "Cancel", 0, 0, self)
+        dialog.setWindowModality(Qt.WindowModality.ApplicationModal)
+        # the dialog is shown by the timer below
+        dialog.setMinimumDuration(2 ** 31 - 1)
+        dialog.setAutoReset(False)
+        dialog.setAutoClose(False)
+        loop = QEventLoop()
+
+        def updateProgress():
+            done = sum(task.done for task in tasks)
+            if all(task.total for task in tasks):
+                total = sum(task.total for task in tasks)
+                dialog.setMaximum(100)
+                dialog.setValue(min(100, int(100 * done / total)))
+            else:
+                # the size of written files is not known in advance
+                dialog.setLabelText(f"{labelText}\n{done / 2 ** 20:.1f} MB")
+
+        def quitIfFinished():
+            if all(task.isFinished() for task in tasks):
+                loop.quit()
+
+        def showDialog():
+            dialog.show()
+            # the loop is executed again with user input for the cancel button
+            loop.quit()
+
+        for task in tasks:
+            # queued, so that the slots are called in the loop of this thread
+            task.progressChanged.connect(updateProgress, Qt.ConnectionType.QueuedConnection)
+            task.finished.connect(quitIfFinished, Qt.ConnectionType.QueuedConnection)
+        dialog.canceled.connect(lambda: [task.cancel() for task in tasks])
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(showDialog)
+        timer.start(PROGRESS_DIALOG_DELAY)
+
+        # tasks may have finished before the signals were connected
+        while not all(task.isFinished() for task in tasks):
+            if dialog.isVisible():
+                loop.exec()
+            else:
+                loop.exec(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+        timer.stop()
+        dialog.close()
+        dialog.deleteLater()
+
     def add_pack_to_tree(self, pack: Package):
         self.model().setData(QModelIndex(), pack, ADD_ITEM_ROLE)
 
     def savePack(self, pack: Package = None, file: str = None) -> bool:
         pack = self.currentIndex().data(PACKAGE_ROLE) if pack is None else pack
         try:
-            pack.write(file)
+            task = self.packageIO.save(pack, file)
+        except AttributeError as e:
+            widgets.messsageBoxes.ErrorMessageBox.withTraceback(self, f"No chosen package to save: {e}").exec()
+            return False
+        self.execWithProgress([task], f"Saving {task.file.name}...")
+        return self._onPackSaved(task)
+
+    def savePacks(self, packs: typing.Iterable[Package]) -> typing.List[bool]:
+        """Write the packages concurrently"""
+        tasks = self.packageIO.saveAll(packs)
+        self.execWithProgress(tasks, "Saving AAS files...")
+        return [self._onPackSaved(task) for task in tasks]
+
+    def _onPackSaved(self, task: PackageIOTask) -> bool:
+        try:
+            pack = task.result()
             self.updateRecentFiles(pack.file.absolute().as_posix())
             if self.model().rowCount(QModelIndex()) == 1:
                 self.setWindowModified(False)
             return True
+        except PackageIOCancelled:
+            pass
         except (TypeError, ValueError, KeyError) as e:
-            widgets.messsageBoxes.ErrorMessageBox.withTraceback(self, f"Package couldn't be saved: {file}: {e}").exec()
-        except AttributeError as e:
-            widgets.messsageBoxes.ErrorMessageBox.withTraceback(self, f"No chosen package to save: {e}").exec()
+            widgets.messsageBoxes.ErrorMessageBox.withTraceback(self, f"Package couldn't be saved: {task.file}: {e}").exec()
         return False
 
     def savePackInTypeWithDialog(self, filetype=None, pack: Package = None) -> bool:
@@ -686,7 +788,7 @@ class PackTreeView(TreeView):
                     return
 
     def saveAll(self):
-        saved = [self.savePack(pack) for pack in self.model().data(QModelIndex(), OPENED_PACKS_ROLE)]
+        saved = self.savePacks(self.model().data(QModelIndex(), OPENED_PACKS_ROLE))
         if all(saved):
             self.setWindowModified(False)
 
@@ -729,8 +831,7 @@ class PackTreeView(TreeView):
             dialog.button(QMessageBox.StandardButton.Save).setText("&Save and Close All")
             res = dialog.exec()
             if res == QMessageBox.StandardButton.Save:
-                for pack in self.model().data(QModelIndex(), OPENED_PACKS_ROLE):
-                    self.savePack(pack)
+                self.savePacks(self.model().data(QModelIndex(), OPENED_PACKS_ROLE))
             elif res == QMessageBox.StandardButton.Cancel:
                 return
         self.closeAllFiles()
@@ -828,9 +929,9 @@ class PackTreeView(TreeView):
             event.accept()
 
     def dropEvent(self, e: QDropEvent) -> None:
-        for url in e.mimeData().urls():
-            file = str(url.toLocalFile())
-            self.openPack(file)
+        files = [str(url.toLocalFile()) for url in e.mimeData().urls()]
+        # open after the drop is finished
+        QTimer.singleShot(0, partial(self.openPacks, files))
 
     def onOneItemDelClear(self, index: QModelIndex):
         attribute = index.data(COLUMN_NAME_ROLE)
@@ -874,9 +975,10 @@ class PackTreeView(TreeView):
         if attrName in (OBJECT_COLUMN_NAME, OBJECT_VALUE_COLUMN_NAME):
             super(PackTreeView, self).onPaste()
         else:
-            obj2paste = self.treeClipboard.objects[-1]
             targetTypeHint = getAttrTypeHint(type(index.data(OBJECT_ROLE)), attrName, delOptional=False)
-            reqAttrsDict = getReqParams4init(type(obj2paste), rmDefParams=True)
+            reqAttrsDict = getReqParams4init(type(self.treeClipboard.objForPasteCheck), rmDefParams=True)
+            # the dialog copies the object itself
+            obj2paste = self.treeClipboard.objectsToPaste(copy=not reqAttrsDict)
 
             # if no req. attrs, paste data without dialog
             # else paste data with dialog for asking to check req. attrs
@@ -891,6 +993,8 @@ class PackTreeView(TreeView):
                 return
 
             packIndex = self.model().match(QModelIndex(), OBJECT_ROLE, package, hits=1)[0]
+            if self.model().canFetchMore(packIndex):
+                self.model().fetchMore(packIndex)
             for row in range(self.model().rowCount(packIndex)):
                 currIndex = self.model().index(row, 0, packIndex)
                 if currIndex.data(NAME_ROLE) == SUBMODELS:
@@ -0,0 +1,137 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import copy
+import datetime
+import decimal
+import enum
+import types
+from typing import Any, Callable, Dict
+
+from basyx.aas.model import Key, Reference
+
+# instances of these types are not changed in place, so they are shared by the original and the clone
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, range, decimal.Decimal,
+                   datetime.date, datetime.time, datetime.timedelta, datetime.tzinfo, enum.Enum,
+                   type, types.FunctionType, types.BuiltinFunctionType, Key, Reference)
+
+_MISSING = object()
+
+Cloner = Callable[[Any, Dict[int, Any]], Any]
+_CLONERS: Dict[type, Cloner] = {}
+
+
+def cloneObject(obj):
+    """
+    Return a deep copy of the object, e.g. of a Submodel. The copy is not added to the parent of the original:
+    parent of the copy is None, parents of the copied children are the copied objects.
+    Immutable objects like References and Keys are not copied.
+    """
+    memo = {}
+    parent = getattr(obj, "parent", None)
+    if parent is not None:
+        # otherwise the whole tree above the object would be copied
+        memo[id(parent)] = None
+    return _clone(obj, memo)
+
+
+def _clone(obj, memo: Dict[int, Any]):
+    cloner = _CLONERS.get(type(obj))
+    if cloner is None:
+        cloner = _CLONERS[type(obj)] = _clonerForType(type(obj))
+    return cloner(obj, memo)
+
+
+def _clonerForType(cls: type) -> Cloner:
+    if issubclass(cls, IMMUTABLE_TYPES):
+        return _shareObject
+    if cls in (list, dict, set, tuple, frozenset):
+        return _CONTAINER_CLONERS[cls]
+    if cls is types.MethodType:
+        return _cloneMethod
+    if _hasPlainState(cls):
+        return _cloneObjectState
+    return copy.deepcopy
+
+
+def _hasPlainState(cls: type) -> bool:
+    """Return True if the whole state of instances of cls is in their __dict__"""
+    # abstract base classes like MutableSet define empty slots
+    if any(vars(base).get("__slots__") for base in cls.__mro__[:-1]):
+        return False
+    if issubclass(cls, (list, dict, set, tuple, frozenset)):
+        return False
+    for method in ("__deepcopy__", "__reduce__", "__reduce_ex__", "__getstate__", "__setstate__"):
+        if getattr(cls, method, None) is not getattr(object, method, None):
+            return False
+    return hasattr(cls, "__dict__")
+
+
+def _shareObject(obj, memo: Dict[int, Any]):
+    return obj
+
+
+def _cloneObjectState(obj, memo: Dict[int, Any]):
+    clone = memo.get(id(obj), _MISSING)
+    if clone is not _MISSING:
+        return clone
+    clone = object.__new__(type(obj))
+    # registered before the attributes are copied, because children refer to it as their parent
+    memo[id(obj)] = clone
+    clone.__dict__.update({name: _clone(value, memo) for name, value in obj.__dict__.items()})
+    return clone
+
+
+def _cloneMethod(method: types.MethodType, memo: Dict[int, Any]):
+    # e.g. hooks of NamespaceSets are methods of the object, which owns the set
+    return types.MethodType(method.__func__, _clone(method.__self__, memo))
+
+
+def _cloneList(obj: list, memo: Dict[int, Any]):
+    clone = memo.get(id(obj), _MISSING)
+    if clone is not _MISSING:
+        return clone
+    clone = memo[id(obj)] = []
+    clone.extend([_clone(item, memo) for item in obj])
+    return clone
+
+
+def _cloneDict(obj: dict, memo: Dict[int, Any]):
+    clone = memo.get(id(obj), _MISSING)
+    if clone is not _MISSING:
+        return clone
+    clone = memo[id(obj)] = {}
+    clone.update({_clone(key, memo): _clone(value, memo) for key, value in obj.items()})
+    return clone
+
+
+def _cloneSet(obj: set, memo: Dict[int, Any]):
+    clone = memo.get(id(obj), _MISSING)
+    if clone is not _MISSING:
+        return clone
+    clone = memo[id(obj)] = set()
+    clone.update([_clone(item, memo) for item in obj])
+    return clone
+
+
+def _cloneTuple(obj, memo: Dict[int, Any]):
+    items = [_clone(item, memo) for item in obj]
+    if all(item is orig for item, orig in zip(items, obj)):
+        return obj
+    return type(obj)(items)
+
+
+_CONTAINER_CLONERS: Dict[type, Cloner] = {
+    list: _cloneList,
+    dict: _cloneDict,
+    set: _cloneSet,
+    tuple: _cloneTuple,
+    frozenset: _cloneTuple,
+}
@@ -0,0 +1,129 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import bisect
+import heapq
+from typing import Dict, List, Optional, Tuple, Union
+
+from PyQt6.QtCore import QObject, QStringListModel, Qt, QAbstractItemModel
+from PyQt6.QtWidgets import QCompleter
+from basyx.aas.model import Key
+
+from aas_editor.settings.defaults import DEFAULT_COMPLETIONS
+
+# completions of these attributes are the ids of the objects in the opened packages
+ID_COMPLETIONS = {(Key, "value")}
+
+_SERVICE: Optional["CompletionService"] = None
+
+
+def completionService() -> "CompletionService":
+    global _SERVICE
+    if _SERVICE is None:
+        # imported here, models use the service
+        from aas_editor.models.table_standard import StandardTable
+        _SERVICE = CompletionService()
+        # ids could be changed by edits in any table, including undo and redo
+        StandardTable.changeNotifier.changed.connect(_SERVICE.invalidate)
+    return _SERVICE
+
+
+def _sortKey(text: str) -> str:
+    # same order as Qt.CaseSensitivity.CaseInsensitive, so that QCompleter can use binary search
+    return text.lower()
+
+
+class CompletionService(QObject):
+    """
+    Provides completions for attributes of objects. Ids of objects in registered packages are
+    kept sorted in one model shared by all completers. Packages must be unregistered when closed.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super(CompletionService, self).__init__(parent)
+        # sorted ids per registered package, None if ids must be collected again
+        self._packIds: Dict["Package", Optional[List[str]]] = {}
+        self._ids: List[str] = []
+        self._idKeys: List[str] = []
+        self._idsChanged = False
+        self._idsModel = QStringListModel(self)
+        self._models: Dict[Tuple[type, str], QStringListModel] = {}
+
+    def registerPackage(self, pack: "Package"):
+        self._packIds[pack] = None
+        self._idsChanged = True
+
+    def unregisterPackage(self, pack: "Package"):
+        if pack in self._packIds:
+            del self._packIds[pack]
+            self._idsChanged = True
+
+    def invalidate(self, pack: Optional["Package"]):
+        """Collect ids of the package again on the next request, e.g. after objects were added or edited"""
+        if pack is not None and pack in self._packIds:
+            self._packIds[pack] = None
+            self._idsChanged = True
+
+    def ids(self) -> List[str]:
+        """Return ids of all registered packages without duplicates"""
+        if self._idsChanged:
+            self._updateIds()
+        return self._ids
+
+    def complete(self, prefix: str) -> List[str]:
+        """Return ids starting with prefix, case insensitive"""
+        self.ids()
+        key = _sortKey(prefix)
+        start = bisect.bisect_left(self._idKeys, key)
+        end = start
+        while end < len(self._idKeys) and self._idKeys[end].startswith(key):
+            end += 1
+        return self._ids[start:end]
+
+    def completionModel(self, objType: type, attr: str) -> Optional[QStringListModel]:
+        """Return shared model with completions for attribute of objType or None if there are no completions"""
+        if (objType, attr) in ID_COMPLETIONS:
+            self.ids()
+            return self._idsModel
+        model = self._models.get((objType, attr))
+        if model is None:
+            completions = DEFAULT_COMPLETIONS.get(objType, {}).get(attr)
+            if not completions:
+                return None
+            model = QStringListModel(completions, self)
+            self._models[(objType, attr)] = model
+        return model
+
+    def completer(self, objType: type, attr: str, parent: Optional[QObject] = None) -> Optional[QCompleter]:
+        model = self.completionModel(objType, attr)
+        if model is None:
+            return None
+        return self.newCompleter(model, parent)
+
+    def newCompleter(self, completions: Union[List[str], QAbstractItemModel],
+                     parent: Optional[QObject] = None) -> QCompleter:
+        completer = QCompleter(completions, parent)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        if completions is self._idsModel:
+            # the ids are sorted, so the completer can use binary search
+            completer.setModelSorting(QCompleter.ModelSorting.CaseInsensitivelySortedModel)
+        return completer
+
+    def _updateIds(self):
+        for pack, packIds in self._packIds.items():
+            if packIds is None:
+                self._packIds[pack] = sorted((obj.id for obj in pack.objStore), key=_sortKey)
+        # only ids of changed packages are sorted again
+        seen = set()
+        self._ids = [i for i in heapq.merge(*self._packIds.values(), key=_sortKey) if not (i in seen or seen.add(i))]
+        self._idKeys = [_sortKey(i) for i in self._ids]
+        self._idsChanged = False
+        if self._idsModel.stringList() != self._ids:
+            self._idsModel.setStringList(self._ids)
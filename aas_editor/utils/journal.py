@@ -0,0 +1,163 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import sys
+import types
+import weakref
+from collections import deque
+from typing import Any, Deque, Iterable, Iterator, List, NamedTuple, Optional
+
+from aas_editor.settings.app_settings import AppSettings
+
+# estimated memory size of a journal entry without the value of its command
+ENTRY_SIZE = 200
+
+# objects of these types are not walked in when estimating the size of a value
+_LEAF_TYPES = (str, bytes, int, float, complex, bool, type(None), type,
+               types.FunctionType, types.MethodType, types.BuiltinFunctionType, types.ModuleType)
+
+_JOURNALS: "weakref.WeakKeyDictionary[Any, CommandJournal]" = weakref.WeakKeyDictionary()
+
+
+def journalOf(pack: "Package") -> "CommandJournal":
+    """Return the command journal of the package, it is shared by all models showing objects of the package"""
+    journal = _JOURNALS.get(pack)
+    if journal is None:
+        journal = _JOURNALS[pack] = CommandJournal()
+    return journal
+
+
+def estimateSize(value) -> int:
+    """
+    Return estimated memory size in bytes of the value and all objects it contains.
+    Parents are not counted: the value would otherwise include the whole package it was part of.
+    """
+    size = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, _LEAF_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            size += sys.getsizeof(obj.__dict__)
+            stack.extend(attrValue for attr, attrValue in obj.__dict__.items() if attr != "parent")
+    return size
+
+
+class _Entry(NamedTuple):
+    scope: Any
+    command: Any
+    size: int
+
+
+class CommandJournal:
+    """
+    Undo and redo history of a package. Commands are kept under a scope, e.g. the object shown in a tab,
+    so the history of a tab is not lost when its model is created again.
+    Commands keep the replaced objects themselves, the values are not copied. If the estimated size of
+    all commands exceeds the budget, the oldest commands are evicted, the last command is always kept.
+    Without a given budget the budget from the app settings is used.
+    """
+
+    def __init__(self, budget: Optional[int] = None):
+        self._budget = budget
+        self.size = 0
+        self._undo: Deque[_Entry] = deque()
+        self._redo: Deque[_Entry] = deque()
+
+    @property
+    def budget(self) -> int:
+        if self._budget is None:
+            return AppSettings.UNDO_MEMORY_BUDGET.value()
+        return self._budget
+
+    def undoStack(self, scope) -> "JournalStack":
+        return JournalStack(self, self._undo, scope)
+
+    def redoStack(self, scope) -> "JournalStack":
+        return JournalStack(self, self._redo, scope)
+
+    def push(self, entries: Deque[_Entry], scope, command):
+        """Add command to the entries, its size is estimated by its value, if it has one"""
+        entry = _Entry(scope, command, ENTRY_SIZE + estimateSize(getattr(command, "value", None)))
+        entries.append(entry)
+        self.size += entry.size
+        self._evict()
+
+    def pop(self, entries: Deque[_Entry], scope):
+        for i in range(len(entries) - 1, -1, -1):
+            if entries[i].scope is scope:
+                entry = entries[i]
+                del entries[i]
+                self.size -= entry.size
+                return entry.command
+        raise IndexError("pop from empty journal stack")
+
+    def clear(self, entries: Deque[_Entry], scope):
+        kept = [entry for entry in entries if entry.scope is not scope]
+        self.size -= sum(entry.size for entry in entries if entry.scope is scope)
+        entries.clear()
+        entries.extend(kept)
+
+    def _evict(self):
+        budget = self.budget
+        while self.size > budget and len(self._undo) + len(self._redo) > 1:
+            # commands, which would be undone or redone last, are evicted first
+            entries = self._undo if self._undo else self._redo
+            self.size -= entries.popleft().size
+
+
+class JournalStack:
+    """List-like view of the undo or redo commands of one scope in a journal, the last command is on top"""
+
+    def __init__(self, journal: CommandJournal, entries: Deque[_Entry], scope):
+        self.journal = journal
+        self._entries = entries
+        self.scope = scope
+
+    def append(self, command):
+        self.journal.push(self._entries, self.scope, command)
+
+    def extend(self, commands: Iterable):
+        for command in commands:
+            self.append(command)
+
+    def pop(self):
+        return self.journal.pop(self._entries, self.scope)
+
+    def clear(self):
+        self.journal.clear(self._entries, self.scope)
+
+    def replace(self, commands: Iterable):
+        commands = list(commands)
+        self.clear()
+        self.extend(commands)
+
+    def commands(self) -> List:
+        return [entry.command for entry in self._entries if entry.scope is self.scope]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.commands())
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries if entry.scope is self.scope)
+
+    def __bool__(self) -> bool:
+        return any(entry.scope is self.scope for entry in reversed(self._entries))
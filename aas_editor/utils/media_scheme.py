@@ -0,0 +1,115 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import logging
+import uuid
+from typing import IO, Dict, Optional
+
+from PyQt6.QtCore import QIODevice, QObject, QByteArray, QUrl
+from PyQt6.QtWebEngineCore import QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob, \
+    QWebEngineProfile
+
+MEDIA_SCHEME = b"aasx"
+
+_HANDLER: Optional["MediaSchemeHandler"] = None
+
+
+def registerMediaScheme():
+    """Register the media url scheme, must be called before the QApplication is created"""
+    scheme = QWebEngineUrlScheme(MEDIA_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme |
+                    QWebEngineUrlScheme.Flag.LocalAccessAllowed |
+                    QWebEngineUrlScheme.Flag.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def mediaSchemeHandler() -> "MediaSchemeHandler":
+    """Return the handler installed in the default profile, it is installed on the first call"""
+    global _HANDLER
+    if _HANDLER is None:
+        profile = QWebEngineProfile.defaultProfile()
+        _HANDLER = MediaSchemeHandler(profile)
+        profile.installUrlSchemeHandler(MEDIA_SCHEME, _HANDLER)
+    return _HANDLER
+
+
+class FileDevice(QIODevice):
+    """Read-only QIODevice reading from a python binary file object"""
+
+    def __init__(self, file: IO[bytes], size: int, parent: Optional[QObject] = None):
+        super(FileDevice, self).__init__(parent)
+        self._file = file
+        self._size = size
+        self.open(QIODevice.OpenModeFlag.ReadOnly)
+
+    def isSequential(self) -> bool:
+        # random access is needed by web engine to answer range requests, e.g. for seeking in videos
+        return not self._file.seekable()
+
+    def size(self) -> int:
+        return self._size
+
+    def seek(self, pos: int) -> bool:
+        if not super(FileDevice, self).seek(pos):
+            return False
+        self._file.seek(pos)
+        return True
+
+    def readData(self, maxlen: int) -> bytes:
+        return self._file.read(maxlen)
+
+    def writeData(self, data) -> int:
+        return -1
+
+    def close(self):
+        super(FileDevice, self).close()
+        self._file.close()
+
+
+class MediaSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Streams media to web engine views from their source, e.g. the file store of a package.
+    The media is neither copied into memory nor passed to the page with setContent, which has a size limit.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super(MediaSchemeHandler, self).__init__(parent)
+        self._sources: Dict[str, "MediaSource"] = {}
+
+    def addSource(self, source: "MediaSource") -> QUrl:
+        """Return url under which the media source is served, see MediaSource in models"""
+        token = uuid.uuid4().hex
+        self._sources[token] = source
+        url = QUrl()
+        url.setScheme(MEDIA_SCHEME.decode())
+        url.setHost(token)
+        url.setPath(f"/{source.name}")
+        return url
+
+    def removeSource(self, url: QUrl):
+        self._sources.pop(url.host(), None)
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        source = self._sources.get(job.requestUrl().host())
+        if source is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        try:
+            file = source.open()
+        except Exception as e:
+            logging.exception(f"Media {source.name} could not be opened: {e}")
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            return
+        # the device has to exist as long as the job
+        device = FileDevice(file, source.size, self)
+        job.destroyed.connect(device.close)
+        job.destroyed.connect(device.deleteLater)
+        job.reply(QByteArray(source.content_type.encode()), device)
@@ -0,0 +1,141 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import logging
+from typing import Dict, Iterable, List, Optional, Type
+
+from basyx.aas.model import SetObjectStore, Identifiable, Identifier, ModelReference, Referable
+
+_UNRESOLVED = object()
+
+
+class IndexedObjectStore(SetObjectStore):
+    """
+    SetObjectStore, which keeps the objects grouped by their type and an index of their ids.
+    Objects of a type are got without scanning the whole store. The store can be changed directly,
+    e.g. by deleting items in the tree view, so the index is updated in add and discard.
+
+    Ids of stored objects can be changed in the editor. Such objects are still found by get_identifiable
+    and add checks the current ids, if the id of the added object is not in the index. Use update
+    to add many objects, e.g. when a file is read, the ids are refreshed only once then.
+
+    Results of resolve are cached. The cache is cleared when the generation of the store changes,
+    it is increased when objects are added or removed and by touch after stored objects were edited.
+    touch also marks the id index as stale, it is rebuilt on the next lookup.
+    """
+
+    def __init__(self, objects: Iterable[Identifiable] = ()):
+        # objects by their exact type, dicts are used as ordered sets
+        self._buckets: Dict[type, Dict[Identifiable, None]] = {}
+        # ids the objects had when they were indexed
+        self._ids: Dict[Identifier, Identifiable] = {}
+        self._idsStale = False
+        self.generation = 0
+        self._resolved: Dict[ModelReference, object] = {}
+        self._resolvedGeneration = 0
+        super(IndexedObjectStore, self).__init__(objects)
+
+    def touch(self):
+        """Clear cached results of resolve and the id index, e.g. after ids or id_shorts of stored objects were changed"""
+        self.generation += 1
+        self._idsStale = True
+
+    def resolve(self, reference: ModelReference) -> Referable:
+        """Return reference.resolve(self), :raise KeyError if the reference can not be resolved"""
+        if self._resolvedGeneration != self.generation:
+            self._resolved.clear()
+            self._resolvedGeneration = self.generation
+        obj = self._resolved.get(reference)
+        if obj is None:
+            try:
+                obj = reference.resolve(self)
+            except (AttributeError, KeyError, NotImplementedError, TypeError, IndexError) as e:
+                # logged only once, the reference is requested e.g. every time the item is painted
+                logging.exception(e)
+                obj = _UNRESOLVED
+            self._resolved[reference] = obj
+        if obj is _UNRESOLVED:
+            raise KeyError(f"Reference could not be resolved: {reference}")
+        return obj
+
+    def refreshIds(self):
+        """Rebuild the id index, e.g. after ids of stored objects were changed"""
+        self._ids = {obj.id: obj for obj in self._backend}
+        self._idsStale = False
+
+    def _lookup(self, identifier: Identifier) -> Optional[Identifiable]:
+        """Return the stored object with the identifier or None, the index is refreshed on a miss"""
+        if self._idsStale:
+            self.refreshIds()
+        obj = self._ids.get(identifier)
+        if obj is None or obj.id != identifier:
+            # id could have been changed after the object was added
+            self.refreshIds()
+            obj = self._ids.get(identifier)
+        return obj
+
+    def get_identifiable(self, identifier: Identifier) -> Identifiable:
+        obj = self._lookup(identifier)
+        if obj is None:
+            raise KeyError(identifier)
+        return obj
+
+    def add(self, x: Identifiable) -> None:
+        if x in self._backend:
+            return
+        if self._lookup(x.id) is not None:
+            raise KeyError(f"Identifiable object with same id {x.id} is already stored in this store")
+        self._index(x)
+
+    def update(self, other: Iterable[Identifiable]) -> None:
+        """Add all objects, the ids of the stored objects are refreshed only once"""
+        self.refreshIds()
+        for x in other:
+            if x in self._backend:
+                continue
+            if x.id in self._ids:
+                raise KeyError(f"Identifiable object with same id {x.id} is already stored in this store")
+            self._index(x)
+
+    def _index(self, x: Identifiable):
+        self._backend.add(x)
+        self._ids[x.id] = x
+        self.generation += 1
+        self._buckets.setdefault(type(x), {})[x] = None
+
+    def discard(self, x: Identifiable) -> None:
+        if x not in self._backend:
+            return
+        self._backend.discard(x)
+        self.generation += 1
+        if self._ids.get(x.id) is x:
+            del self._ids[x.id]
+        else:
+            self._ids = {key: obj for key, obj in self._ids.items() if obj is not x}
+        bucket = self._buckets[type(x)]
+        del bucket[x]
+        if not bucket:
+            del self._buckets[type(x)]
+
+    def remove(self, x: Identifiable) -> None:
+        if x not in self._backend:
+            raise KeyError(x)
+        self.discard(x)
+
+    def objectsOfType(self, objType: Type) -> List[Identifiable]:
+        """Return stored objects, which are instances of objType"""
+        objects = []
+        for bucketType, bucket in self._buckets.items():
+            if issubclass(bucketType, objType):
+                objects.extend(bucket)
+        return objects
+
+    def numOfType(self, objType: Type) -> int:
+        return sum(len(bucket) for bucketType, bucket in self._buckets.items() if issubclass(bucketType, objType))
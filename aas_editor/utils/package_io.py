@@ -0,0 +1,263 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import copyreg
+import logging
+import multiprocessing
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, Future
+from pathlib import Path
+from typing import Optional, Union, Iterable, List
+
+from PyQt6.QtCore import QObject, pyqtSignal, QThreadPool
+from basyx.aas.model.base import ConstrainedLangStringSet
+
+from aas_editor.package import Package
+
+# min time in seconds between two progressChanged signals of a task
+PROGRESS_INTERVAL = 0.1
+
+
+def _reduceConstrainedLangStringSet(langStringSet: ConstrainedLangStringSet):
+    # the constraint check function is a local function, so the set is recreated from its texts
+    return type(langStringSet), (dict(langStringSet),)
+
+
+def _registerPicklers(cls=ConstrainedLangStringSet):
+    for subclass in cls.__subclasses__():
+        copyreg.pickle(subclass, _reduceConstrainedLangStringSet)
+        _registerPicklers(subclass)
+
+
+_registerPicklers()
+
+
+def readPickledPackage(file: Path, failsafe=False) -> Optional[bytes]:
+    """
+    Read the package and return it pickled. Runs in a worker process.
+    Return None if the package can not be pickled.
+    """
+    pack = Package(file, failsafe=failsafe)
+    try:
+        return pickle.dumps(pack, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logging.warning(f"Package {file} can not be sent from the worker process: {e}")
+        return None
+
+
+class PackageIOCancelled(Exception):
+    """Raised in the worker thread if a task was cancelled"""
+
+
+class PackageIOTask(QObject):
+    """
+    Reads or writes a package in a thread of a QThreadPool.
+    Signals are emitted from the worker thread, so connected slots of objects living
+    in the GUI thread are called in the GUI thread.
+    """
+    # processed bytes, total bytes (0 if unknown)
+    progressChanged = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+    def __init__(self, file: Union[str, Path, None] = None, parent: Optional[QObject] = None):
+        super(PackageIOTask, self).__init__(parent)
+        self.file = Path(file).absolute() if file else None
+        self.done = 0
+        self.total = 0
+        self._result = None
+        self._error: Optional[BaseException] = None
+        self._cancelEvent = threading.Event()
+        self._finishedEvent = threading.Event()
+        self._lastProgressTime = 0
+
+    def cancel(self):
+        """Request cancellation, the task is aborted at the next progress report"""
+        self._cancelEvent.set()
+
+    def isCancelled(self) -> bool:
+        return isinstance(self._error, PackageIOCancelled)
+
+    def isFinished(self) -> bool:
+        return self._finishedEvent.is_set()
+
+    def result(self):
+        """:raise the exception of the worker thread, PackageIOCancelled if the task was cancelled"""
+        if not self.isFinished():
+            raise RuntimeError("Task is not finished yet")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finishedEvent.wait(timeout)
+
+    def run(self):
+        try:
+            if self._cancelEvent.is_set():
+                raise PackageIOCancelled(f"Cancelled: {self.file}")
+            self._result = self._run()
+            # supplementary files of AASX files are not read, so not all bytes are reported
+            self.done = max(self.done, self.total)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._finish()
+
+    def _finish(self):
+        self._finishedEvent.set()
+        self.progressChanged.emit(self.done, self.total)
+        self.finished.emit()
+
+    def _run(self):
+        raise NotImplementedError
+
+    def _onProgress(self, done: int, total: int):
+        if self._cancelEvent.is_set():
+            raise PackageIOCancelled(f"Cancelled: {self.file}")
+        self.done, self.total = done, total
+        now = time.monotonic()
+        if now - self._lastProgressTime >= PROGRESS_INTERVAL:
+            self._lastProgressTime = now
+            self.progressChanged.emit(done, total)
+
+
+class OpenPackageTask(PackageIOTask):
+    def __init__(self, file: Union[str, Path], failsafe=False, parent: Optional[QObject] = None):
+        super(OpenPackageTask, self).__init__(file, parent)
+        self.failsafe = failsafe
+
+    def _run(self) -> Package:
+        return Package(self.file, failsafe=self.failsafe, progress=self._onProgress)
+
+
+class ProcessOpenPackageTask(OpenPackageTask):
+    """
+    Reads the package in a worker process, so that several packages are parsed in parallel.
+    If the package can not be pickled, it is read again in a thread.
+    Progress is only reported when the package is read.
+    """
+
+    def __init__(self, file: Union[str, Path], failsafe=False, parent: Optional[QObject] = None):
+        super(ProcessOpenPackageTask, self).__init__(file, failsafe, parent)
+        self._future: Optional[Future] = None
+
+    def start(self, executor: ProcessPoolExecutor):
+        self._future = executor.submit(readPickledPackage, self.file, self.failsafe)
+        self._future.add_done_callback(self._onFutureDone)
+
+    def cancel(self):
+        super(ProcessOpenPackageTask, self).cancel()
+        if self._future is not None:
+            self._future.cancel()
+
+    def _onFutureDone(self, future: Future):
+        try:
+            if future.cancelled() or self._cancelEvent.is_set():
+                raise PackageIOCancelled(f"Cancelled: {self.file}")
+            data = future.result()
+            if data is None:
+                QThreadPool.globalInstance().start(self.run)
+                return
+            self._result = pickle.loads(data)
+            self.done = self.total = self.file.stat().st_size
+        except BaseException as e:
+            self._error = e
+        self._finish()
+
+
+class SavePackageTask(PackageIOTask):
+    def __init__(self, pack: Package, file: Union[str, Path, None] = None, parent: Optional[QObject] = None):
+        super(SavePackageTask, self).__init__(file if file else pack.file, parent)
+        self.pack = pack
+        # app settings are read in the GUI thread
+        self.settings = pack.writeSettings()
+        if self.settings["allSubmodelRefsToAas"]:
+            # not imported globally, so that worker processes reading packages don't import the models
+            from aas_editor.models import StandardTable
+            # objects are changed in the GUI thread, the worker thread only writes them
+            with StandardTable.changeNotifier.changing(pack):
+                pack.all_submodels_to_aas()
+            self.settings["allSubmodelRefsToAas"] = False
+
+    def _run(self) -> Package:
+        self.pack.write(self.file, progress=self._onProgress, settings=self.settings)
+        return self.pack
+
+
+class PackageIOService(QObject):
+    """Starts package reading and writing tasks in a thread pool or in worker processes"""
+
+    def __init__(self, parent: Optional[QObject] = None, threadPool: Optional[QThreadPool] = None,
+                 maxWorkers: Optional[int] = None):
+        super(PackageIOService, self).__init__(parent)
+        self.threadPool = threadPool if threadPool else QThreadPool.globalInstance()
+        self.maxWorkers = maxWorkers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: List[PackageIOTask] = []
+
+    def open(self, file: Union[str, Path], failsafe=False) -> OpenPackageTask:
+        return self._start(OpenPackageTask(file, failsafe))
+
+    def openAll(self, files: Iterable[Union[str, Path]], failsafe=False) -> List[OpenPackageTask]:
+        """Read the files concurrently"""
+        return [self.open(file, failsafe) for file in files]
+
+    def openAllInProcesses(self, files: Iterable[Union[str, Path]], failsafe=False) -> List[ProcessOpenPackageTask]:
+        """Read the files in parallel worker processes, in order of files if there are more files than workers"""
+        if self._executor is None:
+            # spawn, so that the GUI process with its threads is not forked
+            self._executor = ProcessPoolExecutor(max_workers=self.maxWorkers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        tasks = []
+        for file in files:
+            task = ProcessOpenPackageTask(file, failsafe)
+            self._addTask(task)
+            task.start(self._executor)
+            tasks.append(task)
+        return tasks
+
+    def save(self, pack: Package, file: Union[str, Path, None] = None) -> SavePackageTask:
+        return self._start(SavePackageTask(pack, file))
+
+    def saveAll(self, packs: Iterable[Package]) -> List[SavePackageTask]:
+        return [self.save(pack) for pack in packs]
+
+    def runningTasks(self) -> List[PackageIOTask]:
+        return list(self._tasks)
+
+    def cancelAll(self):
+        for task in self._tasks:
+            task.cancel()
+        self._shutdownExecutor()
+
+    def _start(self, task: PackageIOTask) -> PackageIOTask:
+        self._addTask(task)
+        self.threadPool.start(task.run)
+        return task
+
+    def _addTask(self, task: PackageIOTask):
+        self._tasks.append(task)
+        task.finished.connect(lambda: self._onTaskFinished(task))
+
+    def _onTaskFinished(self, task: PackageIOTask):
+        try:
+            self._tasks.remove(task)
+        except ValueError:
+            pass
+        if not any(isinstance(task, ProcessOpenPackageTask) for task in self._tasks):
+            # worker processes are not kept alive
+            self._shutdownExecutor()
+
+    def _shutdownExecutor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
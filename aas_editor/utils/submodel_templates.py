@@ -0,0 +1,216 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, Future
+from pathlib import Path
+from typing import List, Tuple, Optional, Dict, Any
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from basyx.aas.adapter.aasx import AASXReader, DictSupplementaryFileContainer
+from basyx.aas.adapter.json import read_aas_json_file
+from basyx.aas.adapter.xml import read_aas_xml_file
+from basyx.aas.model import SetObjectStore, Submodel
+
+TEMPLATE_FILE_TYPES = (".aasx", ".xml", ".json")
+
+INDEX_VERSION = 1
+
+# (submodel name, submodel id)
+SubmodelInfo = Tuple[str, str]
+# {"mtime": int, "size": int, "hash": str, "submodels": [[name, id], ...]}
+IndexEntry = Dict[str, Any]
+
+
+def readTemplateFile(file: Path) -> SetObjectStore:
+    """:raise TypeError if file has wrong file type"""
+    fileType = file.suffix.lower().strip()
+    if fileType == ".xml":
+        objStore = read_aas_xml_file(file.as_posix())
+    elif fileType == ".json":
+        objStore = read_aas_json_file(file.as_posix())
+    elif fileType == ".aasx":
+        objStore = SetObjectStore()
+        fileStore = DictSupplementaryFileContainer()
+        reader = AASXReader(file.as_posix())
+        reader.read_into(objStore, fileStore)
+    else:
+        raise TypeError("Wrong file type:", file.suffix)
+    return objStore
+
+
+def scanTemplateFile(file: Path) -> List[SubmodelInfo]:
+    """Return names and ids of submodels in the file. Runs in a worker process, so only the result is kept"""
+    submodelInfos = []
+    for obj in readTemplateFile(file):
+        if isinstance(obj, Submodel):
+            name = obj.id_short if not obj.id_short == "" else obj.id
+            submodelInfos.append((name, obj.id))
+    return submodelInfos
+
+
+def fileHash(file: Path) -> str:
+    sha = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def fileStamp(file: Path) -> Tuple[int, int]:
+    """Return mtime in ns and size of the file"""
+    stat = file.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def indexTemplateFile(file: Path, oldEntry: Optional[IndexEntry] = None) -> IndexEntry:
+    """
+    Return index entry of the file. Runs in a worker process.
+    The file is parsed only if its content differs from the one of oldEntry.
+    """
+    mtime, size = fileStamp(file)
+    sha = fileHash(file)
+    if oldEntry and oldEntry.get("hash") == sha:
+        submodelInfos = oldEntry["submodels"]
+    else:
+        submodelInfos = scanTemplateFile(file)
+    return {"mtime": mtime, "size": size, "hash": sha, "submodels": [list(i) for i in submodelInfos]}
+
+
+def readTemplatesIndex(indexFile: Path) -> Dict[str, IndexEntry]:
+    """Return entries of the index file by paths relative to the templates folder"""
+    try:
+        with open(indexFile, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        return dict(index["files"])
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Submodel templates index {indexFile} could not be read: {e}")
+        return {}
+
+
+def writeTemplatesIndex(indexFile: Path, entries: Dict[str, IndexEntry]):
+    tmpFile = indexFile.with_name(f"{indexFile.name}.tmp")
+    with open(tmpFile, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "files": entries}, f)
+    os.replace(tmpFile, indexFile)
+
+
+def findTemplateFiles(folder: Path) -> List[Path]:
+    files = []
+    for fileType in TEMPLATE_FILE_TYPES:
+        files.extend(folder.rglob(f"*{fileType}"))
+    return files
+
+
+class SubmodelTemplatesLoader(QObject):
+    """
+    Scans the submodel template files in worker processes.
+    Parsed templates are not kept: a submodel is read again from its file when it is requested.
+    If indexFile is given, names and ids of submodels are stored there and only files
+    whose mtime or size changed since the last scan are scanned again.
+    """
+    # path relative to the templates folder, submodel infos
+    templateScanned = pyqtSignal(Path, list)
+    finished = pyqtSignal()
+    # emitted from executor thread, so that results are handled in the thread of the loader
+    _fileDone = pyqtSignal(Path, Future)
+
+    def __init__(self, folder: Path, parent: Optional[QObject] = None, maxWorkers: Optional[int] = None,
+                 indexFile: Optional[Path] = None):
+        super(SubmodelTemplatesLoader, self).__init__(parent)
+        self.folder = Path(folder)
+        self.maxWorkers = maxWorkers
+        self.indexFile = Path(indexFile) if indexFile else None
+        self._index: Dict[str, IndexEntry] = {}
+        self._indexChanged = False
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._numOfPending = 0
+        self._fileDone.connect(self._onFileScanned)
+
+    def start(self):
+        """
+        Start scanning, templateScanned is emitted for every file as soon as it is scanned.
+        For files which are up-to-date in the index it is emitted before start returns.
+        """
+        if not self.folder.is_dir():
+            self.folder.mkdir()
+
+        files = findTemplateFiles(self.folder)
+        oldIndex = readTemplatesIndex(self.indexFile) if self.indexFile else {}
+        self._index = {}
+        self._indexChanged = len(oldIndex) != len(files)
+
+        filesToScan = []
+        for file in files:
+            key = file.relative_to(self.folder).as_posix()
+            entry = oldIndex.get(key)
+            if entry and (entry.get("mtime"), entry.get("size")) == fileStamp(file):
+                self._index[key] = entry
+                self.templateScanned.emit(Path(key), [tuple(i) for i in entry["submodels"]])
+            else:
+                filesToScan.append((file, entry))
+
+        if not filesToScan:
+            self._finish()
+            return
+
+        # spawn, so that the GUI process with its threads is not forked
+        self._executor = ProcessPoolExecutor(max_workers=self.maxWorkers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._numOfPending = len(filesToScan)
+        self._indexChanged = True
+        for file, entry in filesToScan:
+            future = self._executor.submit(indexTemplateFile, file, entry)
+            future.add_done_callback(lambda f, file=file: self._fileDone.emit(file, f))
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _onFileScanned(self, file: Path, future: Future):
+        try:
+            if not future.cancelled():
+                relativeFile = file.relative_to(self.folder)
+                entry = future.result()
+                self._index[relativeFile.as_posix()] = entry
+                self.templateScanned.emit(relativeFile, [tuple(i) for i in entry["submodels"]])
+        except Exception as e:
+            # If a file is with an error, that file will be skipped.
+            logging.exception(f"Error while reading {file}: {e}. Submodels can not be read")
+        finally:
+            self._numOfPending -= 1
+            if self._numOfPending == 0:
+                self.stop()
+                self._finish()
+
+    def _finish(self):
+        if self.indexFile and self._indexChanged:
+            try:
+                writeTemplatesIndex(self.indexFile, self._index)
+            except Exception as e:
+                logging.warning(f"Submodel templates index {self.indexFile} could not be written: {e}")
+        self.finished.emit()
+
+    def loadSubmodel(self, relativeFile: Path, submodelId: str) -> Submodel:
+        """:raise KeyError if no submodel with the id is in the file"""
+        objStore = readTemplateFile(self.folder.joinpath(relativeFile))
+        submodel = objStore.get_identifiable(submodelId)
+        if not isinstance(submodel, Submodel):
+            raise KeyError(f"No submodel found with id: {submodelId}")
+        return submodel
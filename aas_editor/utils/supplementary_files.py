@@ -0,0 +1,224 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import hashlib
+import io
+import os
+import shutil
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Dict, Iterator, Optional, Union
+
+from basyx.aas.adapter.aasx import DictSupplementaryFileContainer
+
+# bytes copied at once from the source file
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def openFile(fileStore: DictSupplementaryFileContainer, name: str) -> IO[bytes]:
+    """Return a binary file object for reading the file from the store, it must be closed by the caller"""
+    if isinstance(fileStore, LazySupplementaryFileContainer):
+        return fileStore.open(name)
+    return io.BytesIO(readFile(fileStore, name))
+
+
+def readFile(fileStore: DictSupplementaryFileContainer, name: str) -> bytes:
+    """Return content of the file. Content of files in memory is not copied"""
+    if isinstance(fileStore, LazySupplementaryFileContainer):
+        return fileStore.read(name)
+    buffer = io.BytesIO()
+    fileStore.write_file(name, buffer)
+    return buffer.getvalue()
+
+
+def _archiveStat(part: zipfile.ZipExtFile) -> Optional[os.stat_result]:
+    """Return stat of the zip file, the part was opened from, or None if it is not known"""
+    # ZipExtFile doesn't give its archive publicly, the shared file object of the archive is used
+    archive = getattr(getattr(part, "_fileobj", None), "_file", None)
+    if archive is None:
+        return None
+    try:
+        return os.fstat(archive.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    name = getattr(archive, "name", None)
+    return os.stat(name) if isinstance(name, (str, Path)) else None
+
+
+@dataclass
+class ZipPart:
+    """Location of a supplementary file in the source AASX file"""
+    zipInfo: zipfile.ZipInfo
+    contentType: str
+    sha256: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        return self.zipInfo.file_size
+
+
+class LazySupplementaryFileContainer(DictSupplementaryFileContainer):
+    """
+    Supplementary file container, which keeps only the location of files read from an AASX file.
+    The content is read from the AASX file when it is needed. Files added later are kept in memory.
+    """
+
+    def __init__(self, sourceFile: Union[str, Path, None] = None):
+        super(LazySupplementaryFileContainer, self).__init__()
+        self.sourceFile = Path(sourceFile) if sourceFile else None
+        self._zipParts: Dict[str, ZipPart] = {}
+        # members of the source file by name, read again if the source file changes
+        self._sourceInfos: Dict[str, zipfile.ZipInfo] = {}
+        self._sourceInfosKey = None
+
+    @contextmanager
+    def _openSource(self) -> Iterator[zipfile.ZipFile]:
+        # the source file is not kept open, so that it can be replaced when the package is saved
+        with zipfile.ZipFile(self.sourceFile) as zipFile:
+            yield zipFile
+
+    def _sourceZipInfos(self, sourceStat: os.stat_result) -> Dict[str, zipfile.ZipInfo]:
+        """Return members of the source file by name, the central directory is only read again if the file changes"""
+        key = (sourceStat.st_dev, sourceStat.st_ino, sourceStat.st_mtime_ns, sourceStat.st_size)
+        if self._sourceInfosKey != key:
+            with self._openSource() as zipFile:
+                self._sourceInfos = {info.filename: info for info in zipFile.infolist()}
+            self._sourceInfosKey = key
+        return self._sourceInfos
+
+    def _zipInfoOfPart(self, file: IO[bytes]) -> Optional[zipfile.ZipInfo]:
+        """Return ZipInfo if file is an opened member of the source file, members of other files are not lazy"""
+        if self.sourceFile is None or not isinstance(file, zipfile.ZipExtFile):
+            return None
+        try:
+            sourceStat = os.stat(self.sourceFile)
+            archiveStat = _archiveStat(file)
+            if archiveStat is None or not os.path.samestat(archiveStat, sourceStat):
+                return None
+            return self._sourceZipInfos(sourceStat).get(file.name)
+        except (OSError, zipfile.BadZipFile):
+            return None
+
+    def isLazy(self, name: str) -> bool:
+        return name in self._zipParts
+
+    def add_file(self, name: str, file: IO[bytes], content_type: str) -> str:
+        zipInfo = self._zipInfoOfPart(file)
+        newName = name
+        i = 1
+        while newName in self:
+            if zipInfo and newName in self._zipParts and self._zipParts[newName].zipInfo.filename == zipInfo.filename:
+                return newName
+            if zipInfo is None and newName not in self._zipParts:
+                # name conflicts of files in memory are handled by base class
+                break
+            newName = self._append_counter(name, i)
+            i += 1
+
+        if zipInfo is None:
+            return super(LazySupplementaryFileContainer, self).add_file(newName, file, content_type)
+        self._zipParts[newName] = ZipPart(zipInfo, content_type)
+        return newName
+
+    def open(self, name: str) -> IO[bytes]:
+        """Return a binary file object for reading the file, it must be closed by the caller"""
+        if name in self._zipParts:
+            zipFile = zipfile.ZipFile(self.sourceFile)
+            try:
+                part = zipFile.open(self._zipParts[name].zipInfo)
+            except Exception:
+                zipFile.close()
+                raise
+            # the member keeps the archive file open until it is closed
+            zipFile.close()
+            return part
+        return io.BytesIO(self.read(name))
+
+    def read(self, name: str) -> bytes:
+        """Return content of the file. Content of files in memory is returned without copying"""
+        if name in self._zipParts:
+            with self.open(name) as part:
+                return part.read()
+        return self._store[self._name_map[name][0]]
+
+    def get_content_type(self, name: str) -> str:
+        if name in self._zipParts:
+            return self._zipParts[name].contentType
+        return super(LazySupplementaryFileContainer, self).get_content_type(name)
+
+    def get_sha256(self, name: str) -> bytes:
+        if name in self._zipParts:
+            part = self._zipParts[name]
+            if part.sha256 is None:
+                sha = hashlib.sha256()
+                with self.open(name) as file:
+                    for chunk in iter(lambda: file.read(COPY_CHUNK_SIZE), b""):
+                        sha.update(chunk)
+                part.sha256 = sha.digest()
+            return part.sha256
+        return super(LazySupplementaryFileContainer, self).get_sha256(name)
+
+    def get_size(self, name: str) -> int:
+        if name in self._zipParts:
+            return self._zipParts[name].size
+        return len(self._store[self._name_map[name][0]])
+
+    def write_file(self, name: str, file: IO[bytes]) -> None:
+        if name in self._zipParts:
+            with self.open(name) as part:
+                shutil.copyfileobj(part, file, COPY_CHUNK_SIZE)
+        else:
+            super(LazySupplementaryFileContainer, self).write_file(name, file)
+
+    def delete_file(self, name: str) -> None:
+        if name in self._zipParts:
+            del self._zipParts[name]
+        else:
+            super(LazySupplementaryFileContainer, self).delete_file(name)
+
+    def rename_file(self, name: str, newName: str) -> str:
+        """Return the new name, a counter is added to it if a file with the name already exists"""
+        if name not in self._zipParts:
+            return super(LazySupplementaryFileContainer, self).rename_file(name, newName)
+        finalName = newName
+        i = 1
+        while finalName in self:
+            finalName = self._append_counter(newName, i)
+            i += 1
+        self._zipParts[finalName] = self._zipParts.pop(name)
+        return finalName
+
+    def loadFilesMissingIn(self, file: Union[str, Path]):
+        """Read the files, which are not stored in the given AASX file, into memory"""
+        with zipfile.ZipFile(file) as zipFile:
+            names = set(zipFile.namelist())
+        for name in [name for name in self._zipParts if name[1:] not in names]:
+            with self.open(name) as part:
+                contentType = self._zipParts.pop(name).contentType
+                super(LazySupplementaryFileContainer, self).add_file(name, part, contentType)
+
+    def setSourceFile(self, file: Union[str, Path]):
+        """
+        Read the locations of the files from a new source file, e.g. after the package was saved.
+        All files must be stored in the new file, see loadFilesMissingIn.
+        """
+        self.sourceFile = Path(file)
+        zipInfos = self._sourceZipInfos(os.stat(self.sourceFile))
+        for name, part in self._zipParts.items():
+            part.zipInfo = zipInfos[name[1:]]
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._zipParts or super(LazySupplementaryFileContainer, self).__contains__(item)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._zipParts
+        yield from super(LazySupplementaryFileContainer, self).__iter__()
@@ -16,12 +16,13 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
+import functools
 import inspect
 import re
 import typing
 from abc import ABCMeta
 from enum import Enum
-from typing import List, Dict, Type, Set, Any, Tuple, Iterable
+from typing import List, Dict, Type, Set, Any, Tuple, Iterable, Callable
 
 from PyQt6.QtCore import Qt, QFile, QTextStream, QModelIndex, QIODevice
 from PyQt6.QtWidgets import QApplication
@@ -34,6 +35,71 @@ import aas_editor.utils.util_classes as util_classes
 import aas_editor.utils.util_type as util_type
 import logging
 
+# cache for reflection helpers: type -> {(func name, args): result}
+_TYPE_METADATA: Dict[Any, Dict[tuple, Any]] = {}
+
+
+class _CachedError:
+    """Error raised by a reflection helper, it is raised again on every cache hit"""
+    def __init__(self, error: Exception):
+        self.errorType = type(error)
+        self.args = error.args
+
+    def raiseError(self):
+        raise self.errorType(*self.args)
+
+
+def _copyMetadata(metadata):
+    """Return a copy of cached mutable results, so that callers can change them"""
+    if isinstance(metadata, (dict, list)):
+        return metadata.copy()
+    if isinstance(metadata, tuple) and not hasattr(metadata, "_fields"):
+        return tuple(_copyMetadata(i) for i in metadata)
+    return metadata
+
+
+def getTypeMetadata(objType, key: tuple, func: Callable[[], Any]):
+    """
+    Return cached metadata of the type
+
+    :param objType: type the metadata belongs to
+    :param key: hashable key of the metadata, e.g. (func name, attr)
+    :param func: function calculating the metadata if it is not cached yet
+    """
+    try:
+        typeMetadata = _TYPE_METADATA.setdefault(objType, {})
+        metadata = typeMetadata[key]
+    except TypeError:
+        # unhashable type or key
+        return func()
+    except KeyError:
+        try:
+            metadata = func()
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            metadata = _CachedError(e)
+        typeMetadata[key] = metadata
+
+    if isinstance(metadata, _CachedError):
+        metadata.raiseError()
+    return _copyMetadata(metadata)
+
+
+def invalidateTypeMetadata(objType=None):
+    """Remove cached metadata of the type or of all types if objType is None"""
+    if objType is None:
+        _TYPE_METADATA.clear()
+    else:
+        _TYPE_METADATA.pop(objType, None)
+
+
+def cachedTypeMetadata(func):
+    """Decorator caching results of func per type, first arg of func must be the type"""
+    @functools.wraps(func)
+    def wrapper(objType, *args, **kwargs):
+        key = (func.__name__, args, tuple(kwargs.items()))
+        return getTypeMetadata(objType, key, lambda: func(objType, *args, **kwargs))
+    return wrapper
+
 
 def nameIsSpecial(method_name):
     """Returns true if the method name starts with underscore"""
@@ -58,6 +124,15 @@ def attrOrder(attr):
 
 
 def getAttrs4detailInfo(obj, exclSpecial: bool = True, exclCallable: bool = True) -> List[str]:
+    if isinstance(obj, type):
+        return _getAttrs4detailInfo(obj, exclSpecial, exclCallable)
+    # attrs depend on the type and on the attrs set in the instance
+    instanceAttrs = tuple(getattr(obj, "__dict__", ()))
+    key = ("getAttrs4detailInfo", instanceAttrs, exclSpecial, exclCallable)
+    return getTypeMetadata(type(obj), key, lambda: _getAttrs4detailInfo(obj, exclSpecial, exclCallable))
+
+
+def _getAttrs4detailInfo(obj, exclSpecial: bool = True, exclCallable: bool = True) -> List[str]:
     attrs = getAttrs(obj, exclSpecial, exclCallable)
     for attr in util_classes.ClassesInfo.hiddenAttrs(type(obj)):
         try:
@@ -110,30 +185,86 @@ def removeHiddenAttrs(attrs: List[str], cls) -> List[str]:
     return attrs
 
 
-def simplifyInfo(obj, attrName: str = "") -> str:
-    res = str(obj)
+def simplifyInfo(obj, attrName: str = "", maxSigns: int = settings.MAX_SIGNS_TO_SHOW) -> str:
+    """
+    Return short info of the object for showing in views.
+    Strings, bytes and containers are formatted only up to about maxSigns signs, a longer result
+    is cut by getLimitStr anyway, so e.g. a big Blob value does not have to be converted to str.
+    """
     try:
         if isinstance(obj, settings.ATTR_INFOS_TO_SIMPLIFY):
-            res = re.sub("^[A-Z]\w*[(]", "", res)
+            res = re.sub("^[A-Z]\w*[(]", "", str(obj))
             res = res.rstrip(")")
         elif issubclass(type(obj), Reference):
             lastKey = obj.key[-1]
             res = f"{lastKey.value} - {lastKey.type.name}"
         elif issubclass(type(obj), NamespaceSet):
-            res = f"{{{str([i for i in obj]).strip('[]')}}}"
+            res = _joinLimited(obj, "{", "}", maxSigns)
         elif inspect.isclass(obj):
             res = util_type.getTypeName(obj)
         elif isinstance(obj, Enum):
             res = obj.name
         elif isinstance(obj, dict) and attrName == "description":
             res = getDescription(obj)
-        elif res.startswith("<") and res.endswith(">"):  # if no repr for obj
-            return ""
+        elif isinstance(obj, str):
+            res = str(obj[:maxSigns + 1])
+        else:
+            res = limitedRepr(obj, maxSigns) if type(obj) in _LIMITED_REPR_TYPES else str(obj)
+            if res.startswith("<") and res.endswith(">"):  # if no repr for obj
+                return ""
     except Exception:
         return str(obj)
     return res
 
 
+def limitedRepr(obj, maxSigns: int = settings.MAX_SIGNS_TO_SHOW) -> str:
+    """
+    Return repr of the object, strings, bytes and builtin containers are formatted only until
+    the result is longer than maxSigns, the result then starts like the full repr
+    """
+    objType = type(obj)
+    if objType in (str, bytes, bytearray):
+        return repr(obj[:maxSigns + 1]) if len(obj) > maxSigns else repr(obj)
+    if not obj or objType not in _LIMITED_REPR_TYPES:
+        return repr(obj)
+    if objType is list:
+        return _joinLimited(obj, "[", "]", maxSigns)
+    if objType is tuple:
+        return _joinLimited(obj, "(", ",)" if len(obj) == 1 else ")", maxSigns)
+    if objType is set:
+        return _joinLimited(obj, "{", "}", maxSigns)
+    if objType is frozenset:
+        return _joinLimited(obj, "frozenset({", "})", maxSigns)
+    return _joinLimited(obj.items(), "{", "}", maxSigns, _limitedDictItemRepr)
+
+
+_LIMITED_REPR_TYPES = (str, bytes, bytearray, list, tuple, set, frozenset, dict)
+
+
+def _limitedDictItemRepr(item: Tuple[Any, Any], maxSigns: int) -> str:
+    key = limitedRepr(item[0], maxSigns)
+    if len(key) > maxSigns:
+        return key
+    return f"{key}: {limitedRepr(item[1], maxSigns - len(key) - 2)}"
+
+
+def _joinLimited(items: Iterable, start: str, end: str, maxSigns: int, itemRepr=limitedRepr) -> str:
+    """Return start + ", ".join(reprs of items) + end, items are added only until the result is longer than maxSigns"""
+    parts = [start]
+    length = len(start)
+    for item in items:
+        if length > maxSigns:
+            return "".join(parts)
+        if len(parts) > 1:
+            parts.append(", ")
+            length += 2
+        part = itemRepr(item, max(maxSigns - length, 0))
+        parts.append(part)
+        length += len(part)
+    parts.append(end)
+    return "".join(parts)
+
+
 def getLimitStr(obj, max_sgns=settings.MAX_SIGNS_TO_SHOW) -> str:
     try:
         if len(obj) > max_sgns:
@@ -169,6 +300,7 @@ def getDefaultVal(objType: Type, param: str, default=settings.NOT_GIVEN):
             return default
 
 
+@cachedTypeMetadata
 def getParams4init(objType: Type) -> List[str]:
     """Return params for init"""
     objType = resolveBaseType(objType)
@@ -179,6 +311,7 @@ def getParams4init(objType: Type) -> List[str]:
     return list(paramsAndTypehints.keys())
 
 
+@cachedTypeMetadata
 def getParamsAndTypehints4init(objType: Type, withDefaults=True) -> tuple[dict[str, Any], dict[str, Any]] | dict[
     str, Any]:
     """Return params for init with their type and default values"""
@@ -257,6 +390,7 @@ def _getDefaultValuesOfParams(params: Iterable[str], defaults: Tuple[Any]) -> Di
     return paramsDefaults
 
 
+@cachedTypeMetadata
 def getReqParams4init(objType: Type, rmDefParams=True,
                       attrsToHide=None, delOptional=True) -> Dict[str, Type]:
     """Return required params for init with their type"""
@@ -318,20 +452,26 @@ def getAttrDoc(attr: str, parentObj: type = None, doc: str = None) -> str:
         doc = getDoc(parentObj)
 
     if doc:
-        doc = " ".join(doc.split())
-        pattern = fr":ivar [~]?[.]?{attr}_?:(.*?)(:ivar|:raises|TODO|$)"
-        res = re.search(pattern, doc)
-        if res:
-            reg = res.regs[1]
-            doc = doc[reg[0]: reg[1]]
-            doc = re.sub("([(]inherited from.*[)])?", "", doc)
-            doc = re.sub("[~]([a-zA-Z]+\.)+", "", doc)
-            doc = re.sub("(:class:)?", "", doc)
-            doc = re.sub("(<.*>)?", "", doc)
-            doc = re.sub("`", "", doc)
-            doc = re.sub("[~]\.", "", doc)
-            doc = f"{attr}: {doc}"
-            return doc
+        return _getAttrDocFromDoc(attr, doc)
+    return ""
+
+
+@functools.lru_cache(maxsize=4096)
+def _getAttrDocFromDoc(attr: str, doc: str) -> str:
+    doc = " ".join(doc.split())
+    pattern = fr":ivar [~]?[.]?{attr}_?:(.*?)(:ivar|:raises|TODO|$)"
+    res = re.search(pattern, doc)
+    if res:
+        reg = res.regs[1]
+        doc = doc[reg[0]: reg[1]]
+        doc = re.sub("([(]inherited from.*[)])?", "", doc)
+        doc = re.sub("[~]([a-zA-Z]+\.)+", "", doc)
+        doc = re.sub("(:class:)?", "", doc)
+        doc = re.sub("(<.*>)?", "", doc)
+        doc = re.sub("`", "", doc)
+        doc = re.sub("[~]\.", "", doc)
+        doc = f"{attr}: {doc}"
+        return doc
     return ""
 
 
@@ -404,6 +544,7 @@ def isSimpleIterable(obj) -> bool:
     return isSimpleIterableType(type(obj))
 
 
+@cachedTypeMetadata
 def getAttrTypeHint(objType, attr: str, delOptional: bool = True):
     params = getReqParams4init(objType, rmDefParams=False, delOptional=delOptional)
 
@@ -444,12 +585,10 @@ def getIterItemTypeHint(iterableTypehint):
     args = util_type.getArgs(iterableTypehint)
 
     if util_type.issubtype(iterableTypehint, LangStringSet):
-        aas_editor.additional.classes.DictItem.__annotations__["key"] = str
-        aas_editor.additional.classes.DictItem.__annotations__["value"] = str
+        _setDictItemTypehints(str, str)
         attrType = aas_editor.additional.classes.DictItem
     elif util_type.issubtype(iterableTypehint, dict):
-        aas_editor.additional.classes.DictItem.__annotations__["key"] = iterableTypehint.__args__[0]
-        aas_editor.additional.classes.DictItem.__annotations__["value"] = iterableTypehint.__args__[1]
+        _setDictItemTypehints(iterableTypehint.__args__[0], iterableTypehint.__args__[1])
         attrType = aas_editor.additional.classes.DictItem
     elif args:
         if len(args) > 1:
@@ -464,6 +603,16 @@ def getIterItemTypeHint(iterableTypehint):
     return attrType
 
 
+def _setDictItemTypehints(keyTypehint, valueTypehint):
+    annotations = aas_editor.additional.classes.DictItem.__annotations__
+    if annotations["key"] == keyTypehint and annotations["value"] == valueTypehint:
+        return
+    annotations["key"] = keyTypehint
+    annotations["value"] = valueTypehint
+    # cached init params of DictItem are not valid anymore
+    invalidateTypeMetadata(aas_editor.additional.classes.DictItem)
+
+
 def isValOk4Typehint(val, typehint) -> bool:
     if util_type.isoftype(val, typehint):
         return True
@@ -8,7 +8,8 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
-from typing import Type, Tuple, Optional, List, Dict
+import copy
+from typing import Type, Tuple, Optional, List, Dict, Any
 
 from aas_editor.settings.util_constants import *
 from aas_editor.settings import aas_settings as s
@@ -104,23 +105,36 @@ class PreObject:
         return kwargs
 
 class ClassesInfo:
+    # infos of CLASSES_INFO united for a class and its parents, they are resolved lazily
+    _allInfos: Dict[Type, Dict] = {}
+    _specificInfos: Dict[Tuple[Type, str], Any] = {}
+
+    @staticmethod
+    def rebuild():
+        """Drop resolved infos. Must be called if CLASSES_INFO is changed at runtime"""
+        ClassesInfo._allInfos.clear()
+        ClassesInfo._specificInfos.clear()
+        # reflection results of utils depend on the classes infos, e.g. hidden attrs
+        import aas_editor.utils.util as util
+        util.invalidateTypeMetadata()
+
     @staticmethod
     def hasPackViewAttrs(cls) -> bool:
-        hasAttrs = ClassesInfo.findSpecificInfoForClass(cls, PACKVIEW_ATTRS_INFO)
+        hasAttrs = ClassesInfo._cachedSpecificInfo(cls, PACKVIEW_ATTRS_INFO)
         if hasAttrs is not None:
             return True
         return False
 
     @staticmethod
     def isForbiddenToEditInGui(cls) -> bool:
-        allowed = ClassesInfo.findSpecificInfoForClass(cls, IS_EDITABLE_IN_GUI)
+        allowed = ClassesInfo._cachedSpecificInfo(cls, IS_EDITABLE_IN_GUI)
         if allowed is not None:
             return not allowed
         return False
 
     @staticmethod
     def packViewAttrs(cls) -> List[str]:
-        attrs = ClassesInfo.findSpecificInfoForClass(cls, PACKVIEW_ATTRS_INFO)
+        attrs = ClassesInfo._cachedSpecificInfo(cls, PACKVIEW_ATTRS_INFO)
         return list(attrs) if attrs else list()
 
     @staticmethod
@@ -132,6 +146,18 @@ class ClassesInfo:
 
     @staticmethod
     def findAllInfoForClass(cls) -> Dict:
+        try:
+            info = ClassesInfo._allInfos[cls]
+        except KeyError:
+            info = ClassesInfo._allInfos[cls] = ClassesInfo._uniteAllInfosForClass(cls)
+        except TypeError:
+            # unhashable cls, e.g. typehint
+            return ClassesInfo._uniteAllInfosForClass(cls)
+        # infos can contain dicts and sets, the cached ones must not be changed by the caller
+        return copy.deepcopy(info)
+
+    @staticmethod
+    def _uniteAllInfosForClass(cls) -> Dict:
         cls_and_parents = ClassesInfo.getClsAndItsParents(cls)
         info = dict()
         # iterate over all classes and their parents to get all infos.
@@ -146,13 +172,33 @@ class ClassesInfo:
                         elif isinstance(info[key], tuple):
                             info[key] = tuple(set(info[key] + newinfo[key]))
                     else:
-                        info[key] = newinfo[key]
+                        # copy, so that infos of parents in CLASSES_INFO are not changed by update
+                        info[key] = copy.copy(newinfo[key])
             except KeyError:
                 pass
         return info
 
     @staticmethod
     def findSpecificInfoForClass(cls, infoType):
+        info = ClassesInfo._cachedSpecificInfo(cls, infoType)
+        # infos can contain dicts and sets, the cached ones must not be changed by the caller
+        return copy.deepcopy(info) if isinstance(info, (set, dict, list)) else info
+
+    @staticmethod
+    def _cachedSpecificInfo(cls, infoType):
+        """Return the cached info without copying it, it must not be changed"""
+        try:
+            info = ClassesInfo._specificInfos[(cls, infoType)]
+        except KeyError:
+            info = ClassesInfo._specificInfos[(cls, infoType)] = \
+                ClassesInfo._uniteSpecificInfosForClass(cls, infoType)
+        except TypeError:
+            # unhashable cls, e.g. typehint
+            return ClassesInfo._uniteSpecificInfosForClass(cls, infoType)
+        return info
+
+    @staticmethod
+    def _uniteSpecificInfosForClass(cls, infoType):
         cls_and_parents = ClassesInfo.getClsAndItsParents(cls)
         infos = []
         for cls in reversed(cls_and_parents):
@@ -196,13 +242,13 @@ class ClassesInfo:
 
     @staticmethod
     def hiddenAttrs(cls) -> Tuple[str]:
-        val = ClassesInfo.findSpecificInfoForClass(cls, HIDDEN_ATTRS)
-        return val if val else tuple()
+        val = ClassesInfo._cachedSpecificInfo(cls, HIDDEN_ATTRS)
+        return tuple(val) if val else tuple()
 
     @staticmethod
     def iterAttrs(cls) -> Tuple[str]:
-        val = ClassesInfo.findSpecificInfoForClass(cls, ITERABLE_ATTRS)
-        return val if val else tuple()
+        val = ClassesInfo._cachedSpecificInfo(cls, ITERABLE_ATTRS)
+        return tuple(val) if val else tuple()
 
     @staticmethod
     def defaultParamsToHide(cls) -> Dict[str, str]:
@@ -22,7 +22,7 @@ import typing
 from abc import ABCMeta
 from collections import abc
 from enum import Enum
-from typing import Union, Tuple, Iterable
+from typing import Union, Tuple, Iterable, Any, Callable, Dict, Optional
 
 from basyx.aas.model import ModelReference
 from basyx.aas import model
@@ -43,6 +43,26 @@ TYPE_NAMES_DICT = {
     model.datatypes.Time: "Time",
 }
 
+# typehint -> predicate checking if an object fits the typehint, see compileTypeCheck
+_TYPE_CHECKS: Dict[Any, Callable[[Any], bool]] = {}
+# results of typing introspection by typehint, typehints and types do not change at runtime
+_IS_TYPEHINT: Dict[Any, bool] = {}
+_TYPE_NAMES: Dict[Any, str] = {}
+_TYPE_HINT_NAMES: Dict[Any, str] = {}
+_SUBTYPES: Dict[tuple, bool] = {}
+
+
+def _cached(cache: dict, key, func: Callable[[], Any]):
+    """Return cached result of func, errors are not cached"""
+    try:
+        return cache[key]
+    except KeyError:
+        result = cache[key] = func()
+        return result
+    except TypeError:
+        # unhashable key
+        return func()
+
 
 def getOrigin(obj) -> typing.Type:
     """Return the origin type if obj is a generic alias, else return obj.
@@ -60,13 +80,21 @@ def getArgs(obj) -> typing.Tuple[typing.Type]:
 
 
 def isTypehint(obj) -> bool:
-    obj = getOrigin(obj)
+    if isinstance(obj, type):
+        return True
     try:
-        if obj in TYPING_TYPES or type(obj) is typing.TypeVar:
-            return True
-    except TypeError as e:
-        logging.exception(e)
-    return inspect.isclass(obj)
+        return _IS_TYPEHINT[obj]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable objects are neither types nor typehints
+        return False
+    origin = getOrigin(obj)
+    result = origin in TYPING_TYPES or type(origin) is typing.TypeVar or inspect.isclass(origin)
+    if result:
+        # other objects are not cached, they would be kept alive by the cache
+        _IS_TYPEHINT[obj] = result
+    return result
 
 
 def isUnion(typeHint):
@@ -94,37 +122,70 @@ def removeOptional(typehint):
 
 
 def checkType(obj, typeHint):
-    if typeHint is None:
-        return True
+    return compileTypeCheck(typeHint)(obj)
 
-    origin = getOrigin(typeHint)
-    args = getArgs(typeHint)
-    objType = type(obj)
 
-    if objType == typeHint:
-        return True
+def compileTypeCheck(typeHint) -> Callable[[Any], bool]:
+    """
+    Return predicate checking if an object fits the typehint.
+    The typehint is analysed once, results are cached per object type,
+    for ModelReferences per type of the referenced object.
+    """
+    return _cached(_TYPE_CHECKS, typeHint, lambda: _compileTypeCheck(typeHint))
+
+
+def _compileTypeCheck(typeHint) -> Callable[[Any], bool]:
+    if typeHint is None:
+        return lambda obj: True
 
     if type(typeHint) is typing.ForwardRef:
         typeHintName = typeHint.__forward_arg__
-        return getTypeName(type(obj)) == typeHintName
+        return _checkByType(lambda objType: getTypeName(objType) == typeHintName)
 
     if isUnion(typeHint):
-        for typHint in args:
-            if checkType(obj, typHint):
-                return True
-        else:
-            return False
+        checks = [compileTypeCheck(typHint) for typHint in getArgs(typeHint)]
+        return lambda obj: any(check(obj) for check in checks)
 
-    if isinstance(obj, ModelReference):
-        return checkTypeModelRef(obj, typeHint)
+    origin = getOrigin(typeHint)
 
-    if isIterableType(origin) and objType is origin:
-        return True
+    def checkObjType(objType) -> Optional[bool]:
+        if objType == typeHint:
+            return True
+        if isIterableType(origin) and objType is origin:
+            return True
+        if origin is abc.Iterable:
+            return isIterableType(objType)
+        # checked with isinstance, which is fast for classes
+        return None
 
-    if origin is abc.Iterable:
-        return isIterableType(objType)
+    checkNotRef = _checkByType(checkObjType)
+    refResults: Dict[tuple, bool] = {}
+
+    def check(obj) -> bool:
+        if not isinstance(obj, ModelReference):
+            result = checkNotRef(obj)
+            return isinstance(obj, origin) if result is None else result
+        key = (type(obj), obj.type)
+        try:
+            return refResults[key]
+        except KeyError:
+            result = refResults[key] = type(obj) == typeHint or checkTypeModelRef(obj, typeHint)
+            return result
+    return check
 
-    return isinstance(obj, origin)
+
+def _checkByType(checkObjType: Callable[[type], Optional[bool]]) -> Callable[[Any], Optional[bool]]:
+    """Return predicate calling checkObjType once per object type"""
+    results: Dict[type, Optional[bool]] = {}
+
+    def check(obj) -> Optional[bool]:
+        objType = type(obj)
+        try:
+            return results[objType]
+        except KeyError:
+            result = results[objType] = checkObjType(objType)
+            return result
+    return check
 
 
 def checkTypeModelRef(aasref, typehint):
@@ -152,6 +213,10 @@ def checkTypeModelRef(aasref, typehint):
 
 
 def getTypeName(objType) -> str:
+    return _cached(_TYPE_NAMES, objType, lambda: _getTypeName(objType))
+
+
+def _getTypeName(objType) -> str:
     if not isTypehint(objType) and not isoftype(objType, Enum):
         raise TypeError("Arg 1 must be type or typehint:", objType)
 
@@ -178,6 +243,10 @@ def getTypeName(objType) -> str:
 
 
 def getTypeHintName(typehint) -> str:
+    return _cached(_TYPE_HINT_NAMES, typehint, lambda: _getTypeHintName(typehint))
+
+
+def _getTypeHintName(typehint) -> str:
     if not isTypehint(typehint):
         raise TypeError("Arg 1 must be type or typehint:", typehint)
 
@@ -209,6 +278,10 @@ def issubtype(typ, types: Union[type, Tuple[Union[type, tuple], ...]]) -> bool:
     :param types: class or type annotation or tuple of classes or type annotations
     :raise TypeError if arg 1 or arg2 are not types or typehints:"
     """
+    return _cached(_SUBTYPES, (typ, types), lambda: _issubtypeOfAny(typ, types))
+
+
+def _issubtypeOfAny(typ, types) -> bool:
     if not isTypehint(typ):
         raise TypeError("Arg 1 must be type or typehint:", typ)
 
@@ -267,28 +340,18 @@ def _issubtype(typ1, typ2: type) -> bool:
 
 
 def isoftype(obj, types: Union[type, Tuple[Union[type, tuple], ...]]) -> bool:
-    try:
+    if isinstance(types, (tuple, list)):
         for tp in types:
             if not isTypehint(tp):
                 raise TypeError("Arg 2 must be type, typehint or tuple of types/typehints:", types)
-    except TypeError:
-        if not isTypehint(types):
-            raise TypeError("Arg 2 must be type, typehint or tuple of types/typehints:", types)
-
-    try:
-        if issubclass(types, Enum):
-            return _isoftype(obj, types)
-    except TypeError as e:
-        logging.exception(e)
-
-    try:
         for tp in types:
             if _isoftype(obj, tp):
                 return True
         return False
-    except TypeError as e:
-        logging.exception(e)
-        return _isoftype(obj, types)
+
+    if not isTypehint(types):
+        raise TypeError("Arg 2 must be type, typehint or tuple of types/typehints:", types)
+    return _isoftype(obj, types)
 
 
 def _isoftype(obj, typ) -> bool:
@@ -24,6 +24,7 @@ from PyQt6.QtWidgets import QLineEdit, QComboBox, QWidget, QCompleter, QHBoxLayo
 from basyx.aas.model.datatypes import Date
 
 from aas_editor.additional.classes import DictItem
+from aas_editor.utils.completions import completionService
 from aas_editor.utils.util import inheritors
 from aas_editor.utils.util_classes import PreObject
 from aas_editor.utils.util_type import isoftype, issubtype, getTypeName, getArgs
@@ -372,8 +373,7 @@ class StandardInputWidget(QWidget):
         elif issubtype(self.objType, str):
             widget = LineEdit(self)
             if kwargs.get("completions"):
-                completer = QCompleter(kwargs["completions"], self)
-                completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+                completer = completionService().newCompleter(kwargs["completions"], self)
                 widget.setCompleter(completer)
         elif issubtype(self.objType, int):
             widget = LineEdit(self)
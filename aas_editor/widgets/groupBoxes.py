@@ -20,7 +20,8 @@ import aas_editor.widgets as widgets
 import aas_editor.widgets.buttons
 from aas_editor.additional.classes import DictItem
 from aas_editor.widgets.widgetUtil import InputWidgetUtil
-from aas_editor.settings import DEFAULT_COMPLETIONS, DEFAULTS, OBJECT_ROLE
+from aas_editor.settings import DEFAULTS, OBJECT_ROLE
+from aas_editor.utils.completions import completionService
 from aas_editor.utils.util import getReqParams4init, getParamsAndTypehints4init, getDefaultVal, delAASParent, inheritors
 
 from aas_editor.utils.util_classes import ClassesInfo, PreObject
@@ -104,7 +105,7 @@ class ObjGroupBox(GroupBox):
     def initLayout(self):
         if self.reqParamsDict:
             for param in self.reqParamsDict:
-                self.kwargs["completions"] = DEFAULT_COMPLETIONS.get(self.objTypeHint, {}).get(param, [])
+                self.kwargs["completions"] = completionService().completionModel(self.objTypeHint, param)
                 val = self.getVal4param(param)
                 widget = self.getInitialInputWidget(param, val, **self.kwargs)
                 self.insertInputWidget(widget, param)
@@ -99,9 +99,10 @@ class SearchBar(ToolBar):
                                             matchCase=self.caseBtn.isChecked())
         if self.foundItems:
             self.view.setCurrentIndex(QModelIndex(self.foundItems[0]))
+            brush = QBrush(HIGHLIGHT_YELLOW)
             for item in self.foundItems:
-                self.view.itemDelegate().setBgColor(QModelIndex(item), QBrush(HIGHLIGHT_YELLOW))
-        self.model.dataChanged.emit(QModelIndex(), QModelIndex())
+                self.view.itemDelegate().setBgColor(QModelIndex(item), brush)
+        self.view.viewport().update()
 
     def next(self):
         items = [QModelIndex(i) for i in self.foundItems]
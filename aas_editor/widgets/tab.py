@@ -16,6 +16,7 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 import logging
+import shutil
 from typing import List
 
 from PyQt6.QtWebEngineCore import QWebEngineSettings, QWebEngineProfile
@@ -34,7 +35,8 @@ from aas_editor.settings.shortcuts import SC_BACK, SC_FORWARD, SC_SEARCH
 from aas_editor.utils.util_type import getTypeName
 from aas_editor.widgets import SearchBar, ToolBar
 from aas_editor.utils.util import getTreeItemPath
-from aas_editor.models import StandardTable
+from aas_editor.utils.media_scheme import mediaSchemeHandler
+from aas_editor.models import StandardTable, MediaSource
 from aas_editor.widgets import LineEdit
 
 COMPLETION_ROLE = Qt.ItemDataRole.DisplayRole
@@ -315,6 +317,8 @@ class TabWithTreeView(QWidget):
         globalSettings = QWebEngineProfile.defaultProfile().settings()
         globalSettings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, True)
         self.mediaWidget = QWebEngineView()
+        # url under which the media of the current item is streamed
+        self.mediaUrl = QUrl()
         self.saveMediaAsBtn = QPushButton(f"Save media as..", self,
                                           toolTip="Save media file as..",
                                           clicked=lambda: self.saveMediaAsWithDialog(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DocumentsLocation)))
@@ -446,6 +450,7 @@ class TabWithTreeView(QWidget):
             self.attrsTreeView.header().restoreState(state)
 
     def updateMediaWidget(self):
+        self.releaseMediaSource()
         if self.packItem.data(IS_MEDIA_ROLE):
             self.mediaWidget.setContent(b"loading...")
             self.mediaViewWidget.show()
@@ -456,10 +461,16 @@ class TabWithTreeView(QWidget):
                 self.splitter.setSizes(newSizes)
 
             try:
-                mediaContent: "MediaContent" = self.packItem.data(MEDIA_CONTENT_ROLE)
+                mediaSource: "MediaSource" = self.packItem.data(MEDIA_SOURCE_ROLE)
                 if self.packItem.data(IS_URL_MEDIA_ROLE):
+                    mediaContent: "MediaContent" = self.packItem.data(MEDIA_CONTENT_ROLE)
                     self.mediaWidget.load(QUrl(mediaContent.value))
+                elif mediaSource is not None:
+                    # media is streamed from the package, so large files are not copied into memory
+                    self.mediaUrl = mediaSchemeHandler().addSource(mediaSource)
+                    self.mediaWidget.load(self.mediaUrl)
                 else:
+                    mediaContent: "MediaContent" = self.packItem.data(MEDIA_CONTENT_ROLE)
                     self.mediaWidget.setContent(mediaContent.value, mediaContent.content_type)
             except Exception as e:
                 logging.exception(e)
@@ -468,8 +479,15 @@ class TabWithTreeView(QWidget):
         else:
             self.mediaViewWidget.hide()
 
+    def releaseMediaSource(self):
+        if not self.mediaUrl.isEmpty():
+            mediaSchemeHandler().removeSource(self.mediaUrl)
+            self.mediaUrl = QUrl()
+
     def saveMediaAsWithDialog(self, directory="") -> bool:
-        mediaContent = self.packItem.data(MEDIA_CONTENT_ROLE)
+        mediaContent = self.packItem.data(MEDIA_SOURCE_ROLE)
+        if mediaContent is None:
+            mediaContent = self.packItem.data(MEDIA_CONTENT_ROLE)
         file = self.packItem.data(NAME_ROLE)
         saved = False
         while not saved:
@@ -488,9 +506,13 @@ class TabWithTreeView(QWidget):
     def saveMedia(self, media = None, file: str = None) -> bool:
         try:
             with open(file, "wb") as f:
-                f.write(media.value)
+                if isinstance(media, MediaSource):
+                    with media.open() as source:
+                        shutil.copyfileobj(source, f)
+                else:
+                    f.write(media.value)
             return True
-        except (TypeError, ValueError) as e:
+        except (TypeError, ValueError, OSError) as e:
             QMessageBox.critical(self, "Error", f"Media couldn't be saved: {file}: {e}")
         except AttributeError as e:
             QMessageBox.critical(self, "Error", f"No chosen media to save: {e}")
@@ -649,6 +671,8 @@ class TabWidget(QTabWidget):
             return
         widget = self.widget(index)
         if widget is not None:
+            if isinstance(widget, TabWithTreeView):
+                widget.releaseMediaSource()
             widget.deleteLater()
         super(TabWidget, self).removeTab(index)
         if not self.unclosable and not self.count():
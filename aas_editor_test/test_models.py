@@ -0,0 +1,511 @@
+from pathlib import Path
+from typing import List
+
+from PyQt6.QtCore import QModelIndex
+
+from aas_editor.package import Package
+
+
+def _packsTable(lazy: bool):
+    from aas_editor.models import PacksTable, PackTreeViewItem
+    from aas_editor.settings import DEFAULT_COLUMNS_IN_PACKS_TABLE
+    return PacksTable(DEFAULT_COLUMNS_IN_PACKS_TABLE, PackTreeViewItem(None, None, lazy=lazy))
+
+
+def _names(model, parent: QModelIndex):
+    from aas_editor.settings import NAME_ROLE
+    return [model.index(row, 0, parent).data(NAME_ROLE) for row in range(model.rowCount(parent))]
+
+
+def _elementByPath(package: Package, *idShorts: str):
+    obj = next(iter(package.submodels))
+    for idShort in idShorts:
+        obj = next(element for element in getattr(obj, "submodel_element", None) or obj.value
+                   if element.id_short == idShort)
+    return obj
+
+
+def _createdItems(model) -> list:
+    items = list(model.objByIndex(QModelIndex()).childItems())
+    for item in items:
+        items.extend(item.childItems())
+    return items
+
+
+def _collectionTable(numOfChildren: int):
+    from aas_editor.models import StandardTable, StandardItem
+    values = list(range(numOfChildren))
+    root = StandardItem(None)
+    collection = StandardItem(values, name="values", parent=root, typehint=List[int])
+    for value in values:
+        StandardItem(value, name=f"Integer {value}", parent=collection, typehint=int)
+    return StandardTable(("Name", "Value"), root)
+
+
+class _NotScannableList(list):
+    def _scan(self, *args):
+        raise AssertionError("list of children is scanned")
+
+    __iter__ = __contains__ = index = count = _scan
+
+
+# ---------------------------------------------------------------------------
+# Lazy population
+# ---------------------------------------------------------------------------
+
+class TestLazyPopulation:
+    def test_children_created_on_fetch(self, qapp: object, json_file: Path) -> None:
+        from aas_editor.settings import ADD_ITEM_ROLE
+        model = _packsTable(lazy=True)
+        model.setData(QModelIndex(), Package(json_file), ADD_ITEM_ROLE)
+        packIndex = model.index(0, 0)
+
+        assert model.rowCount(packIndex) == 0
+        assert model.hasChildren(packIndex)
+        assert model.canFetchMore(packIndex)
+
+        rowCounts = []
+        model.rowsAboutToBeInserted.connect(lambda parent, first, last: rowCounts.append(model.rowCount(parent)))
+        model.rowsInserted.connect(lambda parent, first, last: rowCounts.append(model.rowCount(parent)))
+        model.fetchMore(packIndex)
+        assert not model.canFetchMore(packIndex)
+        assert model.rowCount(packIndex) == 4
+        # rows must not exist before their insertion is announced
+        assert rowCounts == [0, 4]
+
+    def test_lazy_tree_equals_eager_tree(self, qapp: object, json_file: Path) -> None:
+        from aas_editor.settings import ADD_ITEM_ROLE, NAME_ROLE
+        lazyModel = _packsTable(lazy=True)
+        eagerModel = _packsTable(lazy=False)
+        package = Package(json_file)
+        lazyModel.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        eagerModel.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+
+        lazyNames = [index.data(NAME_ROLE) for index in lazyModel.iterItems()]
+        eagerNames = [index.data(NAME_ROLE) for index in eagerModel.iterItems()]
+        assert lazyNames == eagerNames
+
+    def test_empty_collection_has_no_children(self, qapp: object) -> None:
+        from aas_editor.settings import ADD_ITEM_ROLE, SHELLS
+        model = _packsTable(lazy=True)
+        model.setData(QModelIndex(), Package(), ADD_ITEM_ROLE)
+        packIndex = model.index(0, 0)
+        model.fetchMore(packIndex)
+
+        shellsIndex = model.index(_names(model, packIndex).index(SHELLS), 0, packIndex)
+        assert not model.hasChildren(shellsIndex)
+
+
+# ---------------------------------------------------------------------------
+# Row lookup
+# ---------------------------------------------------------------------------
+
+class TestRowLookup:
+    def test_rows_after_remove(self, qapp: object) -> None:
+        model = _collectionTable(10)
+        collectionIndex = model.index(0, 0)
+        model.removeRows(2, 3, collectionIndex)
+
+        assert model.rowCount(collectionIndex) == 7
+        for row in range(model.rowCount(collectionIndex)):
+            index = model.index(row, 0, collectionIndex)
+            assert model.objByIndex(index).row() == row
+            assert model.parent(index) == collectionIndex
+
+    def test_scroll_does_not_scan_children(self, qapp: object) -> None:
+        model = _collectionTable(100)
+        collectionIndex = model.index(0, 0)
+        model.removeRows(2, 3, collectionIndex)
+        collection = model.objByIndex(collectionIndex)
+        collection.childItem(0).row()  # renumbers the rows after the remove once
+
+        # the rows of the items are looked up without searching them in the lists of children
+        for item in (model.objByIndex(QModelIndex()), collection):
+            item._childItems = _NotScannableList(item._childItems)
+            item.children = lambda item=item: _NotScannableList(item._childItems)
+        for row in range(model.rowCount(collectionIndex)):
+            index = model.index(row, 0, collectionIndex)
+            assert model.objByIndex(index).row() == row
+            assert model.parent(index) == collectionIndex
+
+
+# ---------------------------------------------------------------------------
+# Match
+# ---------------------------------------------------------------------------
+
+class TestMatch:
+    def test_match_object(self, qapp: object, json_file: Path) -> None:
+        from aas_editor.settings import ADD_ITEM_ROLE, OBJECT_ROLE
+        model = _packsTable(lazy=True)
+        package = Package(json_file)
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        submodel = next(iter(package.submodels))
+
+        # first lookup fetches the items, second one is answered by the lookup index
+        for _ in range(2):
+            index, = model.match(QModelIndex(), OBJECT_ROLE, submodel, hits=1)
+            assert index.data(OBJECT_ROLE) is submodel
+
+    def test_match_type_and_display_text(self, qapp: object, json_file: Path) -> None:
+        from PyQt6.QtCore import Qt
+        from basyx.aas.model import Submodel
+        from aas_editor.settings import ADD_ITEM_ROLE, SUBMODELS, TYPE_ROLE
+        model = _packsTable(lazy=False)
+        model.setData(QModelIndex(), Package(json_file), ADD_ITEM_ROLE)
+
+        walked = [index for index in model.iterItems() if issubclass(Submodel, index.data(TYPE_ROLE))]
+        index, = model.match(QModelIndex(), TYPE_ROLE, Submodel, hits=1)
+        assert index == walked[0]
+
+        index, = model.match(QModelIndex(), Qt.ItemDataRole.DisplayRole, SUBMODELS, hits=1)
+        assert index.data(Qt.ItemDataRole.DisplayRole) == SUBMODELS
+
+    def test_match_equal_object(self, qapp: object) -> None:
+        from aas_editor.settings import OBJECT_ROLE
+        model = _collectionTable(3)
+        collectionIndex = model.index(0, 0)
+
+        index, = model.match(QModelIndex(), OBJECT_ROLE, list(collectionIndex.data(OBJECT_ROLE)), hits=1)
+        assert index == collectionIndex
+
+    def test_match_display_text_after_edit_and_undo(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt
+        from basyx.aas.model import Submodel
+        from aas_editor.models import DetailedInfoTable
+        from aas_editor.settings import ADD_ITEM_ROLE, NOT_GIVEN, OBJECT_ROLE, UNDO_ROLE
+        model = _packsTable(lazy=True)
+        package = Package()
+        first = Submodel(id_="https://example.com/first", id_short="First")
+        second = Submodel(id_="https://example.com/second", id_short="Second")
+        package.add(first)
+        package.add(second)
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        firstIndex, = model.match(QModelIndex(), OBJECT_ROLE, first, hits=1)
+        secondIndex, = model.match(QModelIndex(), OBJECT_ROLE, second, hits=1)
+        if firstIndex.row() > secondIndex.row():
+            first, second, firstIndex, secondIndex = second, first, secondIndex, firstIndex
+        assert model.match(QModelIndex(), Qt.ItemDataRole.DisplayRole, second.id_short, hits=1) == [secondIndex]
+
+        # the first submodel gets the name of the second one in another table
+        table = DetailedInfoTable(firstIndex)
+        idShortIndex = table.index(_names(table, QModelIndex()).index("id_short"), 0)
+        firstIdShort = first.id_short
+        table.setData(idShortIndex, second.id_short, Qt.ItemDataRole.EditRole)
+        assert model.match(QModelIndex(), Qt.ItemDataRole.DisplayRole, second.id_short, hits=1) == [firstIndex]
+
+        table.setData(QModelIndex(), NOT_GIVEN, UNDO_ROLE)
+        assert model.match(QModelIndex(), Qt.ItemDataRole.DisplayRole, second.id_short, hits=1) == [secondIndex]
+        assert model.match(QModelIndex(), Qt.ItemDataRole.DisplayRole, firstIdShort, hits=1) == [firstIndex]
+
+    def test_match_referable_fetches_only_its_parents(self, qapp: object, json_file: Path) -> None:
+        from basyx.aas.model import Property, Referable
+        from aas_editor.settings import ADD_ITEM_ROLE, OBJECT_ROLE
+        model = _packsTable(lazy=True)
+        package = Package(json_file)
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        email = _elementByPath(package, "ContactInformation", "Email", "EmailAddress")
+
+        index, = model.match(QModelIndex(), OBJECT_ROLE, email, hits=1)
+        assert index.data(OBJECT_ROLE) is email
+        assert not model.match(QModelIndex(), OBJECT_ROLE, Property("NotShown", str), hits=1)
+        parents = {id(email.parent), id(email.parent.parent), id(email.parent.parent.parent)}
+        fetched = [item.obj.id_short for item in _createdItems(model) if isinstance(item.obj, Referable)
+                   and id(item.obj) not in parents and not item.canFetchMore() and item.hasChildrenToFetch()]
+        assert not fetched
+        assert len([item for item in _createdItems(model) if item.canFetchMore() and item.hasChildrenToFetch()]) == 3
+
+    def test_match_in_tree_order_if_later_items_are_fetched(self, qapp: object, json_file: Path) -> None:
+        from PyQt6.QtCore import Qt
+        from aas_editor.settings import ADD_ITEM_ROLE, OBJECT_ROLE
+        model = _packsTable(lazy=True)
+        package = Package(json_file)
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        later = _elementByPath(package, "ContactInformation", "IPCommunication__00__", "AvailableTime")
+        index = QModelIndex()
+        for name in (json_file.name, "submodels", "ContactInformations", "ContactInformation", "IPCommunication__00__"):
+            model.fetchMore(index)
+            index = next(model.index(row, 0, index) for row in range(model.rowCount(index))
+                         if model.index(row, 0, index).data() == name)
+        model.fetchMore(index)
+        assert index.data(OBJECT_ROLE) is later.parent
+
+        # the first item with the name is in the not fetched Phone collection
+        index, = model.match(QModelIndex(), Qt.ItemDataRole.DisplayRole, "AvailableTime", hits=1)
+        assert index.data(OBJECT_ROLE) is _elementByPath(package, "ContactInformation", "Phone", "AvailableTime")
+
+    def test_missed_display_text_fetches_all_items(self, qapp: object, json_file: Path) -> None:
+        from PyQt6.QtCore import Qt
+        from aas_editor.settings import ADD_ITEM_ROLE
+        model = _packsTable(lazy=True)
+        model.setData(QModelIndex(), Package(json_file), ADD_ITEM_ROLE)
+
+        assert not model.match(QModelIndex(), Qt.ItemDataRole.DisplayRole, "NotShown", hits=1)
+        assert not [item for item in _createdItems(model) if item.canFetchMore() and item.hasChildrenToFetch()]
+
+    def test_no_match_after_remove(self, qapp: object) -> None:
+        from aas_editor.settings import OBJECT_ROLE
+        model = _collectionTable(10)
+        collectionIndex = model.index(0, 0)
+        obj = model.index(3, 0, collectionIndex).data(OBJECT_ROLE)
+        assert model.match(QModelIndex(), OBJECT_ROLE, obj, hits=1)
+
+        model.removeRows(3, 1, collectionIndex)
+        assert not model.match(QModelIndex(), OBJECT_ROLE, obj, hits=1)
+
+
+# ---------------------------------------------------------------------------
+# Copying
+# ---------------------------------------------------------------------------
+
+class TestCopy:
+    def test_copy_source_is_not_copied(self, qapp: object) -> None:
+        from aas_editor.settings import COPY_ROLE, COPY_SOURCE_ROLE, OBJECT_ROLE
+        model = _collectionTable(3)
+        index = model.index(1, 0, model.index(0, 0))
+        assert index.data(COPY_SOURCE_ROLE) is index.data(OBJECT_ROLE)
+        assert index.data(COPY_ROLE) == index.data(OBJECT_ROLE)
+
+    def test_listeners_notified_before_change(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt
+        from aas_editor.settings import OBJECT_ROLE
+        model = _collectionTable(3)
+        collectionIndex = model.index(0, 0)
+        values = collectionIndex.data(OBJECT_ROLE)
+        seen = []
+        model.changeNotifier.aboutToChange.connect(lambda: seen.append(list(values)))
+        version = model.changeNotifier.version
+
+        model.setData(model.index(1, 0, collectionIndex), 10, Qt.ItemDataRole.EditRole)
+        assert seen == [[0, 1, 2]]
+        assert model.changeNotifier.version == version + 1
+
+    def test_listeners_notified_before_save_changes_objects(self, qapp: object, monkeypatch, tmp_path: Path) -> None:
+        from basyx.aas.model import AssetAdministrationShell, AssetInformation, Submodel
+        from aas_editor.models import StandardTable
+        from aas_editor.utils.package_io import SavePackageTask
+        monkeypatch.setattr(Package, "allSubmodelRefsToAas", property(lambda self: True))
+        package = Package()
+        shell = AssetAdministrationShell(AssetInformation(global_asset_id="https://example.com/asset"),
+                                         id_="https://example.com/shell")
+        package.add(shell)
+        package.add(Submodel(id_="https://example.com/submodel"))
+        seen = []
+        StandardTable.changeNotifier.aboutToChange.connect(lambda: seen.append(len(shell.submodel)))
+        StandardTable.changeNotifier.changed.connect(lambda pack: seen.append(pack))
+
+        SavePackageTask(package, tmp_path / "out.json")
+        assert seen == [0, package]
+        assert len(shell.submodel) == 1
+
+
+# ---------------------------------------------------------------------------
+# Icons
+# ---------------------------------------------------------------------------
+
+class TestIcons:
+    def test_items_of_same_type_share_icon(self, qapp: object) -> None:
+        from basyx.aas.model import Property, datatypes
+        from aas_editor.models import StandardItem
+        items = [StandardItem(Property(f"p{i}", datatypes.Int, i), typehint=Property) for i in range(3)]
+        assert len({item.icon.cacheKey() for item in items}) == 1
+        assert not items[0].icon.isNull()
+
+
+class TestStyle:
+    def test_fonts_reused_until_zoom(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtGui import QFont
+        from aas_editor.settings import ADD_ITEM_ROLE
+        model = _packsTable(lazy=True)
+        model.setData(QModelIndex(), Package(), ADD_ITEM_ROLE)
+        index = model.index(0, 0)
+        font = model.data(index, Qt.ItemDataRole.FontRole)
+        assert font.bold()
+        assert model.data(index, Qt.ItemDataRole.FontRole) is font
+
+        pointSize = model.currFont.pointSize()
+        try:
+            model.setData(QModelIndex(), QFont("Arial", pointSize + 2), Qt.ItemDataRole.FontRole)
+            assert model.data(index, Qt.ItemDataRole.FontRole).pointSize() == pointSize + 2
+            assert model.data(index, Qt.ItemDataRole.SizeHintRole).height() > int((pointSize + 2) * 1.9)
+        finally:
+            model.currFont.setPointSize(pointSize)
+
+    def test_multi_data_equals_data(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt, QModelRoleData, QModelRoleDataSpan
+        from aas_editor.settings import ADD_ITEM_ROLE, IS_LINK_ROLE, OPENED_PACKS_ROLE
+        model = _packsTable(lazy=True)
+        model.setData(QModelIndex(), Package(), ADD_ITEM_ROLE)
+        roles = (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.FontRole,
+                 Qt.ItemDataRole.ForegroundRole, Qt.ItemDataRole.SizeHintRole, Qt.ItemDataRole.TextAlignmentRole,
+                 IS_LINK_ROLE, OPENED_PACKS_ROLE)
+        packIndex = model.index(0, 0)
+        model.fetchMore(packIndex)
+        indexes = [packIndex] + [model.index(row, column, packIndex)
+                                 for row in range(model.rowCount(packIndex)) for column in range(2)]
+        for index in indexes:
+            roleDataSpan = QModelRoleDataSpan([QModelRoleData(role) for role in roles])
+            model.multiData(index, roleDataSpan)
+            for role in roles:
+                assert roleDataSpan.dataForRole(role) == index.data(role)
+
+
+# ---------------------------------------------------------------------------
+# Completions
+# ---------------------------------------------------------------------------
+
+class TestCompletions:
+    def test_ids_of_opened_packages(self, qapp: object) -> None:
+        from basyx.aas.model import Key, Submodel
+        from aas_editor.settings import ADD_ITEM_ROLE, CLEAR_ROW_ROLE, NOT_GIVEN
+        from aas_editor.utils.completions import completionService
+        service = completionService()
+        model = _packsTable(lazy=True)
+        package = Package()
+        package.add(Submodel(id_="https://example.com/Completion/B"))
+        package.add(Submodel(id_="https://example.com/completion/a"))
+        otherPackage = Package()
+        otherPackage.add(Submodel(id_="https://example.com/completion/a"))
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        model.setData(QModelIndex(), otherPackage, ADD_ITEM_ROLE)
+
+        assert service.complete("HTTPS://EXAMPLE.COM/COMPLETION/") == ["https://example.com/completion/a",
+                                                                      "https://example.com/Completion/B"]
+        idsModel = service.completionModel(Key, "value")
+        assert idsModel.rowCount() == len(service.ids())
+
+        model.setData(model.index(0, 0), NOT_GIVEN, CLEAR_ROW_ROLE)
+        assert service.complete("https://example.com/completion/") == ["https://example.com/completion/a"]
+        model.setData(model.index(0, 0), NOT_GIVEN, CLEAR_ROW_ROLE)
+        assert not service.complete("https://example.com/completion/")
+        assert idsModel.rowCount() == len(service.ids())
+
+    def test_ids_edited_in_detailed_info_table(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt
+        from basyx.aas.model import Submodel
+        from aas_editor.models import DetailedInfoTable
+        from aas_editor.settings import ADD_ITEM_ROLE, OBJECT_ROLE, UNDO_ROLE, NOT_GIVEN
+        from aas_editor.utils.completions import completionService
+        service = completionService()
+        model = _packsTable(lazy=True)
+        package = Package()
+        submodel = Submodel(id_="https://example.com/edited/old")
+        package.add(submodel)
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        assert service.complete("https://example.com/edited/") == ["https://example.com/edited/old"]
+
+        submodelIndex = model.match(QModelIndex(), OBJECT_ROLE, submodel, hits=1,
+                                    flags=Qt.MatchFlag.MatchRecursive)[0]
+        table = DetailedInfoTable(submodelIndex)
+        idIndex = table.index(_names(table, QModelIndex()).index("id"), 0)
+        table.setData(idIndex, "https://example.com/edited/new", Qt.ItemDataRole.EditRole)
+        assert service.complete("https://example.com/edited/") == ["https://example.com/edited/new"]
+        table.setData(QModelIndex(), NOT_GIVEN, UNDO_ROLE)
+        assert service.complete("https://example.com/edited/") == ["https://example.com/edited/old"]
+
+
+# ---------------------------------------------------------------------------
+# Undo
+# ---------------------------------------------------------------------------
+
+class TestUndo:
+    def test_history_kept_when_table_is_created_again(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt
+        from basyx.aas.model import Submodel, Property, datatypes
+        from aas_editor.models import DetailedInfoTable
+        from aas_editor.settings import ADD_ITEM_ROLE, OBJECT_ROLE, UNDO_ROLE, REDO_ROLE, NOT_GIVEN
+        model = _packsTable(lazy=True)
+        package = Package()
+        prop = Property("prop", datatypes.Int, 1)
+        package.add(Submodel(id_="https://example.com/undo", submodel_element=[prop]))
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        propIndex = model.match(QModelIndex(), OBJECT_ROLE, prop, hits=1,
+                                flags=Qt.MatchFlag.MatchRecursive)[0]
+
+        table = DetailedInfoTable(propIndex)
+        valueIndex = table.index(_names(table, QModelIndex()).index("value"), 0)
+        table.setData(valueIndex, 2, Qt.ItemDataRole.EditRole)
+        assert prop.value == 2
+
+        table = DetailedInfoTable(propIndex)
+        assert table.data(QModelIndex(), UNDO_ROLE)
+        table.setData(QModelIndex(), NOT_GIVEN, UNDO_ROLE)
+        assert prop.value == 1
+        assert not table.data(QModelIndex(), UNDO_ROLE)
+        table.setData(QModelIndex(), NOT_GIVEN, REDO_ROLE)
+        assert prop.value == 2
+        # the packs table has its own history
+        assert all(command.role != Qt.ItemDataRole.EditRole for command in model.data(QModelIndex(), UNDO_ROLE))
+
+    def test_oldest_commands_evicted_over_budget(self) -> None:
+        from aas_editor.utils.journal import CommandJournal, ENTRY_SIZE
+        from aas_editor.models import SetDataItem
+        journal = CommandJournal(budget=10 * ENTRY_SIZE)
+        undo = journal.undoStack("tab")
+        otherUndo = journal.undoStack("other tab")
+        for i in range(20):
+            undo.append(SetDataItem(None, i, None))
+            otherUndo.append(SetDataItem(None, -i, None))
+        assert journal.size <= journal.budget
+        assert undo.commands()[-1].value == 19
+        assert otherUndo.pop().value == -19
+
+        undo.append(SetDataItem(None, "x" * 100 * ENTRY_SIZE, None))
+        assert [command.value for command in undo] == ["x" * 100 * ENTRY_SIZE]
+        assert not otherUndo
+
+
+# ---------------------------------------------------------------------------
+# Update
+# ---------------------------------------------------------------------------
+
+class TestUpdate:
+    def test_only_changed_rows_replaced(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt, QPersistentModelIndex
+        from basyx.aas.model import Submodel, Property, datatypes
+        from aas_editor.settings import ADD_ITEM_ROLE, OBJECT_ROLE, UPDATE_ROLE, NOT_GIVEN
+        model = _packsTable(lazy=True)
+        package = Package()
+        props = [Property(f"prop{i}", datatypes.Int, i) for i in range(4)]
+        submodel = Submodel(id_="https://example.com/update", submodel_element=props)
+        package.add(submodel)
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        submodelIndex = model.match(QModelIndex(), OBJECT_ROLE, submodel, hits=1,
+                                    flags=Qt.MatchFlag.MatchRecursive)[0]
+        model.fetchMore(submodelIndex)
+        kept = QPersistentModelIndex(model.index(2, 0, submodelIndex))
+        keptItem = model.objByIndex(QModelIndex(kept))
+        inserted, removed = [], []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+
+        submodel.submodel_element.remove(props[0])
+        submodel.submodel_element.add(Property("new", datatypes.Int, 5))
+        model.setData(submodelIndex, NOT_GIVEN, UPDATE_ROLE)
+
+        assert removed == [(0, 0)]
+        assert inserted == [(3, 3)]
+        assert kept.isValid() and kept.row() == 1
+        assert model.objByIndex(QModelIndex(kept)) is keptItem
+        assert [model.index(row, 0, submodelIndex).data(OBJECT_ROLE) for row in range(4)] == \
+               [*props[1:], submodel.get_referable("new")]
+
+    def test_one_signal_per_updated_parent(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt
+        from basyx.aas.model import Submodel, Property, datatypes
+        from aas_editor.settings import ADD_ITEM_ROLE, OBJECT_ROLE, UPDATE_ROLE, NOT_GIVEN
+        model = _packsTable(lazy=True)
+        package = Package()
+        props = [Property(f"prop{i}", datatypes.Int, i) for i in range(50)]
+        submodel = Submodel(id_="https://example.com/update", submodel_element=props)
+        package.add(submodel)
+        model.setData(QModelIndex(), package, ADD_ITEM_ROLE)
+        submodelIndex = model.match(QModelIndex(), OBJECT_ROLE, submodel, hits=1,
+                                    flags=Qt.MatchFlag.MatchRecursive)[0]
+        model.fetchMore(submodelIndex)
+        changed = []
+        model.dataChanged.connect(lambda topLeft, bottomRight: changed.append((topLeft.row(), bottomRight.row())))
+
+        model.setData(submodelIndex, NOT_GIVEN, UPDATE_ROLE)
+        # the submodel row and one range of its children, the children are not populated
+        assert changed == [(submodelIndex.row(), submodelIndex.row()), (0, 49)]
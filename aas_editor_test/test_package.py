@@ -89,6 +89,60 @@ class TestPackageModify:
         pkg.discard(submodels[0])
         assert pkg.numOfSubmodels == initial_count - 1
 
+    def test_index_follows_store_changes(self, qapp: object) -> None:
+        pkg = Package()
+        submodel = Submodel(id_="https://example.com/submodel")
+        pkg.add(submodel)
+        pkg.add(ConceptDescription(id_="https://example.com/cd"))
+        assert list(pkg.submodels) == [submodel]
+        assert pkg.numOfConceptDescriptions == 1
+
+        # store is changed directly, e.g. when items are deleted in the tree view
+        pkg.objStore.discard(submodel)
+        assert pkg.numOfSubmodels == 0
+
+        pkg.add(submodel)
+        submodel.id = "https://example.com/renamed"
+        assert pkg.objStore.get_identifiable("https://example.com/renamed") is submodel
+        pkg.add(Submodel(id_="https://example.com/submodel"))
+        with pytest.raises(KeyError):
+            pkg.add(Submodel(id_="https://example.com/renamed"))
+
+    def test_add_checks_edited_ids(self, qapp: object) -> None:
+        from aas_editor.utils.object_store import IndexedObjectStore
+        a = Submodel(id_="urn:a")
+        store = IndexedObjectStore([a])
+        # id is changed in place, the store is not told about it
+        a.id = "urn:b"
+        with pytest.raises(KeyError):
+            store.add(Submodel(id_="urn:b"))
+        with pytest.raises(KeyError):
+            store.update([Submodel(id_="urn:b")])
+        store.add(Submodel(id_="urn:a"))
+        assert len(store) == 2
+
+    def test_resolved_references_cached_until_store_changes(self, qapp: object) -> None:
+        from basyx.aas.model import ModelReference, Property, datatypes
+        pkg = Package()
+        prop = Property("prop", datatypes.Int, 1)
+        submodel = Submodel(id_="https://example.com/submodel", submodel_element=[prop])
+        pkg.add(submodel)
+        reference = ModelReference.from_referable(prop)
+        assert pkg.objStore.resolve(reference) is prop
+
+        prop.id_short = "renamed"
+        assert pkg.objStore.resolve(reference) is prop
+        pkg.objStore.touch()
+        with pytest.raises(KeyError):
+            pkg.objStore.resolve(reference)
+
+        prop.id_short = "prop"
+        pkg.discard(submodel)
+        with pytest.raises(KeyError):
+            pkg.objStore.resolve(reference)
+        pkg.add(submodel)
+        assert pkg.objStore.resolve(reference) is prop
+
 
 # ---------------------------------------------------------------------------
 # Write round-trips
@@ -123,6 +177,20 @@ class TestPackageWrite:
         with pytest.raises(TypeError):
             pkg.write(tmp_path / "out.txt")
 
+    def test_aborted_write_keeps_file(self, qapp: object, json_file: Path, tmp_path: Path) -> None:
+        out_file = tmp_path / "out.json"
+        Package(json_file).write(out_file)
+        content = out_file.read_bytes()
+
+        def abort(done: int, total: int) -> None:
+            raise InterruptedError
+
+        pkg = Package(json_file)
+        with pytest.raises(InterruptedError):
+            pkg.write(out_file, progress=abort, settings=dict(pkg.writeSettings(), writePrettyJson=False))
+        assert out_file.read_bytes() == content
+        assert list(tmp_path.iterdir()) == [out_file]
+
 
 # ---------------------------------------------------------------------------
 # StoredFile
@@ -163,3 +231,125 @@ class TestStoredFile:
     def test_setfilestore_rejects_wrong_type(self) -> None:
         with pytest.raises(TypeError):
             StoredFile(name="test", fileStore="not-a-filestore")
+
+    def test_streaming_access_of_local_file(self, tmp_path: Path) -> None:
+        content = bytes(range(256)) * 8192
+        dummy = tmp_path / "file.bin"
+        dummy.write_bytes(content)
+        sf = StoredFile(filePath=str(dummy))
+
+        assert sf.size == len(content)
+        assert b"".join(sf.iterChunks(chunkSize=1000)) == content
+        with sf.view() as view:
+            assert view == content
+        # the mapping is closed on exit
+        with pytest.raises(ValueError):
+            view.tobytes()
+        stream = io.BytesIO()
+        assert sf.copyTo(stream) == len(content)
+        assert stream.getvalue() == content
+
+    def test_added_file_is_not_copied_on_read(self, qapp: object, tmp_path: Path) -> None:
+        dummy = tmp_path / "image.png"
+        dummy.write_bytes(b"\x89PNG")
+        pkg = Package()
+        sf = StoredFile(filePath=str(dummy))
+        pkg.add(sf)
+
+        assert sf.savedInStore()
+        assert sf.value is sf.value
+        with sf.view() as view:
+            assert view == b"\x89PNG"
+
+
+# ---------------------------------------------------------------------------
+# Supplementary files
+# ---------------------------------------------------------------------------
+
+def _aasxWithFile(file: Path, content: bytes, numOfFiles: int = 1) -> str:
+    from basyx.aas import model
+    from basyx.aas.adapter.aasx import AASXWriter
+    store = DictSupplementaryFileContainer()
+    name = store.add_file("/aasx/files/doc.bin", io.BytesIO(content), "application/octet-stream")
+    elements = [model.File("doc", "application/octet-stream", name)]
+    for i in range(1, numOfFiles):
+        otherName = store.add_file(f"/aasx/files/doc{i}.bin", io.BytesIO(content), "application/octet-stream")
+        elements.append(model.File(f"doc{i}", "application/octet-stream", otherName))
+    submodel = Submodel("https://example.com/sm", id_short="sm", submodel_element=elements)
+    with AASXWriter(file) as writer:
+        writer.write_all_aas_objects("/aasx/data.xml", model.DictObjectStore([submodel]), store)
+    return name
+
+
+def _readAasx(file: Path) -> Package:
+    from basyx.aas.adapter.aasx import AASXReader
+    pkg = Package()
+    pkg.file = file
+    pkg.fileStore.sourceFile = file
+    with AASXReader(file) as reader:
+        reader.read_into(pkg.objStore, pkg.fileStore)
+    return pkg
+
+
+class TestLazySupplementaryFiles:
+    def test_file_read_on_demand(self, qapp: object, tmp_path: Path) -> None:
+        content = bytes(range(256)) * 4096
+        aasxFile = tmp_path / "files.aasx"
+        name = _aasxWithFile(aasxFile, content)
+
+        pkg = _readAasx(aasxFile)
+        assert pkg.fileStore.isLazy(name)
+        assert pkg.fileStore.get_size(name) == len(content)
+        assert StoredFile(name, pkg.fileStore).value == content
+
+    def test_file_in_source_is_streamed(self, qapp: object, tmp_path: Path) -> None:
+        content = bytes(range(256)) * 4096
+        aasxFile = tmp_path / "files.aasx"
+        name = _aasxWithFile(aasxFile, content)
+
+        storedFile = StoredFile(name, _readAasx(aasxFile).fileStore)
+        assert b"".join(storedFile.iterChunks()) == content
+        with pytest.raises(ValueError):
+            with storedFile.view():
+                pass
+
+    def test_source_directory_read_once(self, qapp: object, tmp_path: Path, monkeypatch) -> None:
+        from aas_editor.utils.supplementary_files import LazySupplementaryFileContainer
+        aasxFile = tmp_path / "files.aasx"
+        _aasxWithFile(aasxFile, b"content", numOfFiles=20)
+        openSource = LazySupplementaryFileContainer._openSource
+        opened = []
+        monkeypatch.setattr(LazySupplementaryFileContainer, "_openSource",
+                            lambda container: opened.append(container) or openSource(container))
+
+        pkg = _readAasx(aasxFile)
+        assert len([name for name in pkg.fileStore if pkg.fileStore.isLazy(name)]) == 20
+        assert len(opened) == 1
+
+    def test_file_copied_between_packages(self, qapp: object, tmp_path: Path) -> None:
+        nameA = _aasxWithFile(tmp_path / "a.aasx", b"AAAA")
+        nameB = _aasxWithFile(tmp_path / "b.aasx", b"BBBBBBBB")
+        pkgA = _readAasx(tmp_path / "a.aasx")
+        pkgB = _readAasx(tmp_path / "b.aasx")
+        assert nameA == nameB
+
+        # the file of B is not a part of the source file of A, although it has the same name
+        storedFile = StoredFile(nameB, pkgB.fileStore)
+        pkgA.add(storedFile)
+        assert storedFile.name != nameA
+        assert not pkgA.fileStore.isLazy(storedFile.name)
+        assert storedFile.value == b"BBBBBBBB"
+        assert StoredFile(nameA, pkgA.fileStore).value == b"AAAA"
+
+    def test_write_into_source_file(self, qapp: object, tmp_path: Path) -> None:
+        content = b"supplementary file content"
+        aasxFile = tmp_path / "files.aasx"
+        name = _aasxWithFile(aasxFile, content)
+        pkg = _readAasx(aasxFile)
+        orphan = pkg.fileStore.add_file("/aasx/files/orphan.bin", io.BytesIO(b"orphan"), "application/octet-stream")
+
+        pkg.write(aasxFile)
+        assert pkg.fileStore.isLazy(name)
+        assert StoredFile(name, pkg.fileStore).value == content
+        assert StoredFile(orphan, pkg.fileStore).value == b"orphan"
+        assert list(tmp_path.iterdir()) == [aasxFile]
@@ -0,0 +1,398 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import pytest
+from basyx.aas.model import Property
+
+import aas_editor.settings  # noqa: F401 settings must be imported before utils
+from aas_editor.additional.classes import DictItem
+from aas_editor.package import Package
+from aas_editor.utils.util import getReqParams4init, getAttrTypeHint, getIterItemTypeHint
+
+
+# ---------------------------------------------------------------------------
+# Type metadata cache
+# ---------------------------------------------------------------------------
+
+class TestTypeMetadataCache:
+    def test_cached_result_can_be_changed_by_caller(self, qapp: object) -> None:
+        params = getReqParams4init(Property, rmDefParams=False)
+        params.clear()
+        assert getReqParams4init(Property, rmDefParams=False)
+
+    def test_cached_error_is_raised_again(self, qapp: object) -> None:
+        for _ in range(2):
+            with pytest.raises(KeyError):
+                getAttrTypeHint(Property, "not_existing_attr")
+
+    def test_dict_item_typehints_invalidate_cache(self, qapp: object) -> None:
+        getIterItemTypeHint(Dict[str, int])
+        assert getAttrTypeHint(DictItem, "value") is int
+        getIterItemTypeHint(Dict[str, float])
+        assert getAttrTypeHint(DictItem, "value") is float
+        getIterItemTypeHint(Dict[Any, Any])
+
+
+# ---------------------------------------------------------------------------
+# ClassesInfo
+# ---------------------------------------------------------------------------
+
+class TestClassesInfo:
+    def test_rebuild_after_runtime_extension(self, qapp: object) -> None:
+        from aas_editor.settings import CLASSES_INFO, HIDDEN_ATTRS
+        from aas_editor.utils.util_classes import ClassesInfo
+
+        class Parent:
+            pass
+
+        class Child(Parent):
+            pass
+
+        CLASSES_INFO[Parent] = {HIDDEN_ATTRS: ("a",)}
+        try:
+            assert "a" in ClassesInfo.hiddenAttrs(Child)
+            CLASSES_INFO[Child] = {HIDDEN_ATTRS: ("b",)}
+            ClassesInfo.rebuild()
+            assert {"a", "b"} <= set(ClassesInfo.hiddenAttrs(Child))
+            assert "b" not in ClassesInfo.hiddenAttrs(Parent)
+        finally:
+            CLASSES_INFO.pop(Parent)
+            CLASSES_INFO.pop(Child, None)
+            ClassesInfo.rebuild()
+
+    def test_returned_infos_can_be_changed_by_caller(self, qapp: object) -> None:
+        from aas_editor.settings import CLASSES_INFO, PACKVIEW_ATTRS_INFO
+        from aas_editor.utils.util_classes import ClassesInfo
+
+        class Cls:
+            pass
+
+        CLASSES_INFO[Cls] = {"list_info": ["a"], PACKVIEW_ATTRS_INFO: {"attr": {"key": "value"}}}
+        try:
+            ClassesInfo.findSpecificInfoForClass(Cls, "list_info").append("b")
+            ClassesInfo.findSpecificInfoForClass(Cls, PACKVIEW_ATTRS_INFO)["attr"].clear()
+            ClassesInfo.findAllInfoForClass(Cls)[PACKVIEW_ATTRS_INFO]["attr"].clear()
+            assert ClassesInfo.findSpecificInfoForClass(Cls, "list_info") == ["a"]
+            assert ClassesInfo.findSpecificInfoForClass(Cls, PACKVIEW_ATTRS_INFO) == {"attr": {"key": "value"}}
+            assert ClassesInfo.findAllInfoForClass(Cls)[PACKVIEW_ATTRS_INFO] == {"attr": {"key": "value"}}
+        finally:
+            CLASSES_INFO.pop(Cls)
+            ClassesInfo.rebuild()
+
+
+# ---------------------------------------------------------------------------
+# Type checks
+# ---------------------------------------------------------------------------
+
+class TestTypeChecks:
+    def test_compiled_check_reused(self, qapp: object) -> None:
+        from typing import Optional, Union, List
+        from aas_editor.utils.util_type import checkType, compileTypeCheck
+        typehint = Optional[Union[int, List[str]]]
+        assert compileTypeCheck(typehint) is compileTypeCheck(typehint)
+        assert checkType(1, typehint) and checkType(None, typehint) and checkType(["a"], typehint)
+        assert not checkType("a", typehint)
+
+    def test_isoftype_does_not_log(self, qapp: object, caplog: pytest.LogCaptureFixture) -> None:
+        from aas_editor.utils.util_type import isoftype
+        assert isoftype(1, int)
+        assert isoftype("a", (int, str))
+        assert not isoftype(1.5, (int, str))
+        with pytest.raises(TypeError):
+            isoftype(1, 2)
+        assert not caplog.records
+
+
+# ---------------------------------------------------------------------------
+# Display strings
+# ---------------------------------------------------------------------------
+
+class TestSimplifyInfo:
+    def test_long_values_cut_like_full_str(self, qapp: object) -> None:
+        from aas_editor.utils.util import simplifyInfo, getLimitStr
+        values = [b"\x01" * 10 ** 6, "x" * 10 ** 6, list(range(10 ** 5)), {i: str(i) for i in range(10 ** 5)},
+                  [b"ab" * 10 ** 5, 1], (1,), {1, 2}, {}, []]
+        for value in values:
+            for maxSigns in (150, 3):
+                assert getLimitStr(simplifyInfo(value, maxSigns=maxSigns), maxSigns) == getLimitStr(str(value), maxSigns)
+
+    def test_item_display_cached_until_obj_set(self, qapp: object) -> None:
+        from PyQt6.QtCore import Qt
+        from aas_editor.models import StandardItem
+        from aas_editor.settings import VALUE_COLUMN
+        values = [1, 2]
+        item = StandardItem(values, name="values")
+        assert item.data(Qt.ItemDataRole.DisplayRole, VALUE_COLUMN) == "[1, 2]"
+        values.append(3)
+        assert item.data(Qt.ItemDataRole.DisplayRole, VALUE_COLUMN) == "[1, 2]"
+        item.obj = values
+        assert item.data(Qt.ItemDataRole.DisplayRole, VALUE_COLUMN) == "[1, 2, 3]"
+
+
+# ---------------------------------------------------------------------------
+# Cloning
+# ---------------------------------------------------------------------------
+
+def _deepcopy(obj):
+    """Copy like cloneObject with deepcopy: the parent of the object is not copied"""
+    import copy
+    parent = getattr(obj, "parent", None)
+    return copy.deepcopy(obj, {} if parent is None else {id(parent): None})
+
+
+def _assertEquivalentClone(orig, clone, deepCopy, seen: Dict[int, Any]) -> None:
+    """Assert clone has the same structure as the deep copy and shares only immutable objects with orig"""
+    import types
+    from aas_editor.utils.clone import IMMUTABLE_TYPES
+    assert type(clone) is type(deepCopy) is type(orig)
+    if isinstance(orig, types.FunctionType):
+        # deepcopy of picklers registered with copyreg creates e.g. check functions of lang string sets again
+        assert clone is orig and clone.__code__ is deepCopy.__code__
+        return
+    if isinstance(orig, IMMUTABLE_TYPES):
+        assert clone == deepCopy
+        return
+    if id(clone) in seen:
+        # objects referred to several times, e.g. parents, are referred to by the copies in the same way
+        assert seen[id(clone)] is deepCopy
+        return
+    seen[id(clone)] = deepCopy
+    if not isinstance(orig, (tuple, frozenset)):
+        # tuples of immutable objects are immutable too
+        assert clone is not orig
+
+    if isinstance(orig, (list, tuple)):
+        assert len(clone) == len(deepCopy) == len(orig)
+        for items in zip(orig, clone, deepCopy):
+            _assertEquivalentClone(*items, seen)
+    elif isinstance(orig, dict):
+        assert list(clone) == list(deepCopy) == list(orig)
+        for key in orig:
+            _assertEquivalentClone(orig[key], clone[key], deepCopy[key], seen)
+    elif isinstance(orig, (set, frozenset)):
+        assert len(clone) == len(deepCopy) == len(orig)
+        # items without __eq__ are compared in the order of their strings
+        for items in zip(*(sorted(items, key=repr) for items in (orig, clone, deepCopy))):
+            _assertEquivalentClone(*items, seen)
+    elif isinstance(orig, types.MethodType):
+        assert clone.__func__ is deepCopy.__func__ is orig.__func__
+        _assertEquivalentClone(orig.__self__, clone.__self__, deepCopy.__self__, seen)
+    elif not hasattr(orig, "__dict__"):
+        # e.g. deques copied by deepcopy
+        assert len(clone) == len(deepCopy) == len(orig)
+        for items in zip(orig, clone, deepCopy):
+            _assertEquivalentClone(*items, seen)
+    else:
+        assert vars(clone).keys() == vars(deepCopy).keys() == vars(orig).keys()
+        for name in vars(orig):
+            _assertEquivalentClone(vars(orig)[name], vars(clone)[name], vars(deepCopy)[name], seen)
+
+
+class TestCloneObject:
+    def test_clone_is_independent_copy(self, qapp: object, json_file: Path) -> None:
+        from basyx.aas.model import Namespace
+        from aas_editor.utils.clone import cloneObject
+
+        submodel = next(iter(Package(json_file).submodels))
+        element = next(iter(submodel.submodel_element))
+        clone = cloneObject(element)
+        assert clone is not element and clone.id_short == element.id_short
+        assert clone.parent is None and element.parent is submodel
+        # immutable references are shared
+        assert clone.semantic_id is element.semantic_id
+
+        clone = cloneObject(submodel)
+        objs = [clone]
+        while objs:
+            obj = objs.pop()
+            if isinstance(obj, Namespace):
+                for namespaceSet in obj.namespace_element_sets:
+                    assert namespaceSet.parent is obj
+                    for child in namespaceSet:
+                        assert child.parent is obj
+                        objs.append(child)
+        clone.submodel_element.remove(next(iter(clone.submodel_element)))
+        assert len(clone.submodel_element) == len(submodel.submodel_element) - 1
+
+    def test_every_cloner_equivalent_to_deepcopy(self, qapp: object) -> None:
+        import copy
+        from collections import deque
+        from basyx.aas.model import Key, KeyTypes, ModelReference, MultiLanguageNameType, Submodel
+        from aas_editor.utils import clone
+
+        submodel = Submodel("https://example.com/clone")
+        reference = ModelReference((Key(KeyTypes.SUBMODEL, submodel.id),), Submodel)
+        objs = [reference, Property("p1", str, "v"), submodel.commit,
+                [[1], "a"], {"a": [1]}, {reference}, ([1], 2), frozenset((1, reference)), deque([[1]]),
+                MultiLanguageNameType({"en": "name", "de": "Name"})]
+        cloners = {clone._clonerForType(type(obj)) for obj in objs}
+        assert cloners >= set(clone._CONTAINER_CLONERS.values()) | {
+            clone._shareObject, clone._cloneObjectState, clone._cloneMethod, copy.deepcopy}
+        for obj in objs:
+            _assertEquivalentClone(obj, clone.cloneObject(obj), _deepcopy(obj), {})
+
+    def test_example_package_equivalent_to_deepcopy(self, qapp: object) -> None:
+        from basyx.aas.examples.data.example_aas import create_full_example
+        from basyx.aas.model import ConstrainedLangStringSet, ModelReference, Namespace
+        from aas_editor.utils.clone import cloneObject
+
+        objs = list(create_full_example())
+        for obj in objs:
+            clone = cloneObject(obj)
+            _assertEquivalentClone(obj, clone, _deepcopy(obj), {})
+            children = [clone]
+            while children:
+                child = children.pop()
+                if isinstance(child, Namespace):
+                    for namespaceSet in child.namespace_element_sets:
+                        assert namespaceSet.parent is child
+                        assert all(element.parent is child for element in namespaceSet)
+                        children.extend(namespaceSet)
+        # the example covers the objects copied by special cloners
+        shell = next(obj for obj in objs if hasattr(obj, "submodel"))
+        assert all(isinstance(ref, ModelReference) for ref in cloneObject(shell).submodel)
+        assert any(isinstance(value, ConstrainedLangStringSet) for obj in objs for value in vars(obj).values())
+
+    @pytest.mark.skipif(not os.environ.get("AAS_EDITOR_BENCHMARK"),
+                        reason="timing benchmark, set AAS_EDITOR_BENCHMARK=1 to run it")
+    def test_example_package_cloned_faster_than_deepcopy(self, qapp: object) -> None:
+        import time
+        from basyx.aas.examples.data.example_aas import create_full_example
+        from aas_editor.utils.clone import cloneObject
+
+        objs = list(create_full_example())
+
+        def bestTime(copyFunc) -> float:
+            times = []
+            for _ in range(5):
+                start = time.perf_counter()
+                for obj in objs:
+                    copyFunc(obj)
+                times.append(time.perf_counter() - start)
+            return min(times)
+        assert bestTime(cloneObject) < bestTime(_deepcopy)
+
+
+# ---------------------------------------------------------------------------
+# Submodel templates
+# ---------------------------------------------------------------------------
+
+def _scanTemplates(templatesFolder: Path, indexFile: Optional[Path] = None):
+    from PyQt6.QtCore import QEventLoop, QTimer
+    from aas_editor.utils.submodel_templates import SubmodelTemplatesLoader
+
+    loader = SubmodelTemplatesLoader(templatesFolder, indexFile=indexFile)
+    scanned = []
+    loader.templateScanned.connect(lambda file, submodelInfos: scanned.append((file, submodelInfos)))
+    finished = []
+    loader.finished.connect(lambda: finished.append(True))
+    loop = QEventLoop()
+    loader.finished.connect(loop.quit)
+    QTimer.singleShot(60000, loop.quit)
+    loader.start()
+    if not finished:
+        loop.exec()
+    return loader, scanned
+
+
+class TestSubmodelTemplatesLoader:
+    def test_scan_and_load(self, qapp: object, json_file: Path, tmp_path: Path) -> None:
+        templatesFolder = tmp_path / "templates"
+        templatesFolder.joinpath("Contact").mkdir(parents=True)
+        shutil.copy(json_file, templatesFolder / "Contact" / json_file.name)
+
+        loader, scanned = _scanTemplates(templatesFolder)
+        file, submodelInfos = scanned[0]
+        assert file == Path("Contact") / json_file.name
+        name, submodelId = submodelInfos[0]
+        assert loader.loadSubmodel(file, submodelId).id == submodelId
+
+    def test_index_used_for_unchanged_files(self, qapp: object, json_file: Path, tmp_path: Path,
+                                            monkeypatch: pytest.MonkeyPatch) -> None:
+        import os
+        from aas_editor.utils import submodel_templates
+
+        templatesFolder = tmp_path / "templates"
+        templatesFolder.mkdir()
+        template = templatesFolder / json_file.name
+        shutil.copy(json_file, template)
+        indexFile = tmp_path / "index.json"
+
+        _, scanned = _scanTemplates(templatesFolder, indexFile)
+        assert indexFile.is_file()
+
+        # file unchanged: menu is filled from the index without scanning
+        def noWorkers(*args, **kwargs):
+            raise AssertionError("No file should be scanned")
+        monkeypatch.setattr(submodel_templates, "ProcessPoolExecutor", noWorkers)
+        _, scannedFromIndex = _scanTemplates(templatesFolder, indexFile)
+        assert scannedFromIndex == scanned
+        monkeypatch.undo()
+
+        # file touched: it is checked again, but content is the same
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        _, rescanned = _scanTemplates(templatesFolder, indexFile)
+        assert rescanned == scanned
+
+
+# ---------------------------------------------------------------------------
+# Package IO
+# ---------------------------------------------------------------------------
+
+def _waitForTasks(tasks) -> None:
+    for task in tasks:
+        assert task.wait(60)
+
+
+class TestPackageIOService:
+    def test_open_and_save(self, qapp: object, json_file: Path, tmp_path: Path) -> None:
+        from aas_editor.utils.package_io import PackageIOService
+        service = PackageIOService()
+
+        openTask, = service.openAll([json_file])
+        _waitForTasks([openTask])
+        pack = openTask.result()
+        assert pack.numOfSubmodels == 1
+        assert openTask.done == openTask.total == json_file.stat().st_size
+
+        outFile = tmp_path / "out.xml"
+        saveTask = service.save(pack, outFile)
+        _waitForTasks([saveTask])
+        assert saveTask.result().file == outFile
+        assert saveTask.done == outFile.stat().st_size
+
+    def test_open_in_processes(self, qapp: object, json_file: Path) -> None:
+        from PyQt6.QtCore import QEventLoop, QTimer
+        from aas_editor.utils.package_io import PackageIOService
+        service = PackageIOService(maxWorkers=2)
+
+        tasks = service.openAllInProcesses([json_file, json_file.with_name("missing.json")])
+        loop = QEventLoop()
+        for task in tasks:
+            task.finished.connect(lambda: not service.runningTasks() and loop.quit())
+        QTimer.singleShot(60000, loop.quit)
+        loop.exec()
+
+        pack = tasks[0].result()
+        submodel, = pack.submodels
+        assert all(element.parent is submodel for element in submodel.submodel_element)
+        assert Package(json_file).numOfConceptDescriptions == pack.numOfConceptDescriptions
+        assert tasks[0].file.stat().st_size == tasks[0].done
+        with pytest.raises(OSError):
+            tasks[1].result()
+
+    def test_cancelled_save_keeps_file(self, qapp: object, json_file: Path, tmp_path: Path) -> None:
+        from aas_editor.utils.package_io import SavePackageTask, PackageIOCancelled
+
+        outFile = tmp_path / "out.json"
+        shutil.copy(json_file, outFile)
+        task = SavePackageTask(Package(json_file), outFile)
+        task.cancel()
+        task.run()
+        with pytest.raises(PackageIOCancelled):
+            task.result()
+        assert outFile.read_bytes() == json_file.read_bytes()
+        assert list(tmp_path.iterdir()) == [outFile]
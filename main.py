@@ -10,16 +10,23 @@
 
 import sys
 import logging
+import multiprocessing
 
 from PyQt6 import QtWidgets
 # from aas_editor.utils import exceptionhook
 from PyQt6 import QtWebEngineWidgets
 
-logging.basicConfig(level=logging.INFO, filename="log.log", filemode="w",
-                    format="%(asctime)s | %(levelname)s | %(message)s")
-
 
 def main():
+    # Submodel templates and packages are read in worker processes, required for PyInstaller builds.
+    # Must be called first: frozen worker processes run main() until this call and exit in it
+    multiprocessing.freeze_support()
+    # configured after freeze_support, so that the log is not truncated by spawned worker processes
+    logging.basicConfig(level=logging.INFO, filename="log.log", filemode="w",
+                        format="%(asctime)s | %(levelname)s | %(message)s")
+    from aas_editor.utils.media_scheme import registerMediaScheme
+    # custom url schemes must be registered before the QApplication is created
+    registerMediaScheme()
     app = QtWidgets.QApplication(sys.argv)
 
     from aas_editor.settings.icons import initialize_all_icons